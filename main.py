@@ -1,5 +1,10 @@
 import sys
 from vinni.core import ChatBot
+from vinni.breaker import CircuitBreaker
+from vinni.client import make_client
+from vinni.lifecycle import ModelLifecycle
+from vinni.compaction import HistoryCompactor
+from vinni.streaming import coalesce
 
 def main():
     print("Welcome to ViNNi Local AI")
@@ -40,13 +45,28 @@ def main():
 
     # Load v0.2.7 System Prompt (Adaptive Tone)
     prompt_path = "prompts/system_v0.2.7.md"
+    # v0.10.0: Persistent cache tier (survives restarts, shared across processes)
+    cache_path = "vinni_cache.db"
     
     try:
-        bot = ChatBot(model_name=model_name, options=options, system_prompt_path=prompt_path)
+        # v0.10.0: Circuit breaker -> fail fast / degraded answers while Ollama is down
+        # v0.10.0: One pooled keep-alive client for extraction, chat and verification
+        client = make_client()
+        # v0.10.0: Keep the model resident between turns (pings every 4 min, keep_alive 30m)
+        lifecycle = ModelLifecycle(client=client)
+        bot = ChatBot(model_name=model_name, options=options, system_prompt_path=prompt_path, cache_path=cache_path,
+                      breaker=CircuitBreaker(), client=client, lifecycle=lifecycle,
+                      compactor=HistoryCompactor())
     except Exception as e:
         print(f"Error initializing bot: {e}")
         return
     
+    # v0.10.0: Warm caches from the most frequent logged answers (non-blocking)
+    bot.warm_cache(log_path="vinni.log", top_n=20, background=True)
+    # v0.10.0: Load the model and prefill the system prompt while the user types
+    bot.warm_model(background=True)
+    lifecycle.start()
+    
     from vinni import __version__
     print(f"ViNNi v{__version__} is ready. (Check vinni.log for audit)")
     print("-" * 50)
@@ -110,8 +130,20 @@ def main():
 
             print(f"ViNNi [{current_intent}]: ", end="", flush=True)
             
-            for chunk in bot.chat(user_input):
-                print(chunk, end="", flush=True)
+            stream = bot.chat(user_input)
+            try:
+                # v0.10.0: One terminal write per coalesced batch instead of per token
+                for text in coalesce(stream):
+                    sys.stdout.write(text)
+                    sys.stdout.flush()
+            except KeyboardInterrupt:
+                # v0.10.0: Ctrl-C stops this answer only. If it landed inside chat() (waiting on the model),
+                # chat() already closed the model stream and logged the turn as interrupted; if it landed
+                # here between chunks, close() does the same with reason "closed".
+                stream.close()
+                print("\n[Cancelled]")
+                print("-" * 50)
+                continue
             
             print(f"\n[Tokens: ~{bot.last_turn_tokens}]")
             print("-" * 50)
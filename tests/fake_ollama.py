@@ -0,0 +1,119 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeOllama(ThreadingHTTPServer):
+    """
+    In-process stand-in for the Ollama HTTP API, for tests that cannot patch
+    `ollama` directly (child processes, pooled clients).
+    Chat replies echo "Turn <n>: <last user message>" one word per chunk.
+    Point clients at it with OLLAMA_HOST=http://127.0.0.1:<port>.
+    """
+    daemon_threads = True
+
+    def __init__(self, chunk_delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), FakeOllamaHandler)
+        self.chunk_delay = chunk_delay
+        self.requests = []  # (path, payload)
+        self.peers = []     # Client port per request (same port = reused keep-alive connection)
+        self.fail = False   # Respond 500 to everything
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def host(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+    def count(self, path: str) -> int:
+        with self.lock:
+            return sum(1 for p, _ in self.requests if p == path)
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        with self.server.lock:
+            self.server.requests.append((self.path, payload))
+            self.server.peers.append(self.client_address[1])
+
+        if self.server.fail:
+            body = b'{"error": "model crashed"}'
+            self.send_response(500)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        model = payload.get("model", "")
+        if self.path == "/api/embed":
+            inputs = payload.get("input")
+            inputs = inputs if isinstance(inputs, list) else [inputs]
+            self._send({"model": model, "embeddings": [[float(len(t)), 1.0, 0.5] for t in inputs]})
+            return
+
+        if self.path == "/api/generate":
+            self._send({"model": model, "created_at": "2026-01-01T00:00:00Z", "response": "", "done": True,
+                        "load_duration": 1500000000})
+            return
+
+        messages = payload.get("messages") or []
+        turns = sum(1 for m in messages if m.get("role") == "user")
+        last = messages[-1]["content"] if messages else ""
+        text = f"Turn {turns}: {last}"
+
+        if not payload.get("stream", True):
+            self._send({"model": model, "created_at": "2026-01-01T00:00:00Z",
+                        "message": {"role": "assistant", "content": text}, "done": True,
+                        "load_duration": 1000000})
+            return
+
+        # Chunked like the real server, so the connection stays reusable after the stream
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        words = text.split(" ")
+        try:
+            for i, word in enumerate(words):
+                if self.server.chunk_delay:
+                    time.sleep(self.server.chunk_delay)
+                part = {"model": model, "created_at": "2026-01-01T00:00:00Z",
+                        "message": {"role": "assistant", "content": word if i == 0 else " " + word}, "done": False}
+                self._chunk(json.dumps(part) + "\n")
+            final = {"model": model, "created_at": "2026-01-01T00:00:00Z",
+                     "message": {"role": "assistant", "content": ""}, "done": True,
+                     "load_duration": 1000000, "eval_count": len(words), "prompt_eval_count": turns}
+            self._chunk(json.dumps(final) + "\n")
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _chunk(self, text: str):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
@@ -0,0 +1,102 @@
+import sys
+import os
+import json
+import threading
+import unittest
+import http.client
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.admission import AdmissionController, TokenBucket
+from vinni.core import ChatBot
+from vinni.server import ViNNiServer, make_bot_factory
+
+def fake_chat(model=None, messages=None, options=None, stream=False, **kwargs):
+    return iter([{'message': {'content': "ok " * 20}}])
+
+class TestAdmission(unittest.TestCase):
+    def test_bucket_refill_and_wait(self):
+        bucket = TokenBucket(rate=10, capacity=100)
+        bucket.charge(100)
+        self.assertAlmostEqual(bucket.wait_time(50), 5.0)
+        bucket.refill(bucket.updated_at + 2)
+        self.assertAlmostEqual(bucket.tokens, 20)
+        bucket.refill(bucket.updated_at + 60)
+        self.assertEqual(bucket.tokens, 100)
+
+    def test_session_and_global_limits(self):
+        admission = AdmissionController(session_rate=1, session_burst=100, global_rate=1, global_burst=150)
+        self.assertTrue(admission.admit("a", 80)[0])
+        ok, busy = admission.admit("a", 80)
+        self.assertFalse(ok)
+        self.assertEqual(busy["reason"], "session")
+        self.assertGreater(busy["retry_after"], 0)
+        # Session b has its own budget, but the global one is nearly spent
+        ok, busy = admission.admit("b", 80)
+        self.assertEqual(busy["reason"], "global")
+        admission.settle("a", -80)  # Refund
+        self.assertTrue(admission.admit("b", 80)[0])
+        self.assertEqual(admission.stats()["shed"], {"session": 1, "global": 1})
+
+    def test_chatbot_sheds_with_busy_reply(self):
+        admission = AdmissionController(session_rate=0.001, session_burst=160, expected_output=150)
+        bot = ChatBot(model_name="llama3.1", admission=admission)
+        with mock.patch("vinni.core.ollama.chat", side_effect=fake_chat) as chat, \
+             mock.patch("vinni.core.SecurityLogger.log_turn") as log_turn:
+            first = "".join(bot.chat("first admission question please"))
+            second = "".join(bot.chat("second admission question please"))
+        self.assertEqual(chat.call_count, 1)
+        self.assertNotIn("System Busy", first)
+        self.assertIn("System Busy", second)
+        self.assertEqual(bot.last_busy["reason"], "session")
+        self.assertTrue(log_turn.call_args.kwargs["flags"]["shed"])
+        # The shed turn leaves no trace in the conversation
+        self.assertEqual([m['role'] for m in bot.history], ['system', 'user', 'assistant'])
+
+    def test_charge_covers_the_prompt_sent(self):
+        admission = AdmissionController(session_rate=1000, expected_output=150)
+        bot = ChatBot(model_name="llama3.1", admission=admission)
+        with mock.patch("vinni.core.ollama.chat", side_effect=fake_chat), \
+             mock.patch("vinni.core.SecurityLogger.log_turn") as log_turn, \
+             mock.patch.object(admission, "admit", wraps=admission.admit) as admit:
+            "".join(bot.chat("Tell me about the long history of rivers " * 20))
+            "".join(bot.chat("And lakes?"))
+        # The second turn pays for the history it resends, not only its own short message
+        cost = admit.call_args.args[1]
+        sent = log_turn.call_args.kwargs["model"]["context"]["tokens"]
+        self.assertEqual(cost, sent + 150)
+        self.assertGreater(cost, bot._estimate_tokens("And lakes?") + 150 + 100)
+
+class TestServerShedding(unittest.TestCase):
+    def setUp(self):
+        # Keep test turns out of the real audit log (vinni.log)
+        log_turn = mock.patch("vinni.core.SecurityLogger.log_turn")
+        log_turn.start()
+        self.addCleanup(log_turn.stop)
+
+    def test_http_429(self):
+        admission = AdmissionController(session_rate=0.001, session_burst=160)
+        server = ViNNiServer(("127.0.0.1", 0), make_bot_factory("llama3.1", admission=admission))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with mock.patch("vinni.core.ollama.chat", side_effect=fake_chat):
+                conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+                conn.request("POST", "/chat", body=json.dumps({"message": "shed me over http", "stream": False, "session_id": "s1"}))
+                self.assertEqual(conn.getresponse().status, 200)
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+                conn.request("POST", "/chat", body=json.dumps({"message": "shed me again over http", "session_id": "s1"}))
+                resp = conn.getresponse()
+                body = json.loads(resp.read())
+                conn.close()
+            self.assertEqual(resp.status, 429)
+            self.assertEqual(body["error"], "busy")
+            self.assertIsNotNone(resp.getheader("Retry-After"))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == '__main__':
+    unittest.main()
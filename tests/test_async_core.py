@@ -0,0 +1,168 @@
+import sys
+import os
+import asyncio
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.async_core import AsyncChatBot
+from vinni.breaker import CircuitBreaker
+from vinni.cancellation import CancelToken
+from vinni.client import make_async_client
+from vinni.lifecycle import ModelLifecycle
+from vinni.scheduler import IntentScheduler
+
+class FakeAsyncClient:
+    """Stands in for ollama.AsyncClient; each stream yields after a short sleep."""
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.calls = []  # kwargs beyond model/messages/options/stream, per call
+
+    async def chat(self, model=None, messages=None, options=None, stream=False, **kwargs):
+        self.calls.append(kwargs)
+        if not stream:
+            return {'message': {'content': '{"status": "PASS", "reason": "ok", "confidence": 1.0}'}}
+        prompt = messages[-1]['content']
+
+        async def gen():
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            try:
+                for word in ["Echo:", " ", prompt]:
+                    await asyncio.sleep(0.01)
+                    yield {'message': {'content': word}}
+            finally:
+                self.active -= 1
+        return gen()
+
+class TestAsyncChatBot(unittest.TestCase):
+    def setUp(self):
+        # Keep test turns out of the real audit log (vinni.log)
+        log_turn = mock.patch("vinni.core.SecurityLogger.log_turn")
+        log_turn.start()
+        self.addCleanup(log_turn.stop)
+
+    def test_concurrent_sessions(self):
+        """Several sessions stream at the same time on one event loop."""
+        client = FakeAsyncClient()
+        bots = [AsyncChatBot(model_name="llama3.1") for _ in range(5)]
+        for bot in bots:
+            bot.async_client = client
+
+        async def run(bot, i):
+            return "".join([chunk async for chunk in bot.chat(f"Tell me a story number {i}")])
+
+        async def main():
+            return await asyncio.gather(*(run(bot, i) for i, bot in enumerate(bots)))
+
+        results = asyncio.run(main())
+        for i, text in enumerate(results):
+            self.assertEqual(text, f"Echo: Tell me a story number {i}")
+        self.assertEqual(client.peak, 5, "Streams should overlap, not run one after another.")
+        self.assertEqual(bots[0].history[-1]['content'], "Echo: Tell me a story number 0")
+
+    def test_static_and_cache(self):
+        bot = AsyncChatBot(model_name="llama3.1")
+        bot.async_client = FakeAsyncClient()
+
+        async def collect(text):
+            return "".join([chunk async for chunk in bot.chat(text)])
+
+        self.assertIn("Abhishek Arora", asyncio.run(collect("Who created you?")))
+        first = asyncio.run(collect("Write a poem about rain"))
+        second = asyncio.run(collect("Write a poem about rain"))
+        self.assertEqual(first, second)
+        self.assertEqual(bot.cache_stats()["DOCUMENT"]["hits"], 1)
+
+    def test_breaker_guards_every_call(self):
+        class FailingClient(FakeAsyncClient):
+            calls = 0
+
+            async def chat(self, **kwargs):
+                FailingClient.calls += 1
+                raise ConnectionError("connection refused")
+
+        breaker = CircuitBreaker(min_calls=2, open_seconds=60)
+        bot = AsyncChatBot(model_name="llama3.1", breaker=breaker)
+        bot.async_client = FailingClient()
+
+        async def collect(text):
+            return "".join([chunk async for chunk in bot.chat(text)])
+
+        with mock.patch("vinni.core.SecurityLogger.log_turn"):
+            self.assertIn("System Error", asyncio.run(collect("Tell me about failing rivers")))
+            self.assertIn("System Error", asyncio.run(collect("Tell me about failing lakes")))
+            self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+            calls = FailingClient.calls
+            reply = asyncio.run(collect("Tell me about failing seas"))
+        self.assertIn("System Unavailable", reply)
+        self.assertEqual(FailingClient.calls, calls)
+        # The degraded turn never reached the model, so its user message is withdrawn
+        self.assertNotIn("failing seas", bot.history[-1]['content'])
+
+    def test_pooled_client_and_keep_alive(self):
+        bot = AsyncChatBot(model_name="llama3.1", lifecycle=ModelLifecycle(default_keep_alive="45m"))
+        timeout = bot.async_client._client.timeout
+        self.assertEqual((timeout.connect, timeout.read), (5.0, 300.0))
+
+        shared = make_async_client()
+        self.assertIs(AsyncChatBot(model_name="llama3.1", async_client=shared).async_client, shared)
+
+        client = FakeAsyncClient()
+        bot.async_client = client
+
+        async def collect(text):
+            return "".join([chunk async for chunk in bot.chat(text)])
+
+        with mock.patch("vinni.core.SecurityLogger.log_turn"):
+            asyncio.run(collect("Calculate the interest on a $250,000 loan at 6% for 20 years"))
+        # Extraction, stream and verifier fallback all reset the unload timer
+        self.assertGreaterEqual(len(client.calls), 2)
+        self.assertTrue(all(call.get("keep_alive") == "45m" for call in client.calls))
+
+    def test_turn_timeout_closes_stalled_stream(self):
+        closed = []
+
+        class StalledClient(FakeAsyncClient):
+            async def chat(self, **kwargs):
+                async def gen():
+                    try:
+                        yield {'message': {'content': "Partial"}}
+                        await asyncio.sleep(30)  # The model stalls mid-answer
+                        yield {'message': {'content': " never"}}
+                    finally:
+                        closed.append(True)
+                return gen()
+
+        bot = AsyncChatBot(model_name="llama3.1", turn_timeout=0.2)
+        bot.async_client = StalledClient()
+
+        async def collect(text):
+            return "".join([chunk async for chunk in bot.chat(text)])
+
+        reply = asyncio.run(asyncio.wait_for(collect("Tell me about stalled rivers"), 5))
+        self.assertEqual(reply, "Partial\n[Cancelled: deadline]")
+        self.assertEqual(closed, [True])
+        # What the user saw is kept as the answer
+        self.assertEqual(bot.history[-1]['content'], "Partial")
+
+    def test_cancel_token_and_sync_only_controls(self):
+        bot = AsyncChatBot(model_name="llama3.1")
+        bot.async_client = FakeAsyncClient()
+        cancel = CancelToken()
+
+        async def collect(text):
+            chunks = []
+            async for chunk in bot.chat(text, cancel=cancel):
+                chunks.append(chunk)
+                cancel.cancel("closed")
+            return "".join(chunks)
+
+        self.assertEqual(asyncio.run(collect("Tell me about cancelled rivers")), "Echo:\n[Cancelled: closed]")
+        with self.assertRaises(ValueError):
+            AsyncChatBot(model_name="llama3.1", scheduler=IntentScheduler(max_concurrent=1))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import sys
+import os
+import io
+import json
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.batch import BatchRunner, read_records
+from vinni.sessions import make_bot_factory
+
+def fake_chat(model=None, messages=None, options=None, stream=False, **kwargs):
+    turns = sum(1 for m in messages if m['role'] == 'user')
+    return iter([{'message': {'content': f"Turn {turns}: "}}, {'message': {'content': messages[-1]['content']}}])
+
+INPUT = "\n".join([
+    json.dumps({"id": "a1", "session_id": "conv", "message": "Tell me about batch rivers"}),
+    json.dumps({"id": "a2", "session_id": "conv", "message": "And batch lakes?"}),
+    json.dumps("help"),
+    "{not json",
+    json.dumps({"id": "x", "title": "no query here"}),
+    json.dumps({"id": "b1", "query": "Write a batch poem"}),
+    "",
+])
+
+class TestBatch(unittest.TestCase):
+    def test_read_records(self):
+        records = list(read_records(io.StringIO(INPUT)))
+        self.assertEqual(len(records), 6)
+        self.assertEqual(records[2]["message"], "help")
+        self.assertIn("Invalid JSON", records[3]["error"])
+        self.assertIn("No query field", records[4]["error"])
+        self.assertEqual(records[5]["message"], "Write a batch poem")
+
+    def test_run_writes_incremental_results(self):
+        out = io.StringIO()
+        runner = BatchRunner(make_bot_factory("llama3.1"), concurrency=3)
+        with mock.patch("vinni.core.ollama.chat", side_effect=fake_chat), \
+             mock.patch("vinni.core.SecurityLogger.log_turn"):
+            summary = runner.run(read_records(io.StringIO(INPUT)), out)
+            # Second pass: same poem is now a shared cache hit
+            runner.run(read_records(io.StringIO(json.dumps({"id": "b2", "message": "Write a batch poem"}))), out)
+
+        results = {r["id"]: r for r in map(json.loads, out.getvalue().splitlines())}
+        self.assertEqual(summary["records"], 6)
+        self.assertEqual(summary["errors"], 2)
+        # Same session_id: second turn sees the first
+        self.assertEqual(results["a1"]["response"], "Turn 1: Tell me about batch rivers")
+        self.assertEqual(results["a2"]["response"], "Turn 2: And batch lakes?")
+        self.assertTrue(results["line-3"]["static"])
+        self.assertFalse(results["b1"]["cache_hit"])
+        self.assertTrue(results["b2"]["cache_hit"])
+        self.assertTrue(results["b2"]["cache_source"].startswith("memory."))
+        self.assertIn("latency_ms", results["b1"])
+        self.assertFalse(results["b1"]["engine"])
+
+    def test_sessions_are_chained_and_released(self):
+        lines = [json.dumps({"id": f"s{i}-{t}", "session_id": f"s{i}", "message": f"Tell me about chained topic {i} {t}"})
+                 for t in range(3) for i in range(3)]
+        lines.append(json.dumps({"id": "late", "session_id": "s0", "message": "Tell me about the late topic"}))
+        out = io.StringIO()
+        runner = BatchRunner(make_bot_factory("llama3.1"), concurrency=2)
+        small = BatchRunner(make_bot_factory("llama3.1"), concurrency=2, max_sessions=1)
+        with mock.patch("vinni.core.ollama.chat", side_effect=fake_chat), \
+             mock.patch("vinni.core.SecurityLogger.log_turn"):
+            runner.run(read_records(io.StringIO("\n".join(lines))), out)
+            small.run(read_records(io.StringIO("\n".join(lines[:3]))), io.StringIO())
+
+        results = {r["id"]: r for r in map(json.loads, out.getvalue().splitlines())}
+        for i in range(3):
+            self.assertEqual(results[f"s{i}-2"]["response"], f"Turn 3: Tell me about chained topic {i} 2")
+        # A session's finished bot is kept for its next record
+        self.assertEqual(results["late"]["response"], "Turn 4: Tell me about the late topic")
+        self.assertEqual(runner._chains, {})
+        # ...for up to max_sessions idle sessions
+        self.assertEqual(len(small._sessions), 1)
+
+    def test_pipeline_error_still_writes_a_record(self):
+        class BrokenBot:
+            session_id = None
+            last_turn = {"intent": "CHAT"}  # No flags: result assembly fails
+
+            def chat(self, message, request_id=None):
+                yield "partial"
+
+        out = io.StringIO()
+        summary = BatchRunner(BrokenBot, concurrency=2).run(read_records(io.StringIO(json.dumps("Hi there"))), out)
+        result = json.loads(out.getvalue())
+        self.assertEqual(result["id"], "line-1")
+        self.assertIn("KeyError", result["error"])
+        self.assertEqual(summary["errors"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
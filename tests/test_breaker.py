@@ -0,0 +1,89 @@
+import sys
+import os
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.breaker import CircuitBreaker, CircuitOpenError
+from vinni.core import ChatBot
+
+LOAN = {'message': {'content': '{"type": "loan", "principal": 300000, "rate_annual": 0.05, "years": 30}'}}
+
+def boom(*args, **kwargs):
+    raise ConnectionError("connection refused")
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_on_error_rate_and_recovers_via_probe(self):
+        breaker = CircuitBreaker(window=4, failure_rate=0.5, min_calls=4, open_seconds=0.05)
+        for ok in (True, False, True, False):
+            if ok:
+                breaker.record_success(10)
+            else:
+                breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.call(lambda: "never")
+
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(breaker.allow())   # The single probe
+        self.assertFalse(breaker.allow())  # Everyone else still fails fast
+        breaker.record_success(10)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_slow_first_token_counts_as_failure(self):
+        breaker = CircuitBreaker(min_calls=2, slow_call_ms=100, open_seconds=60)
+        breaker.record_success(500)
+        breaker.record_success(500)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(min_calls=1, open_seconds=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        with self.assertRaises(ConnectionError):
+            breaker.call(boom)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(breaker.stats()["opened"], 2)
+
+class TestDegradedMode(unittest.TestCase):
+    def setUp(self):
+        ChatBot.extraction_cache.clear()
+        ChatBot.extraction_negative_cache.clear()
+        self.breaker = CircuitBreaker(min_calls=2, open_seconds=60)
+        self.bot = ChatBot(model_name="llama3.1", breaker=self.breaker)
+        self.log_patch = mock.patch("vinni.core.SecurityLogger.log_turn")
+        self.log_turn = self.log_patch.start()
+
+    def tearDown(self):
+        self.log_patch.stop()
+
+    def test_fail_fast_once_open(self):
+        with mock.patch("vinni.core.ollama.chat", side_effect=boom) as chat:
+            for i in range(2):
+                self.assertIn("System Error", "".join(self.bot.chat(f"hello number {i} there")))
+            self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+            calls = chat.call_count
+            reply = "".join(self.bot.chat("hello once more there"))
+        self.assertEqual(chat.call_count, calls)
+        self.assertIn("System Unavailable", reply)
+        self.assertTrue(self.log_turn.call_args.kwargs["flags"]["degraded"])
+
+    def test_math_followup_answered_by_engine(self):
+        with mock.patch("vinni.core.ollama.chat", return_value=LOAN):
+            self.bot._process_math_request("$300,000 mortgage at 5% for 30 years", "ANALYSIS")
+        for _ in range(2):
+            self.breaker.record_failure()
+
+        with mock.patch("vinni.core.ollama.chat") as chat:
+            reply = "".join(self.bot.chat("What if I add an extra $200 a month?"))
+        chat.assert_not_called()
+        self.assertIn("Degraded Mode", reply)
+        self.assertIn("interest_saved", reply)
+        self.assertIn("Deterministic Math", reply)
+        self.assertEqual(self.bot.history[-1]['content'], reply)
+
+if __name__ == '__main__':
+    unittest.main()
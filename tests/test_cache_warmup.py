@@ -0,0 +1,80 @@
+import sys
+import os
+import json
+import hashlib
+import unittest
+import tempfile
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.core import ChatBot
+from vinni.cache import CacheBackend
+
+def _entry(text, output, model, prompt_hash, intent="DOCUMENT", cache_hit=False, followup=False):
+    input_hash = hashlib.md5(text.encode()).hexdigest()
+    return {
+        "intent": intent,
+        "cache_hit": cache_hit,
+        "input_hash": input_hash,
+        "model": {"name": "cache" if cache_hit else model},
+        "system": {"name": "ViNNi", "system_prompt_hash": prompt_hash},
+        "output": {"text": output},
+        "flags": {"static_response": False, "cache_hit": cache_hit, "followup": followup}
+    }
+
+class TestCacheWarmup(unittest.TestCase):
+    def test_warm_from_log(self):
+        bot = ChatBot(model_name="llama3.1")
+        query = "Write a haiku about speed."
+
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = os.path.join(tmp, "vinni.log")
+            with open(log_path, "w", encoding="utf-8") as f:
+                for entry in [
+                    _entry(query, "Old answer", "llama3.1", bot.prompt_hash),
+                    _entry(query, "Fast wind", "llama3.1", bot.prompt_hash),
+                    _entry(query, "Fast wind", "llama3.1", bot.prompt_hash, cache_hit=True),
+                    _entry("Other model", "Nope", "qwen2.5", bot.prompt_hash),
+                    _entry("Stale prompt", "Nope", "llama3.1", "deadbeef"),
+                ]:
+                    f.write(json.dumps(entry) + "\n")
+                f.write("not json\n")
+
+            loaded = bot.warm_cache(log_path=log_path, top_n=5)
+
+        self.assertEqual(loaded, 1, "Only the current model + prompt_hash answers may be warmed.")
+        key = bot._cache_key(hashlib.md5(query.encode()).hexdigest())
+        cached, source = bot._cache_get("DOCUMENT", key)
+        self.assertEqual(cached, "Fast wind")
+        self.assertEqual(source, "memory.DOCUMENT")
+
+    def test_warm_backfills_backend_in_batches(self):
+        backend = mock.Mock(spec=CacheBackend)
+        backend.get_many.return_value = {}
+        bot = ChatBot(model_name="llama3.1", cache_backend=backend)
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = os.path.join(tmp, "vinni.log")
+            with open(log_path, "w", encoding="utf-8") as f:
+                for i in range(3):
+                    f.write(json.dumps(_entry(f"Query {i}", f"Answer {i}", "llama3.1", bot.prompt_hash)) + "\n")
+            self.assertEqual(bot.warm_cache(log_path=log_path, top_n=5), 3)
+
+        backend.get_many.assert_called_once()
+        backend.set_many.assert_called_once()
+        segment, items = backend.set_many.call_args[0]
+        self.assertEqual(segment, "DOCUMENT")
+        self.assertEqual(sorted(items.values()), ["Answer 0", "Answer 1", "Answer 2"])
+        backend.set.assert_not_called()
+
+    def test_math_followups_not_warmed(self):
+        bot = ChatBot(model_name="llama3.1")
+        query = "What if I add an extra $200 a month?"
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = os.path.join(tmp, "vinni.log")
+            with open(log_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(_entry(query, "You save $40,000", "llama3.1", bot.prompt_hash, followup=True)) + "\n")
+            self.assertEqual(bot.warm_cache(log_path=log_path, top_n=5), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import sys
+import os
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.cancellation import CancelToken
+from vinni.core import ChatBot
+
+class FakeStream:
+    """Stands in for the ollama stream generator; records whether it was closed."""
+    def __init__(self, words, delay=0.0, stall_after=None, stall=0.0, interrupt_after=None):
+        self.words = words
+        self.delay = delay
+        self.stall_after = stall_after
+        self.stall = stall
+        self.interrupt_after = interrupt_after
+        self.closed = False
+        self.consumed = 0
+
+    def __iter__(self):
+        for word in self.words:
+            if self.closed:
+                return
+            time.sleep(self.stall if self.consumed == self.stall_after else self.delay)
+            if self.consumed == self.interrupt_after:
+                raise KeyboardInterrupt
+            self.consumed += 1
+            yield {'message': {'content': word}}
+
+    def close(self):
+        self.closed = True
+
+class TestCancellation(unittest.TestCase):
+    def setUp(self):
+        self.bot = ChatBot(model_name="llama3.1")
+        self.stream = FakeStream(["one ", "two ", "three ", "four ", "five"], delay=0.02)
+        patches = [
+            mock.patch("vinni.core.ollama.chat", return_value=self.stream),
+            mock.patch("vinni.core.SecurityLogger.log_turn"),
+            mock.patch.object(ChatBot, "_finish_generation"),
+        ]
+        self.chat, self.log_turn, self.finish = [p.start() for p in patches]
+        for p in patches:
+            self.addCleanup(p.stop)
+
+    def test_token_cancel_closes_stream_and_skips_post_processing(self):
+        token = CancelToken()
+        chunks = []
+        for chunk in self.bot.chat("tell me about the ocean slowly", cancel=token):
+            chunks.append(chunk)
+            if len(chunks) == 2:
+                token.cancel("client")
+        self.assertEqual(chunks[:2], ["one ", "two "])
+        self.assertEqual(chunks[-1], "\n[Cancelled: client]")
+        self.assertTrue(self.stream.closed)
+        self.finish.assert_not_called()
+        flags = self.log_turn.call_args.kwargs["flags"]
+        self.assertTrue(flags["cancelled"])
+        self.assertEqual(self.log_turn.call_args.kwargs["output"], "one two ")
+        self.assertEqual(self.bot.history[-1], {'role': 'assistant', 'content': "one two "})
+
+    def test_deadline(self):
+        chunks = list(self.bot.chat("tell me a long slow story", cancel=CancelToken(timeout=0.05)))
+        self.assertEqual(chunks[-1], "\n[Cancelled: deadline]")
+        self.assertLess(self.stream.consumed, 5)
+        self.finish.assert_not_called()
+
+    def test_deadline_fires_while_model_stalls(self):
+        self.stream.stall_after, self.stream.stall = 1, 1.0
+        started = time.monotonic()
+        chunks = list(self.bot.chat("tell me a stalled story", cancel=CancelToken(timeout=0.1)))
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(chunks, ["one ", "\n[Cancelled: deadline]"])
+        self.assertEqual(self.bot.history[-1], {'role': 'assistant', 'content': "one "})
+
+    def test_keyboard_interrupt_is_recorded(self):
+        self.stream.interrupt_after = 2
+        gen = self.bot.chat("a story to interrupt")
+        with self.assertRaises(KeyboardInterrupt):
+            for _ in gen:
+                pass
+        self.assertTrue(self.stream.closed)
+        self.finish.assert_not_called()
+        self.assertTrue(self.log_turn.call_args.kwargs["flags"]["cancelled"])
+        self.assertEqual(self.log_turn.call_args.kwargs["model"]["reason"], "interrupted")
+        self.assertEqual(self.bot.history[-1], {'role': 'assistant', 'content': "one two "})
+
+    def test_closing_generator_cancels(self):
+        gen = self.bot.chat("another slow story please")
+        next(gen)
+        gen.close()  # e.g. client disconnect or Ctrl-C in the CLI
+        self.assertTrue(self.stream.closed)
+        self.assertTrue(self.log_turn.call_args.kwargs["flags"]["cancelled"])
+        self.assertEqual(self.log_turn.call_args.kwargs["model"]["reason"], "closed")
+
+    def test_turn_timeout_default(self):
+        bot = ChatBot(model_name="llama3.1", turn_timeout=0)
+        chunks = list(bot.chat("already out of time"))
+        self.assertEqual(chunks, ["\n[Cancelled: deadline]"])
+        self.chat.assert_not_called()
+        # Nothing was generated, so the user message is withdrawn
+        self.assertNotEqual(bot.history[-1]['role'], 'user')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import sys
+import os
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.fake_ollama import FakeOllama
+from vinni.client import make_client
+from vinni.core import ChatBot
+
+class TestPooledClient(unittest.TestCase):
+    def setUp(self):
+        ChatBot.extraction_cache.clear()
+        ChatBot.extraction_negative_cache.clear()
+        self.ollama = FakeOllama().__enter__()
+        self.addCleanup(self.ollama.__exit__, None, None, None)
+
+    def test_math_turn_reuses_one_connection(self):
+        client = make_client(host=self.ollama.host)
+        bot = ChatBot(model_name="llama3.1", client=client)
+        verifier = bot.verifier
+        with mock.patch("vinni.core.SecurityLogger.log_turn"):
+            reply = "".join(bot.chat("Calculate the interest on a $250,000 loan at 6% for 20 years"))
+        self.assertIn("Turn 1:", reply)
+        # Extraction, stream and verifier fallback all hit the fake server...
+        self.assertEqual(self.ollama.count("/api/chat"), 3)
+        # ...over a single keep-alive connection
+        self.assertEqual(len(set(self.ollama.peers)), 1)
+        # The verifier is built once per bot, not per turn
+        self.assertIs(bot.verifier, verifier)
+        self.assertIs(bot.verifier.client, client)
+
+    def test_default_timeouts_are_bounded(self):
+        client = make_client(host=self.ollama.host)
+        timeout = client._client.timeout
+        self.assertEqual(timeout.connect, 5.0)
+        self.assertIsNotNone(timeout.read)
+
+if __name__ == '__main__':
+    unittest.main()
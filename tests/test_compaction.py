@@ -0,0 +1,125 @@
+import sys
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.core import ChatBot
+from vinni.compaction import SUMMARY_PREFIX, HistoryCompactor
+from vinni.scheduler import IntentScheduler
+
+class TestCompaction(unittest.TestCase):
+    def setUp(self):
+        self.sent = []
+        self.summary_calls = []
+
+    def fake_chat(self, model=None, messages=None, options=None, stream=False, **kwargs):
+        if not stream:
+            self.summary_calls.append(messages)
+            if messages[-1]['content'].startswith("USER: Tell me about failing"):
+                raise RuntimeError("model went away")
+            return {'message': {'content': "- User asked about compacted rivers."}}
+        self.sent.append(messages)
+        return iter([{'message': {'content': "y" * 100}}])
+
+    def run_turns(self, bot, prompts):
+        with mock.patch("vinni.core.ollama.chat", side_effect=self.fake_chat), \
+             mock.patch("vinni.core.SecurityLogger.log_turn"):
+            for prompt in prompts:
+                "".join(bot.chat(prompt))
+                if bot._compaction:
+                    bot._compaction[1].exception(5)
+
+    def test_old_turns_replaced_by_summary_note(self):
+        compactor = HistoryCompactor(threshold_tokens=50, keep_recent=2)
+        bot = ChatBot(model_name="llama3.1", compactor=compactor)
+        self.run_turns(bot, ["Tell me about compacted rivers", "Tell me about compacted lakes", "Tell me about compacted seas"])
+
+        self.assertIn("USER: Tell me about compacted rivers", self.summary_calls[0][-1]['content'])
+        # Applied before the third request: its prompt carries the note instead of turn one
+        note = self.sent[-1][1]
+        self.assertEqual(note['role'], 'system')
+        self.assertTrue(note['content'].startswith(SUMMARY_PREFIX))
+        self.assertNotIn("Tell me about compacted rivers", [m['content'] for m in self.sent[-1]])
+        self.assertIs(bot.history[1], note)
+        self.assertEqual(len(bot.history), 6)
+        self.assertEqual(compactor.stats()["compactions"], 1)
+        self.assertGreater(compactor.stats()["saved_tokens"], 0)
+
+    def test_pinned_messages_stay_out_of_the_summary(self):
+        bot = ChatBot(model_name="llama3.1", compactor=HistoryCompactor(threshold_tokens=50, keep_recent=2))
+        self.run_turns(bot, ["Tell me about pinned rivers"])
+        pinned = bot.pin(1)
+        self.run_turns(bot, ["Tell me about pinned lakes", "Tell me about pinned seas"])
+        self.assertNotIn("pinned rivers", self.summary_calls[0][-1]['content'])
+        self.run_turns(bot, ["Tell me about pinned oceans"])
+        self.assertIs(bot.history[1], pinned)
+        self.assertTrue(bot.history[2]['content'].startswith(SUMMARY_PREFIX))
+
+    def test_pinned_after_submit_skips_block(self):
+        compactor = HistoryCompactor(threshold_tokens=50, keep_recent=2)
+        bot = ChatBot(model_name="llama3.1", compactor=compactor)
+        self.run_turns(bot, ["Tell me about late rivers", "Tell me about late lakes"])
+        block, _ = bot._compaction
+        # Pinned while the summary was running: the block no longer covers only compactable turns
+        bot.pin(bot.history.index(block[0]))
+        before = list(bot.history)
+        bot._apply_compaction()
+        self.assertEqual(bot.history, before)
+        self.assertEqual(compactor.stats()["compactions"], 0)
+
+    def test_summary_waits_for_scheduler_slot(self):
+        scheduler = IntentScheduler(max_concurrent=1)
+        bot = ChatBot(model_name="llama3.1", scheduler=scheduler,
+                      compactor=HistoryCompactor(threshold_tokens=50, keep_recent=2))
+        turn = scheduler.acquire("CHAT")
+        done, order = [], []
+
+        def user_turn():
+            ticket = scheduler.acquire("CODE")
+            order.append("CODE")
+            scheduler.release(ticket)
+
+        def summary():
+            done.append(bot._summarize_messages([{'role': 'user', 'content': "hi"}]))
+            order.append("COMPACT")
+
+        with mock.patch("vinni.core.ollama.chat", side_effect=self.fake_chat):
+            worker = threading.Thread(target=summary)
+            worker.start()
+            while scheduler.stats()["COMPACT"]["waiting"] == 0:
+                time.sleep(0.01)
+            self.assertEqual(self.summary_calls, [])
+            # A user turn queued after the summary still goes first
+            waiting_chat = threading.Thread(target=user_turn)
+            waiting_chat.start()
+            while scheduler.stats()["CODE"]["waiting"] == 0:
+                time.sleep(0.01)
+            scheduler.release(turn)
+            waiting_chat.join(5)
+            worker.join(5)
+        self.assertEqual(done, ["- User asked about compacted rivers."])
+        self.assertEqual(order, ["CODE", "COMPACT"])
+        self.assertEqual(scheduler.stats()["COMPACT"]["admitted"], 1)
+        self.assertEqual(scheduler.stats()["CODE"]["admitted"], 1)
+
+    def test_failed_summary_keeps_history(self):
+        compactor = HistoryCompactor(threshold_tokens=50, keep_recent=2)
+        bot = ChatBot(model_name="llama3.1", compactor=compactor)
+        self.run_turns(bot, ["Tell me about failing rivers", "Tell me about failing lakes", "Tell me about failing seas"])
+        self.assertEqual(compactor.stats()["failures"], 1)
+        self.assertEqual(compactor.stats()["compactions"], 0)
+        self.assertEqual(bot.history[1]['content'], "Tell me about failing rivers")
+        self.assertEqual(len(bot.history), 7)
+
+    def test_below_threshold_does_nothing(self):
+        bot = ChatBot(model_name="llama3.1", compactor=HistoryCompactor(threshold_tokens=10000))
+        self.run_turns(bot, ["Tell me about quiet rivers", "Tell me about quiet lakes"])
+        self.assertIsNone(bot._compaction)
+        self.assertEqual(self.summary_calls, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import sys
+import os
+import unittest
+import tempfile
+import multiprocessing
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.cache import DiskCache
+
+def _writer(path, key, value):
+    DiskCache(path).set("CHAT", key, value)
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_survives_restart(self):
+        """Entries written by one instance are visible to a fresh one."""
+        cache = DiskCache(self.path)
+        cache.set("CHAT", "k1", "Hello!")
+        cache.close()
+
+        reopened = DiskCache(self.path)
+        self.assertEqual(reopened.get("CHAT", "k1"), "Hello!")
+        self.assertIsNone(reopened.get("CODE", "k1"), "Segments must not leak into each other.")
+        reopened.close()
+
+    def test_shared_across_processes(self):
+        """A second process sees entries written by the first."""
+        proc = multiprocessing.Process(target=_writer, args=(self.path, "k2", "From another process"))
+        proc.start()
+        proc.join(timeout=10)
+        self.assertEqual(proc.exitcode, 0)
+
+        cache = DiskCache(self.path)
+        self.assertEqual(cache.get("CHAT", "k2"), "From another process")
+        cache.close()
+
+    def test_prune_keeps_newest(self):
+        cache = DiskCache(self.path, max_entries=3)
+        for i in range(5):
+            cache.set("ANALYSIS", f"k{i}", f"v{i}")
+        cache.prune("ANALYSIS")
+        self.assertEqual(cache.count("ANALYSIS"), 3)
+        self.assertIsNone(cache.get("ANALYSIS", "k0"))
+        self.assertEqual(cache.get("ANALYSIS", "k4"), "v4")
+        cache.close()
+
+    def test_periodic_prune_covers_every_segment(self):
+        cache = DiskCache(self.path, max_entries=3)
+        cache.PRUNE_EVERY = 10
+        for i in range(6):
+            cache.set("CODE", f"k{i}", f"v{i}")
+        # The CHAT writes trigger the prune; CODE is over budget too
+        cache.set_many("CHAT", {f"c{i}": "x" for i in range(4)})
+        self.assertEqual(cache.count("CODE"), 3)
+        self.assertEqual(cache.count("CHAT"), 3)
+        cache.close()
+
+if __name__ == "__main__":
+    unittest.main()
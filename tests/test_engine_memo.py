@@ -0,0 +1,55 @@
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.math_engine import FinanceEngine, ProbabilityEngine, ENGINE_MEMO, engine_memo_stats
+
+class TestEngineMemo(unittest.TestCase):
+    def setUp(self):
+        ENGINE_MEMO.clear()
+        ENGINE_MEMO.hits = 0
+        ENGINE_MEMO.misses = 0
+
+    def test_canonical_inputs_share_one_entry(self):
+        """Positional, keyword, int vs float and defaulted calls hit the same entry."""
+        a = FinanceEngine.calculate_loan_interest(300000, 0.05, 360)
+        b = FinanceEngine.calculate_loan_interest(principal=300000.0, annual_rate=0.05, months=360, payment_freq="monthly")
+        c = FinanceEngine.calculate_loan_interest(300000, 0.05, 360, compounding_freq="monthly", extra_payment=0)
+
+        self.assertEqual(a, b)
+        self.assertEqual(a, c)
+        stats = engine_memo_stats()
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(a["payment_amount"], 1610.46)
+
+    def test_frequency_spellings_share_one_entry(self):
+        a = FinanceEngine.calculate_loan_interest(30000, 0.06, 72, payment_freq="bi-weekly")
+        b = FinanceEngine.calculate_loan_interest(30000, 0.06, 72, payment_freq="Biweekly", compounding_freq="monthly compounded")
+        self.assertEqual(a, b)
+        self.assertEqual(a["payment_frequency"], "biweekly")
+        self.assertEqual(a["num_payments"], 156)
+        self.assertEqual(engine_memo_stats()["entries"], 1)
+
+    def test_formula_from_canonical_values(self):
+        a = FinanceEngine.calculate_compound_interest(1000, 0.05, 10)
+        ENGINE_MEMO.clear()
+        b = FinanceEngine.calculate_compound_interest(1000.0, 0.05, 10.0)
+        self.assertEqual(a["formula"], b["formula"])
+        self.assertEqual(a["formula"], "A = 1000 * (1 + 0.05/1)^(1*10)")
+
+    def test_distinct_inputs_miss(self):
+        FinanceEngine.calculate_compound_interest(1000, 0.05, 10)
+        FinanceEngine.calculate_compound_interest(1000, 0.06, 10)
+        self.assertEqual(engine_memo_stats()["entries"], 2)
+
+    def test_results_are_copies(self):
+        first = ProbabilityEngine.solve_blackjack_probability()
+        first["probability"] = -1
+        again = ProbabilityEngine.solve_blackjack_probability()
+        self.assertAlmostEqual(again["probability"], 0.048265, places=6)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import sys
+import os
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.core import ChatBot
+
+def _reply(content):
+    return {'message': {'content': content}}
+
+class TestExtractionCache(unittest.TestCase):
+    def setUp(self):
+        ChatBot.extraction_cache.clear()
+        ChatBot.extraction_negative_cache.clear()
+        self.bot = ChatBot(model_name="llama3.1")
+
+    def test_positive_cache(self):
+        """Identical (normalized) inputs reuse the extracted JSON."""
+        loan = _reply('{"type": "loan", "principal": 300000, "rate_annual": 0.05, "years": 30}')
+        with mock.patch("vinni.core.ollama.chat", return_value=loan) as chat:
+            first = self.bot._process_math_request("$300,000 mortgage at 5% for 30 years", "ANALYSIS")
+            second = ChatBot(model_name="llama3.1")._process_math_request("$300,000  Mortgage at 5% for 30 years", "ANALYSIS")
+        self.assertEqual(chat.call_count, 1)
+        self.assertEqual(first[1], second[1])
+        self.assertIn("PRIMARY_REQUEST", first[1])
+
+    def test_negative_cache_unknown(self):
+        """Inputs routed to 'unknown' skip extraction on repeat."""
+        coin = _reply('{"type": "probability_generic"}')
+        with mock.patch("vinni.core.ollama.chat", return_value=coin) as chat:
+            self.bot._process_math_request("What is the probability of 3 heads in a row?", "ANALYSIS")
+            result = self.bot._process_math_request("What is the probability of 3 heads in a row?", "ANALYSIS")
+        self.assertEqual(chat.call_count, 1)
+        self.assertIsNone(result)
+
+    def test_model_is_part_of_key(self):
+        loan = _reply('{"type": "loan", "principal": 1000, "rate_annual": 0.05, "years": 1}')
+        with mock.patch("vinni.core.ollama.chat", return_value=loan) as chat:
+            self.bot._process_math_request("Loan of $1000 at 5%", "CHAT")
+            ChatBot(model_name="qwen2.5")._process_math_request("Loan of $1000 at 5%", "CHAT")
+        self.assertEqual(chat.call_count, 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import sys
+import os
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.core import ChatBot
+from vinni.history import HistoryWindow, Message
+
+def msg(role, tokens):
+    return {'role': role, 'content': "x" * (tokens * 4)}
+
+class TestHistoryWindow(unittest.TestCase):
+    def test_keeps_system_and_recent_turns_within_budget(self):
+        history = [msg('system', 10), msg('user', 20), msg('assistant', 20), msg('user', 5), msg('assistant', 5), msg('user', 5)]
+        messages, report = HistoryWindow(max_tokens=30).select(history)
+        self.assertEqual(messages, [history[0], history[3], history[4], history[5]])
+        self.assertEqual(report, {"messages": 4, "tokens": 25, "dropped_messages": 2, "dropped_tokens": 40})
+
+    def test_pinned_and_current_message_always_sent(self):
+        history = [msg('system', 10), msg('user', 8), msg('assistant', 50), msg('user', 40)]
+        messages, report = HistoryWindow(max_tokens=20).select(history, pinned=[history[1]])
+        self.assertEqual(messages, [history[0], history[1], history[3]])
+        self.assertEqual(report["dropped_tokens"], 50)
+
+    def test_budget_from_options(self):
+        self.assertEqual(HistoryWindow.for_options({"num_ctx": 8192}).max_tokens, 8192 - 512)
+        self.assertEqual(HistoryWindow.for_options({"num_ctx": 4096, "num_predict": 1000}).max_tokens, 3096)
+        self.assertEqual(HistoryWindow.for_options({}).max_tokens, 2048 - 512)
+
+    def test_chat_sends_window_and_reports_dropped_tokens(self):
+        sent = []
+
+        def fake_chat(model=None, messages=None, options=None, stream=False, **kwargs):
+            sent.append(messages)
+            return iter([{'message': {'content': "y" * 400}}])
+
+        bot = ChatBot(model_name="llama3.1", history_window=HistoryWindow(max_tokens=110))
+        with mock.patch("vinni.core.ollama.chat", side_effect=fake_chat), \
+             mock.patch("vinni.core.SecurityLogger.log_turn"):
+            "".join(bot.chat("Tell me about windowed rivers"))
+            bot.pin(1)
+            "".join(bot.chat("Tell me about windowed lakes"))
+            "".join(bot.chat("Tell me about windowed seas"))
+        self.assertEqual(len(bot.history), 7)
+        self.assertEqual([m['content'] for m in sent[-1] if m['role'] == 'user'],
+                         ["Tell me about windowed rivers", "Tell me about windowed seas"])
+        self.assertEqual(bot.last_turn["dropped_tokens"], 100 + 100 + len("Tell me about windowed lakes") // 4)
+
+class TestMessage(unittest.TestCase):
+    def test_reads_like_a_dict(self):
+        m = Message('user', "What is my payment?")
+        self.assertEqual(m['role'], 'user')
+        self.assertEqual(dict(m), {'role': 'user', 'content': "What is my payment?"})
+        self.assertEqual(m, {'role': 'user', 'content': "What is my payment?"})
+        self.assertIs(Message(''.join(['assis', 'tant']), "x").role, Message('assistant', "y").role)
+        self.assertFalse(hasattr(m, "__dict__"))
+        m['content'] += " Monthly."
+        self.assertEqual(m.text, "What is my payment? Monthly.")
+        with self.assertRaises(KeyError):
+            m['images']
+
+    def test_injected_context_kept_apart(self):
+        bot = ChatBot(model_name="llama3.1")
+        bot.history.append(Message('user', "Loan of 200k at 5%"))
+        bot._inject_math_context(("[ENGINE] payment=1073.64", {"payment": 1073.64}, []))
+        last = bot.history[-1]
+        self.assertEqual(last.text, "Loan of 200k at 5%")
+        self.assertEqual(last['content'], "Loan of 200k at 5%\n\n[ENGINE] payment=1073.64")
+
+        # Journal records keep the split, and restore rebuilds it
+        state = bot.export_state()
+        self.assertEqual(state["messages"][-1]["context"], "[ENGINE] payment=1073.64")
+        restored = ChatBot(model_name="llama3.1")
+        restored.restore_state(state)
+        self.assertEqual(restored.history[-1].context, "[ENGINE] payment=1073.64")
+        self.assertEqual([dict(m) for m in restored.history], [dict(m) for m in bot.history])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import sys
+import os
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.fake_ollama import FakeOllama
+from vinni.client import make_client
+from vinni.core import ChatBot
+from vinni.lifecycle import ModelLifecycle
+
+class TestModelLifecycle(unittest.TestCase):
+    def setUp(self):
+        self.ollama = FakeOllama().__enter__()
+        self.addCleanup(self.ollama.__exit__, None, None, None)
+        self.client = make_client(host=self.ollama.host)
+        self.lifecycle = ModelLifecycle(client=self.client, keep_alive={"llama3.1": "1h"})
+
+    def test_warm_prefills_system_prompt(self):
+        bot = ChatBot(model_name="llama3.1", options={"num_ctx": 8192}, client=self.client, lifecycle=self.lifecycle)
+        bot.system_prompt_content = "You are ViNNi."
+        load_ms = bot.warm_model()
+        self.assertEqual(load_ms, 1.0)
+        path, payload = self.ollama.requests[-1]
+        self.assertEqual(path, "/api/chat")
+        self.assertEqual(payload["messages"], [{"role": "system", "content": "You are ViNNi."}])
+        self.assertEqual(payload["keep_alive"], "1h")
+        # Same num_ctx as real turns, so the warm model is not reloaded for them
+        self.assertEqual(payload["options"]["num_ctx"], 8192)
+
+    def test_cold_ping_rewarms(self):
+        self.lifecycle.expect("llama3.1", system_prompt="You are ViNNi.")
+        # The fake reports a 1.5 s load for generate: the model had been unloaded
+        self.assertEqual(self.lifecycle.ping("llama3.1"), 1500.0)
+        self.assertEqual(self.ollama.count("/api/generate"), 1)
+        self.assertEqual(self.ollama.count("/api/chat"), 1)
+        stats = self.lifecycle.stats()["llama3.1"]
+        self.assertEqual(stats["cold_starts"], 1)
+        self.assertEqual(stats["max_load_ms"], 1500.0)
+        self.assertEqual(stats["keep_alive"], "1h")
+
+    def test_turns_send_keep_alive_and_log_load(self):
+        bot = ChatBot(model_name="llama3.1", client=self.client, lifecycle=self.lifecycle)
+        with mock.patch("vinni.core.SecurityLogger.log_turn") as log_turn:
+            "".join(bot.chat("say hello to the lifecycle"))
+        chat_payloads = [p for path, p in self.ollama.requests if path == "/api/chat"]
+        self.assertTrue(all(p.get("keep_alive") == "1h" for p in chat_payloads))
+        self.assertEqual(log_turn.call_args.kwargs["model"]["load_ms"], 1.0)
+        self.assertEqual(self.lifecycle.stats()["llama3.1"]["loads"], 1)
+
+    def test_warm_failure_is_quiet(self):
+        self.ollama.fail = True
+        self.assertIsNone(self.lifecycle.warm("llama3.1", "You are ViNNi."))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import sys
+import os
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.cache import LRUCache
+
+class TestLRUCache(unittest.TestCase):
+    def test_hit_refreshes_recency(self):
+        """A hit must protect the entry from the next eviction (FIFO regression)."""
+        cache = LRUCache(max_entries=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        self.assertEqual(cache.get("a"), "1")
+        cache.put("c", "3")
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_byte_budget(self):
+        cache = LRUCache(max_entries=100, max_bytes=30)
+        cache.put("k1", "x" * 10)
+        cache.put("k2", "y" * 10)
+        cache.put("k3", "z" * 10)  # 36 bytes total -> evict k1
+
+        self.assertNotIn("k1", cache)
+        self.assertLessEqual(cache.bytes_used, 30)
+
+        cache.put("huge", "h" * 100)  # Larger than the whole budget
+        self.assertNotIn("huge", cache)
+        self.assertIn("k3", cache)
+
+    def test_stats(self):
+        cache = LRUCache(max_entries=10)
+        cache.put("a", "1")
+        cache.get("a")
+        cache.get("missing")
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["bytes_used"], 2)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_compression_roundtrip(self):
+        """Large entries are stored compressed and come back unchanged."""
+        cache = LRUCache(max_entries=100, compress_threshold=256)
+        long_text = "## Detailed Breakdown\n" + "The effective rate compounds monthly. " * 100
+        cache.put("short", "Hi!")
+        cache.put("long", long_text)
+
+        self.assertEqual(cache.get("short"), "Hi!")
+        self.assertEqual(cache.get("long"), long_text)
+
+        stats = cache.stats()
+        self.assertEqual(stats["compressed_entries"], 1)
+        self.assertGreater(stats["compression_ratio"], 3.0)
+        self.assertLess(cache.bytes_used, len(long_text))
+
+    def test_shared_dictionary(self):
+        cache = LRUCache(max_entries=100, compress_threshold=64)
+        for i in range(60):
+            cache.put(f"k{i}", f"TL;DR: answer {i}. Detailed Breakdown follows with assumptions. " * 12)
+        self.assertTrue(cache.stats()["shared_dictionary"])
+
+        # Entries compressed with and without the dictionary both decompress
+        self.assertTrue(cache.get("k0").startswith("TL;DR: answer 0."))
+        self.assertTrue(cache.get("k59").startswith("TL;DR: answer 59."))
+
+if __name__ == "__main__":
+    unittest.main()
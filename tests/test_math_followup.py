@@ -0,0 +1,65 @@
+import sys
+import os
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.core import ChatBot
+
+LOAN = {'message': {'content': '{"type": "loan", "principal": 300000, "rate_annual": 0.05, "years": 30}'}}
+
+class TestMathFollowup(unittest.TestCase):
+    def setUp(self):
+        # Math turns would otherwise write tests/snapshots/snap_*.json and vinni.log entries
+        for target in ("vinni.snapshot.RegressionSnapshot.save", "vinni.core.SecurityLogger.log_turn"):
+            patcher = mock.patch(target)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        ChatBot.extraction_cache.clear()
+        ChatBot.extraction_negative_cache.clear()
+        self.bot = ChatBot(model_name="llama3.1")
+        with mock.patch("vinni.core.ollama.chat", return_value=LOAN):
+            self.first = self.bot._process_math_request("$300,000 mortgage at 5% for 30 years", "ANALYSIS")
+
+    def test_extra_payment_delta(self):
+        params = self.bot._math_followup_params("What if I add an extra $200 a month?")
+        self.assertEqual(params["principal"], 300000.0)
+        self.assertEqual(params["rate_annual"], 0.05)
+        self.assertEqual(params["extra_payment"], 200.0)
+
+        with mock.patch("vinni.core.ollama.chat") as chat:
+            context, result, _ = self.bot._process_math_request("What if I add an extra $200 a month?", "CHAT", followup_params=params)
+        chat.assert_not_called()
+        self.assertGreater(result["PRIMARY_REQUEST"]["interest_saved"], 0)
+        self.assertIn("VERIFIED RESULT JSON", context)
+
+    def test_rate_and_term_delta(self):
+        params = self.bot._math_followup_params("How about 6% over 15 years instead?")
+        self.assertEqual(params["rate_annual"], 0.06)
+        self.assertEqual(params["years"], 15)
+        self.assertEqual(params["principal"], 300000.0)
+
+    def test_not_a_followup(self):
+        self.assertIsNone(self.bot._math_followup_params("Write a haiku about speed."))
+        self.assertIsNone(self.bot._math_followup_params("What if it rains?"))
+        self.assertIsNone(ChatBot(model_name="llama3.1")._math_followup_params("What if I add an extra $200?"))
+
+    def test_stale_context_needs_loan_topic(self):
+        # An unrelated turn in between: bare numbers no longer reach back to the loan
+        with mock.patch("vinni.core.SecurityLogger.log_turn"):
+            self.bot._begin_turn("Tell me about rivers")
+        self.assertIsNone(self.bot._math_followup_params("How about 6% over 15 years instead?"))
+        self.assertIsNone(self.bot._math_followup_params("What about a $500 laptop?"))
+        params = self.bot._math_followup_params("What if the loan rate were 6% instead?")
+        self.assertEqual(params["rate_annual"], 0.06)
+        self.assertEqual(params["principal"], 300000.0)
+
+    def test_followup_turn_flagged_in_log(self):
+        with mock.patch("vinni.core.ollama.chat", return_value=iter([{'message': {'content': "Saved."}}])), \
+             mock.patch("vinni.core.SecurityLogger.log_turn") as log_turn:
+            "".join(self.bot.chat("What if I add an extra $200 a month?"))
+        self.assertTrue(log_turn.call_args.kwargs["flags"]["followup"])
+
+if __name__ == "__main__":
+    unittest.main()
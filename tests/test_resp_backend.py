@@ -0,0 +1,121 @@
+import sys
+import os
+import time
+import threading
+import unittest
+from unittest import mock
+import socket
+import socketserver
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.cache import RedisCache, RespError
+
+class RespStandIn(socketserver.ThreadingTCPServer):
+    """
+    Minimal in-process RESP server (GET/SET [EX]/DEL/PING) standing in for Redis.
+    """
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RespHandler)
+        self.store = {}  # key -> (value, expires_at)
+        self.connections = 0
+        self.lock = threading.Lock()
+
+class RespHandler(socketserver.StreamRequestHandler):
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        count = int(line[1:-2])
+        args = []
+        for _ in range(count):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            cmd = args[0].upper()
+            with server.lock:
+                if cmd == b"PING":
+                    self.wfile.write(b"+PONG\r\n")
+                elif cmd == b"SET":
+                    ttl = int(args[4]) if len(args) > 4 and args[3].upper() == b"EX" else None
+                    server.store[args[1]] = (args[2], time.time() + ttl if ttl else None)
+                    self.wfile.write(b"+OK\r\n")
+                elif cmd == b"GET":
+                    value, expires = server.store.get(args[1], (None, None))
+                    if value is None or (expires and expires < time.time()):
+                        self.wfile.write(b"$-1\r\n")
+                    else:
+                        self.wfile.write(b"$%d\r\n%s\r\n" % (len(value), value))
+                elif cmd == b"DEL":
+                    removed = 1 if server.store.pop(args[1], None) else 0
+                    self.wfile.write(b":%d\r\n" % removed)
+                else:
+                    self.wfile.write(b"-ERR unknown command\r\n")
+
+class TestRespBackend(unittest.TestCase):
+    def setUp(self):
+        self.server = RespStandIn()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.cache = RedisCache(port=self.server.server_address[1], ttl=60)
+
+    def tearDown(self):
+        self.cache.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get("CHAT", "k1"))
+        self.cache.set("CHAT", "k1", "Héllo 👋")
+        self.assertEqual(self.cache.get("CHAT", "k1"), "Héllo 👋")
+        self.assertIsNone(self.cache.get("CODE", "k1"), "Segments are namespaced.")
+
+    def test_pipelined_many_and_pooling(self):
+        self.cache.set_many("ANALYSIS", {f"k{i}": f"v{i}" for i in range(50)})
+        found = self.cache.get_many("ANALYSIS", [f"k{i}" for i in range(55)])
+        self.assertEqual(len(found), 50)
+        self.assertEqual(found["k42"], "v42")
+        # Every call above reused one pooled socket
+        self.assertEqual(self.server.connections, 1)
+
+    def test_ttl(self):
+        short = RedisCache(port=self.server.server_address[1], ttl=1)
+        short.set("CHAT", "ephemeral", "soon gone")
+        self.assertEqual(short.get("CHAT", "ephemeral"), "soon gone")
+        time.sleep(1.1)
+        self.assertIsNone(short.get("CHAT", "ephemeral"))
+        short.close()
+
+    def test_error_reply(self):
+        self.assertEqual(self.cache.execute("PING"), "PONG")
+        with self.assertRaises(RespError):
+            self.cache.execute("FLUSHALL")
+
+    def test_backoff_while_server_down(self):
+        probe = socket.socket()
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+        probe.close()  # Nothing listens there now
+        down = RedisCache(port=port, backoff=60)
+        with self.assertRaises(OSError):
+            down.get("CHAT", "k1")
+        # Second call fails fast without another connect attempt
+        with mock.patch("vinni.cache.socket.create_connection") as connect:
+            with self.assertRaises(ConnectionError):
+                down.get("CHAT", "k1")
+            connect.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import sys
+import os
+import json
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.core import ChatBot
+from vinni.scheduler import IntentScheduler
+
+class TestIntentScheduler(unittest.TestCase):
+    def setUp(self):
+        # Keep test turns out of the real audit log (vinni.log)
+        log_turn = mock.patch("vinni.core.SecurityLogger.log_turn")
+        log_turn.start()
+        self.addCleanup(log_turn.stop)
+
+    def _queue_behind(self, scheduler, intents):
+        """Holds the only slot, queues `intents` in order, releases, returns grant order."""
+        order = []
+        lock = threading.Lock()
+        blocker = scheduler.acquire("DOCUMENT")
+
+        def worker(intent):
+            with scheduler.slot(intent):
+                with lock:
+                    order.append(intent)
+
+        threads = []
+        for intent in intents:
+            t = threading.Thread(target=worker, args=(intent,))
+            t.start()
+            threads.append(t)
+            # Deterministic arrival order
+            while sum(s["waiting"] for s in scheduler.stats().values()) < len(threads):
+                time.sleep(0.005)
+        scheduler.release(blocker)
+        for t in threads:
+            t.join(5)
+        return order
+
+    def test_priority_then_sjf(self):
+        scheduler = IntentScheduler(max_concurrent=1, expected_tokens={"CODE": 100, "ANALYSIS": 400}, aging=0)
+        order = self._queue_behind(scheduler, ["ANALYSIS", "CODE", "CHAT"])
+        # CHAT has the best priority; CODE and ANALYSIS tie on priority, CODE is shorter
+        self.assertEqual(order, ["CHAT", "CODE", "ANALYSIS"])
+
+    def test_fifo_without_sjf(self):
+        scheduler = IntentScheduler(max_concurrent=1, priorities={}, sjf=False, aging=0)
+        order = self._queue_behind(scheduler, ["ANALYSIS", "CODE", "CHAT"])
+        self.assertEqual(order, ["ANALYSIS", "CODE", "CHAT"])
+
+    def test_intent_slot_cap_and_timeout(self):
+        scheduler = IntentScheduler(max_concurrent=2)
+        held = scheduler.acquire("ANALYSIS")
+        # ANALYSIS may hold one slot only, even though one is free
+        with self.assertRaises(TimeoutError):
+            scheduler.acquire("ANALYSIS", timeout=0.05)
+        with scheduler.slot("CHAT", timeout=0.05):
+            self.assertEqual(scheduler.stats()["CHAT"]["running"], 1)
+        scheduler.release(held)
+        self.assertEqual(scheduler.stats()["ANALYSIS"]["waiting"], 0)
+
+    def test_expected_tokens_from_log_and_feedback(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = os.path.join(tmp, "vinni.log")
+            with open(log_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"intent": "CHAT", "output": {"tokens": 20}, "flags": {}}) + "\n")
+                f.write(json.dumps({"intent": "CHAT", "output": {"tokens": 40}, "flags": {"cache_hit": True}}) + "\n")
+                f.write(json.dumps({"intent": "ANALYSIS", "output_len": 2000, "output": "..."}) + "\n")
+            scheduler = IntentScheduler.from_log(log_path, max_concurrent=1, smoothing=0.5)
+        self.assertEqual(scheduler.expected_tokens("CHAT"), 20)
+        self.assertEqual(scheduler.expected_tokens("ANALYSIS"), 500)
+
+        with scheduler.slot("CHAT") as ticket:
+            ticket.output_tokens = 60
+        self.assertEqual(scheduler.expected_tokens("CHAT"), 40)
+
+    def test_chatbot_generation_uses_slot(self):
+        def fake_chat(model=None, messages=None, options=None, stream=False, **kwargs):
+            return iter([{'message': {'content': "x" * 80}}])
+
+        scheduler = IntentScheduler(max_concurrent=1)
+        bot = ChatBot(model_name="llama3.1", scheduler=scheduler)
+        with mock.patch("vinni.core.ollama.chat", side_effect=fake_chat):
+            "".join(bot.chat("scheduled hello there friend"))
+        stats = scheduler.stats()[bot.get_last_intent("scheduled hello there friend")]
+        self.assertEqual(stats["admitted"], 1)
+        self.assertEqual(stats["running"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
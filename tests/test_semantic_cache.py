@@ -0,0 +1,57 @@
+import sys
+import os
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.cache import SemanticCache, np
+from vinni.sessions import make_bot_factory
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestSemanticCache(unittest.TestCase):
+    def test_paraphrase_hit(self):
+        cache = SemanticCache(threshold=0.9, max_entries=4)
+        cache.add("CHAT|llama3.1|abc", [1.0, 0.0, 0.1], "Write a haiku about speed.", "key-1")
+
+        # Near-identical direction -> hit
+        self.assertEqual(cache.lookup("CHAT|llama3.1|abc", [0.98, 0.01, 0.12], "write a haiku about speed"), "key-1")
+        # Orthogonal -> miss
+        self.assertIsNone(cache.lookup("CHAT|llama3.1|abc", [0.0, 1.0, 0.0], "Tell me a joke"))
+        # Other segment (different prompt hash) -> miss
+        self.assertIsNone(cache.lookup("CHAT|llama3.1|xyz", [1.0, 0.0, 0.1], "Write a haiku about speed."))
+
+    def test_numbers_must_match(self):
+        """Similar wording with different numbers is not a paraphrase."""
+        cache = SemanticCache(threshold=0.9)
+        cache.add("ANALYSIS", [1.0, 0.0], "$300,000 mortgage at 5% for 30 years", "key-5")
+        self.assertIsNone(cache.lookup("ANALYSIS", [1.0, 0.0], "$300,000 mortgage at 6% for 30 years"))
+        self.assertEqual(cache.lookup("ANALYSIS", [1.0, 0.0], "mortgage of $300,000, 5% over 30 years"), "key-5")
+
+    def test_ring_overwrite(self):
+        cache = SemanticCache(threshold=0.99, max_entries=2)
+        cache.add("CHAT", [1.0, 0.0, 0.0], "a", "k1")
+        cache.add("CHAT", [0.0, 1.0, 0.0], "b", "k2")
+        cache.add("CHAT", [0.0, 0.0, 1.0], "c", "k3")  # Overwrites k1
+        self.assertIsNone(cache.lookup("CHAT", [1.0, 0.0, 0.0], "a"))
+        self.assertEqual(cache.lookup("CHAT", [0.0, 0.0, 1.0], "c"), "k3")
+
+    @mock.patch("vinni.core.SecurityLogger.log_turn")
+    def test_shared_across_sessions(self, _log):
+        client = mock.Mock()
+        client.embed.return_value = {"embeddings": [[1.0, 0.0, 0.1]]}
+        client.chat.side_effect = lambda **kwargs: iter([{"message": {"content": "Fast wind, bright road."}}])
+        cache = SemanticCache(threshold=0.9)
+        factory = make_bot_factory("llama3.1", client=client, semantic_cache=cache)
+        first, second = factory(), factory()
+        self.assertIs(first.semantic_cache, cache)
+        self.assertIs(second.semantic_cache, cache)
+
+        "".join(first.chat("Write a haiku about speed."))
+        # Another session's paraphrase is served from the one shared index
+        self.assertEqual("".join(second.chat("Could you write a haiku about speed?")), "Fast wind, bright road.")
+        self.assertEqual(client.chat.call_count, 1)
+        self.assertEqual(cache.hits, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import sys
+import os
+import json
+import threading
+import unittest
+import http.client
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.server import ViNNiServer, make_bot_factory
+
+def fake_chat(model=None, messages=None, options=None, stream=False, **kwargs):
+    turns = sum(1 for m in messages if m['role'] == 'user')
+    return iter([{'message': {'content': f"Turn {turns}: "}}, {'message': {'content': messages[-1]['content']}}])
+
+def _events(raw: str):
+    events = []
+    for block in raw.strip().split("\n\n"):
+        event, data = "message", None
+        for line in block.split("\n"):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: "):])
+        events.append((event, data))
+    return events
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.patches = [mock.patch("vinni.core.ollama.chat", side_effect=fake_chat),
+                        mock.patch("vinni.core.SecurityLogger.log_turn")]
+        for p in self.patches:
+            p.start()
+        self.server = ViNNiServer(("127.0.0.1", 0), make_bot_factory("llama3.1"), idle_timeout=60)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.port = self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        for p in self.patches:
+            p.stop()
+
+    def _post(self, body, headers=None):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+        conn.request("POST", "/chat", body=json.dumps(body), headers={"Content-Type": "application/json", **(headers or {})})
+        resp = conn.getresponse()
+        data = resp.read().decode("utf-8")
+        conn.close()
+        return resp, data
+
+    def test_sse_stream_and_session_reuse(self):
+        resp, raw = self._post({"message": "Tell me a story"}, headers={"X-Request-ID": "req-test1"})
+        self.assertEqual(resp.getheader("Content-Type"), "text/event-stream")
+        events = _events(raw)
+        self.assertEqual(events[0][0], "meta")
+        self.assertEqual(events[0][1]["request_id"], "req-test1")
+        session_id = events[0][1]["session_id"]
+        text = "".join(d["chunk"] for e, d in events if e == "message")
+        self.assertEqual(text, "Turn 1: Tell me a story")
+        self.assertEqual(events[-1][0], "done")
+
+        # Same session keeps its history
+        _, raw = self._post({"message": "Tell me another story", "session_id": session_id})
+        text = "".join(d["chunk"] for e, d in _events(raw) if e == "message")
+        self.assertEqual(text, "Turn 2: Tell me another story")
+
+    def test_json_mode_and_shared_cache(self):
+        resp, raw = self._post({"message": "Write a poem about rain", "stream": False})
+        first = json.loads(raw)
+        self.assertEqual(resp.status, 200)
+        # A different session is served from the shared cache
+        _, raw = self._post({"message": "Write a poem about rain", "stream": False})
+        second = json.loads(raw)
+        self.assertNotEqual(first["session_id"], second["session_id"])
+        self.assertEqual(first["response"], second["response"])
+
+    def test_rejects_malformed_bodies(self):
+        for body, error in [([1, 2], "Body must be a JSON object."),
+                            ("hello", "Body must be a JSON object."),
+                            ({"message": 42}, "Field 'message' is required."),
+                            ({"message": "Hi there", "session_id": 7}, "Field 'session_id' must be a string.")]:
+            resp, raw = self._post(body)
+            self.assertEqual(resp.status, 400)
+            self.assertEqual(json.loads(raw)["error"], error)
+
+    def test_health_delete_and_eviction(self):
+        _, raw = self._post({"message": "Hello there friend", "stream": False})
+        session_id = json.loads(raw)["session_id"]
+
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+        conn.request("GET", "/health")
+        health = json.loads(conn.getresponse().read())
+        self.assertEqual(health["sessions"]["resident"], 1)
+        conn.request("DELETE", f"/sessions/{session_id}")
+        self.assertTrue(json.loads(conn.getresponse().read())["removed"])
+        conn.close()
+
+        with self.server.sessions.lease("idle-1") as session:
+            session.last_seen -= 120
+            # Leased by a request that has not taken its turn lock yet
+            self.assertEqual(self.server.sessions.evict_idle(), 0)
+        self.assertEqual(self.server.sessions.evict_idle(), 1)
+        self.assertEqual(len(self.server.sessions), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.sessions import SessionStore, SessionTable, make_bot_factory
+
+def fake_chat(model=None, messages=None, options=None, stream=False, **kwargs):
+    turns = sum(1 for m in messages if m['role'] == 'user')
+    return iter([{'message': {'content': f"Turn {turns}: "}}, {'message': {'content': messages[-1]['content']}}])
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "sessions.db")
+        self.patches = [mock.patch("vinni.core.ollama.chat", side_effect=fake_chat),
+                        mock.patch("vinni.core.SecurityLogger.log_turn")]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def turn(self, table, session_id, message):
+        with table.lease(session_id) as session, session.lock:
+            response = "".join(session.bot.chat(message))
+            table.commit(session)
+        return session, response
+
+    def journal_kinds(self, store, session_id):
+        return [r[0] for r in store._conn().execute(
+            "SELECT kind FROM journal WHERE session_id = ? ORDER BY seq", (session_id,))]
+
+    def test_evicted_session_restores_lazily(self):
+        store = SessionStore(self.path)
+        table = SessionTable(make_bot_factory("llama3.1"), idle_timeout=60, store=store)
+        session, _ = self.turn(table, "conv-1", "Tell me about durable rivers")
+        session.bot.set_tone("casual")
+        self.turn(table, "conv-1", "And durable lakes?")
+        before = [dict(m) for m in session.bot.history]
+
+        session.last_seen -= 120
+        self.assertEqual(table.evict_idle(), 1)
+        self.assertEqual(table.stats()["resident"], 0)
+
+        restored, response = self.turn(table, "conv-1", "And durable seas?")
+        self.assertIsNot(restored, session)
+        self.assertEqual(response, "Turn 3: And durable seas?")
+        self.assertEqual(restored.bot.tone, "casual")
+        self.assertEqual([dict(m) for m in restored.bot.history[:len(before)]], before)
+        self.assertEqual(table.stats()["restored"], 1)
+
+    def test_restore_then_append_with_math_context(self):
+        store = SessionStore(self.path)
+        table = SessionTable(make_bot_factory("llama3.1"), idle_timeout=60, store=store)
+        session, _ = self.turn(table, "conv-5", "Tell me about engine rivers")
+        with session.lock:
+            session.bot.history[1].context = "[ENGINE] payment=1073.64"
+            table.commit(session)
+        self.assertEqual(self.journal_kinds(store, "conv-5"), ["snapshot"])
+        session.last_seen -= 120
+        self.assertEqual(table.evict_idle(), 1)
+
+        restored, _ = self.turn(table, "conv-5", "And engine lakes?")
+        # Only the new turn is appended: restored messages (context included) count as journaled
+        self.assertEqual(self.journal_kinds(store, "conv-5"), ["snapshot", "append"])
+        self.assertEqual(restored.bot.history[1].context, "[ENGINE] payment=1073.64")
+        self.assertEqual(store.load("conv-5")["messages"][1]["context"], "[ENGINE] payment=1073.64")
+        self.assertEqual(len(store.load("conv-5")["messages"]), len(restored.bot.history))
+
+    def test_survives_restart_and_snapshots_rewrites(self):
+        store = SessionStore(self.path)
+        table = SessionTable(make_bot_factory("llama3.1"), store=store)
+        session, _ = self.turn(table, "conv-2", "Tell me about journaled rivers")
+        self.turn(table, "conv-2", "And journaled lakes?")
+        self.assertEqual(self.journal_kinds(store, "conv-2"), ["append", "append"])
+
+        # Rewriting earlier turns (as compaction does) writes a snapshot and drops older records
+        with session.lock:
+            del session.bot.history[1:3]
+            table.commit(session)
+        self.assertEqual(self.journal_kinds(store, "conv-2"), ["snapshot"])
+        expected = [dict(m) for m in session.bot.history]
+
+        restarted = SessionTable(make_bot_factory("llama3.1"), store=SessionStore(self.path))
+        restored = restarted.get_or_create("conv-2")
+        self.assertEqual([dict(m) for m in restored.bot.history], expected)
+        self.assertEqual(restarted.stats()["stored"], 1)
+
+    def test_stats_and_remove(self):
+        store = SessionStore(self.path)
+        table = SessionTable(make_bot_factory("llama3.1"), store=store)
+        self.turn(table, "conv-3", "Tell me about resident rivers")
+        stats = table.stats()
+        self.assertEqual(stats["resident"], 1)
+        self.assertGreater(stats["memory_bytes"], 0)
+        resident = table.resident()
+        self.assertEqual(resident[0]["session_id"], "conv-3")
+        self.assertEqual(resident[0]["messages"], 3)
+
+        self.assertTrue(table.remove("conv-3"))
+        self.assertIsNone(store.load("conv-3"))
+        self.assertFalse(table.remove("conv-3"))
+
+    def test_release_hook_on_remove_and_eviction(self):
+        released = []
+        table = SessionTable(make_bot_factory("llama3.1"), idle_timeout=60, max_sessions=2,
+                             on_release=lambda sid, forget: released.append((sid, forget)))
+        self.turn(table, "a", "Tell me about a")
+        table.get("a").last_seen -= 30
+        self.turn(table, "b", "Tell me about b")
+        # Full table: the least recently seen session ("a") makes room
+        self.turn(table, "c", "Tell me about c")
+        table.get("c").last_seen -= 120
+        self.assertEqual(table.evict_idle(), 1)
+        self.assertTrue(table.evict("b"))
+        table.remove("gone")
+        self.assertEqual(released, [("a", False), ("c", False), ("b", False), ("gone", True)])
+
+    def test_leased_sessions_are_not_evicted(self):
+        table = SessionTable(make_bot_factory("llama3.1"), idle_timeout=60, max_sessions=1)
+        first = table.get_or_create("leased")
+        first.last_seen -= 120
+        self.assertEqual(table.evict_idle(), 0)
+        self.assertFalse(table.evict("leased"))
+        # A full table cannot make room by dropping a leased session either
+        with table.lease("other"):
+            self.assertIs(table.get("leased"), first)
+        table.release(first)
+        self.assertTrue(table.evict("leased"))
+
+    def test_cold_restore_does_not_block_the_table(self):
+        store = SessionStore(self.path)
+        loading, resume = threading.Event(), threading.Event()
+        load = store.load
+
+        def slow_load(session_id):
+            if session_id == "cold":
+                loading.set()
+                resume.wait(5)
+            return load(session_id)
+
+        store.load = slow_load
+        table = SessionTable(make_bot_factory("llama3.1"), store=store)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(table.get_or_create("cold"))) for _ in range(2)]
+        for t in threads:
+            t.start()
+        self.assertTrue(loading.wait(5))
+        # Other sessions and stats() go ahead while "cold" is being loaded
+        self.turn(table, "warm", "Tell me about warm rivers")
+        self.assertEqual(table.stats()["resident"], 1)
+        resume.set()
+        for t in threads:
+            t.join(5)
+        # Both requests for "cold" share the one build
+        self.assertIs(results[0], results[1])
+        self.assertEqual(results[0].leases, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import sys
+import hashlib
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.cache import SingleFlight
+from vinni.core import ChatBot
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        # Keep test turns out of the real audit log (vinni.log)
+        log_turn = mock.patch("vinni.core.SecurityLogger.log_turn")
+        log_turn.start()
+        self.addCleanup(log_turn.stop)
+
+    def test_follower_replays_from_start(self):
+        flights = SingleFlight()
+        flight, leader = flights.join("k")
+        self.assertTrue(leader)
+        flight.publish("a")
+        same, leader = flights.join("k")
+        self.assertIs(same, flight)
+        self.assertFalse(leader)
+
+        received = []
+        follower = threading.Thread(target=lambda: received.extend(same.subscribe()))
+        follower.start()
+        flight.publish("b")
+        flights.finish("k", flight)
+        follower.join(5)
+        self.assertEqual("".join(received), "ab")
+        self.assertEqual(len(flights), 0)
+        self.assertEqual(flights.stats()["followers"], 1)
+
+    def test_concurrent_sessions_share_one_generation(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_chat(model=None, messages=None, options=None, stream=False, **kwargs):
+            started.set()
+            release.wait(5)
+            return iter([{'message': {'content': "Shared "}}, {'message': {'content': "answer"}}])
+
+        caches = ChatBot(model_name="llama3.1").caches
+        leader_bot = ChatBot(model_name="llama3.1", caches=caches)
+        follower_bot = ChatBot(model_name="llama3.1", caches=caches)
+        results = {}
+
+        with mock.patch("vinni.core.ollama.chat", side_effect=slow_chat) as chat:
+            leader = threading.Thread(target=lambda: results.update(leader="".join(leader_bot.chat("tell me a single flight story"))))
+            leader.start()
+            self.assertTrue(started.wait(5))
+            follower = threading.Thread(target=lambda: results.update(follower="".join(follower_bot.chat("tell me a single flight story"))))
+            follower.start()
+            # Let the follower attach before the leader streams
+            while ChatBot.in_flight.stats()["followers"] == 0:
+                time.sleep(0.01)
+            release.set()
+            leader.join(5)
+            follower.join(5)
+
+        self.assertEqual(chat.call_count, 1)
+        self.assertEqual(results["leader"], "Shared answer")
+        self.assertEqual(results["follower"], "Shared answer")
+        self.assertEqual(follower_bot.history[-1]['content'], "Shared answer")
+        self.assertEqual(len(ChatBot.in_flight), 0)
+
+    def test_abandoned_leader_releases_followers(self):
+        def fake_chat(model=None, messages=None, options=None, stream=False, **kwargs):
+            return iter([{'message': {'content': "partial "}}, {'message': {'content': "rest"}}])
+
+        bot = ChatBot(model_name="llama3.1")
+        question = "an abandoned single flight question"
+        key = f"{bot.get_last_intent(question)}:{bot._cache_key(hashlib.md5(question.encode()).hexdigest())}"
+        with mock.patch("vinni.core.ollama.chat", side_effect=fake_chat):
+            stream = bot.chat(question)
+            next(stream)
+            flight, leader = ChatBot.in_flight.join(key)
+            self.assertFalse(leader)
+            stream.close()
+        self.assertEqual(list(flight.subscribe()), ["partial "])
+        self.assertEqual(flight.error, SingleFlight.ABANDONED)
+
+    def test_follower_takes_over_abandoned_leader(self):
+        def fake_chat(model=None, messages=None, options=None, stream=False, **kwargs):
+            return iter([{'message': {'content': "partial "}}, {'message': {'content': "rest"}}])
+
+        caches = ChatBot(model_name="llama3.1").caches
+        leader_bot = ChatBot(model_name="llama3.1", caches=caches)
+        follower_bot = ChatBot(model_name="llama3.1", caches=caches)
+        question = "a single flight question left behind"
+        result = []
+        with mock.patch("vinni.core.ollama.chat", side_effect=fake_chat) as chat, \
+             mock.patch("vinni.core.SecurityLogger.log_turn"):
+            stream = leader_bot.chat(question)
+            next(stream)
+            followers = ChatBot.in_flight.stats()["followers"]
+            follower = threading.Thread(target=lambda: result.append("".join(follower_bot.chat(question))))
+            follower.start()
+            while ChatBot.in_flight.stats()["followers"] == followers:
+                time.sleep(0.01)
+            stream.close()
+            follower.join(5)
+
+        self.assertEqual(chat.call_count, 2)
+        self.assertTrue(result[0].startswith("partial \n[Interrupted"))
+        self.assertTrue(result[0].endswith("partial rest"))
+        self.assertEqual(follower_bot.history[-1]['content'], "partial rest")
+        self.assertEqual(len(ChatBot.in_flight), 0)
+
+    def test_follower_of_failed_leader_closes_turn(self):
+        flights = ChatBot.in_flight
+        bot = ChatBot(model_name="llama3.1")
+        question = "a single flight question that fails"
+        key = f"{bot.get_last_intent(question)}:{bot._cache_key(hashlib.md5(question.encode()).hexdigest())}"
+        flight, _ = flights.join(key)
+        flight.publish("\n[System Error: boom]")
+        flights.finish(key, flight, error="boom")
+        with mock.patch("vinni.core.SecurityLogger.log_turn") as log_turn:
+            # Finished flights are dropped, so attach to the failed one directly
+            turn = bot._begin_turn(question)
+            bot.history.append({'role': 'user', 'content': question})
+            reply = "".join(bot._follow_flight(question, turn, flight, key))
+        self.assertEqual(reply, "\n[System Error: boom]")
+        self.assertEqual(bot.history[-1]['role'], 'system')
+        self.assertEqual(turn["error"], "boom")
+        log_turn.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import sys
+import os
+import threading
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vinni.core import ChatBot
+from vinni.streaming import StreamBuffer, coalesce
+
+def fake_chat(model=None, messages=None, options=None, stream=False, **kwargs):
+    return iter([{'message': {'content': c}} for c in ["Once ", "upon ", "a ", "streaming ", "time."]])
+
+class TestStreaming(unittest.TestCase):
+    def test_flushes_coalesce_by_size(self):
+        buffer = StreamBuffer(flush_chars=4, flush_interval=60)
+        received = []
+        reader = threading.Thread(target=lambda: received.extend(buffer.subscribe()))
+        reader.start()
+        for chunk in ["a", "b", "c", "d", "e"]:
+            buffer.publish(chunk)
+        buffer.close()
+        reader.join(5)
+        self.assertEqual("".join(received), "abcde")
+        self.assertLessEqual(len(received), 2)  # "abcd" flush plus the "e" on close
+        self.assertEqual(buffer.text(), "abcde")
+
+    def test_late_subscribers_replay_everything(self):
+        buffer = StreamBuffer()
+        buffer.publish("x")
+        readers = [[] for _ in range(3)]
+        threads = [threading.Thread(target=lambda r=r: r.extend(buffer.subscribe())) for r in readers]
+        for t in threads:
+            t.start()
+        buffer.publish("y")
+        buffer.close(error="boom")
+        for t in threads:
+            t.join(5)
+        self.assertEqual(["".join(r) for r in readers], ["xy"] * 3)
+        self.assertEqual(buffer.error, "boom")
+        self.assertEqual(list(buffer.subscribe()), ["xy"])
+
+    def test_coalesce(self):
+        self.assertEqual(list(coalesce(["ab", "cd", "e"], min_chars=4, max_delay=60)), ["abcd", "e"])
+        self.assertEqual(list(coalesce([], min_chars=4)), [])
+
+    def test_chat_buffered_fans_out(self):
+        bot = ChatBot(model_name="llama3.1")
+        with mock.patch("vinni.core.ollama.chat", side_effect=fake_chat), \
+             mock.patch("vinni.core.SecurityLogger.log_turn"):
+            buffer = bot.chat_buffered("Tell me a buffered fan-out story")
+            client, logger = [], []
+            threads = [threading.Thread(target=lambda out=out: out.extend(buffer.subscribe())) for out in (client, logger)]
+            for t in threads:
+                t.start()
+            self.assertTrue(buffer.wait(5))
+            for t in threads:
+                t.join(5)
+        self.assertEqual("".join(client), "Once upon a streaming time.")
+        self.assertEqual("".join(logger), "".join(client))
+        self.assertIsNone(buffer.error)
+        self.assertEqual(bot.history[-1]['content'], "Once upon a streaming time.")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+import sys
+import os
+import shutil
+import tempfile
+import queue
+import threading
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.fake_ollama import FakeOllama
+from vinni.cache import DiskCache
+from vinni.workers import PooledBot, WorkerPool
+
+class TestWorkerPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ollama = FakeOllama().__enter__()
+        cls._old_host = os.environ.get("OLLAMA_HOST")
+        # Spawned workers build their ollama client from the environment
+        os.environ["OLLAMA_HOST"] = cls.ollama.host
+        cls.tmp = tempfile.mkdtemp()
+        cls.cache_path = os.path.join(cls.tmp, "cache.db")
+        # Workers open their audit log (vinni.log) in the working directory they start in
+        cls._old_cwd = os.getcwd()
+        os.chdir(cls.tmp)
+        cls.pool = WorkerPool("llama3.1", workers=2, threads_per_worker=2, cache_path=cls.cache_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+        os.chdir(cls._old_cwd)
+        cls.ollama.__exit__(None, None, None)
+        if cls._old_host is None:
+            os.environ.pop("OLLAMA_HOST", None)
+        else:
+            os.environ["OLLAMA_HOST"] = cls._old_host
+        shutil.rmtree(cls.tmp, ignore_errors=True)
+
+    def test_session_affinity(self):
+        self.assertEqual(self.pool.worker_for("abc"), self.pool.worker_for("abc"))
+        workers = {self.pool.worker_for(f"s{i}") for i in range(32)}
+        self.assertEqual(workers, {0, 1})
+
+        bot = PooledBot(self.pool)
+        bot.session_id = "affinity"
+        first = "".join(bot.chat("alpha question"))
+        second = "".join(bot.chat("beta question"))
+        self.assertEqual(first, "Turn 1: alpha question")
+        # History lives in the pinned worker, so the second turn sees the first
+        self.assertEqual(second, "Turn 2: beta question")
+        self.assertEqual(bot.last_worker, self.pool.worker_for("affinity"))
+        self.assertGreater(bot.last_turn_tokens, 0)
+
+    def test_drop_session_releases_worker_history(self):
+        bot = PooledBot(self.pool)
+        bot.session_id = "dropped"
+        "".join(bot.chat("alpha question"))
+        self.assertEqual("".join(bot.chat("beta question")), "Turn 2: beta question")
+        self.pool.drop_session("dropped", forget=False)
+        # Same worker queue, so the drop lands before the next turn
+        self.assertEqual("".join(bot.chat("gamma question")), "Turn 1: gamma question")
+
+    def test_concurrent_sessions(self):
+        results = {}
+
+        def run(sid):
+            bot = PooledBot(self.pool)
+            bot.session_id = sid
+            results[sid] = "".join(bot.chat(f"hello from {sid}"))
+
+        threads = [threading.Thread(target=run, args=(f"user-{i}",)) for i in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(30)
+        for i in range(6):
+            self.assertEqual(results[f"user-{i}"], f"Turn 1: hello from user-{i}")
+
+    def test_dead_worker_is_respawned(self):
+        bot = PooledBot(self.pool)
+        bot.session_id = "crashed"
+        "".join(bot.chat("question before the crash"))
+        index = self.pool.worker_for("crashed")
+        dead = self.pool._procs[index]
+        dead.terminate()
+        dead.join(10)
+        # The next turn lands on a fresh worker instead of hanging on the dead one's queue
+        self.assertEqual("".join(bot.chat("question after the crash")), "Turn 1: question after the crash")
+        self.assertIsNot(self.pool._procs[index], dead)
+        self.assertEqual(self.pool.alive(), 2)
+
+    def test_workers_share_cache_file(self):
+        bot = PooledBot(self.pool)
+        bot.session_id = "cache-writer"
+        "".join(bot.chat("what is a shared cache"))
+        # Any worker's fill lands in the one SQLite file every worker reads
+        self.assertGreater(DiskCache(self.cache_path).count(), 0)
+
+class _FakeProc:
+    def __init__(self):
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+
+def _fake_pool():
+    # No processes: stand in for the worker queue and the dispatcher
+    pool = WorkerPool.__new__(WorkerPool)
+    pool.size = 1
+    pool._queues = [queue.Queue()]
+    pool._procs = [_FakeProc()]
+    pool._closed = False
+    pool._pending = {}
+    pool._lock = threading.Lock()
+    return pool
+
+
+class TestWorkerPoolCancel(unittest.TestCase):
+    def test_closing_chat_cancels_worker_turn(self):
+        pool = _fake_pool()
+
+        def worker():
+            _, request_id = pool._queues[0].get()[:2]
+            pool._pending[request_id].put(("chunk", request_id, "Hello"))
+
+        threading.Thread(target=worker, daemon=True).start()
+        chunks = pool.chat("s1", "hi", request_id="req-1")
+        self.assertEqual(next(chunks), "Hello")
+        chunks.close()
+        self.assertEqual(pool._queues[0].get(timeout=1), ("cancel", "req-1"))
+        self.assertEqual(pool._pending, {})
+
+    def test_worker_exit_fails_turn(self):
+        pool = _fake_pool()
+        pool.LIVENESS_INTERVAL = 0.01
+        respawned = []
+        pool._spawn = respawned.append
+
+        def worker():
+            _, request_id = pool._queues[0].get()[:2]
+            pool._pending[request_id].put(("chunk", request_id, "Hel"))
+            pool._procs[0].alive = False  # Killed mid-turn: no "done" will ever come
+
+        threading.Thread(target=worker, daemon=True).start()
+        chunks = list(pool.chat("s1", "hi", request_id="req-1"))
+        self.assertEqual(chunks, ["Hel", "\n[System Error: worker exited]"])
+        self.assertEqual(respawned, [0])
+        self.assertEqual(pool._pending, {})
+
+    def test_busy_reaches_pooled_bot(self):
+        pool = _fake_pool()
+        busy = {"reason": "session", "retry_after": 2.0}
+        seen = []
+
+        def worker():
+            _, request_id = pool._queues[0].get()[:2]
+            inbox = pool._pending[request_id]
+            inbox.put(("busy", request_id, busy))
+            inbox.put(("chunk", request_id, "Slow down."))
+            inbox.put(("done", request_id, {"tokens": 0, "worker": 0, "busy": busy}))
+
+        threading.Thread(target=worker, daemon=True).start()
+        bot = PooledBot(pool)
+        bot.session_id = "s1"
+        for _ in bot.chat("hi"):
+            # The server checks last_busy right after the first chunk
+            seen.append(bot.last_busy)
+        self.assertEqual(seen, [busy])
+        self.assertEqual(bot.last_busy, busy)
+
+if __name__ == '__main__':
+    unittest.main()
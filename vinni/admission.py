@@ -0,0 +1,103 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from vinni.cache import LRUCache
+
+class TokenBucket:
+    """
+    Refills at `rate` tokens/second up to `capacity`. Not thread-safe on its own;
+    AdmissionController serializes access.
+    """
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float = None):
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, cost: float) -> float:
+        """Seconds until `cost` tokens are available (0 if they are now)."""
+        if self.tokens >= cost:
+            return 0.0
+        if self.rate <= 0:
+            return float("inf")
+        return (cost - self.tokens) / self.rate
+
+    def charge(self, cost: float):
+        # May go negative: a generation that ran long is paid back before the next admit
+        self.tokens -= cost
+
+
+class AdmissionController:
+    """
+    Per-session and global token buckets, measured in estimated model tokens (v0.10.0).
+    A turn is admitted only if both buckets can pay its estimated cost (prompt plus
+    expected output); otherwise the caller sheds it with a busy reply. Once the real
+    output length is known, `settle` charges or refunds the difference.
+    Costs are capped at a bucket's capacity so one oversized prompt is still admissible.
+    """
+    def __init__(self, session_rate: float = 50.0, session_burst: float = 2000.0,
+                 global_rate: float = 400.0, global_burst: float = 8000.0,
+                 expected_output: float = 150.0, max_tracked_sessions: int = 10000):
+        self.session_rate = session_rate
+        self.session_burst = session_burst
+        self.expected_output = expected_output
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        # Buckets of long-gone sessions fall out by LRU; a returning session starts full
+        self._sessions = LRUCache(max_entries=max_tracked_sessions)
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.shed = {"session": 0, "global": 0}
+
+    def _session_bucket(self, session_id: str) -> TokenBucket:
+        bucket = self._sessions.get(session_id)
+        if bucket is None:
+            bucket = TokenBucket(self.session_rate, self.session_burst)
+            self._sessions.put(session_id, bucket)
+        return bucket
+
+    def admit(self, session_id: str, cost: float) -> Tuple[bool, Optional[Dict]]:
+        """
+        Returns (True, None) and charges both buckets, or (False, busy) where busy is
+        {"reason": "session" | "global", "retry_after": seconds}.
+        """
+        now = time.monotonic()
+        with self._lock:
+            session_bucket = self._session_bucket(session_id)
+            session_bucket.refill(now)
+            self.global_bucket.refill(now)
+
+            for reason, bucket in (("session", session_bucket), ("global", self.global_bucket)):
+                wait = bucket.wait_time(min(cost, bucket.capacity))
+                if wait > 0:
+                    self.shed[reason] += 1
+                    return False, {"reason": reason, "retry_after": round(wait, 2)}
+
+            session_bucket.charge(cost)
+            self.global_bucket.charge(cost)
+            self.admitted += 1
+            return True, None
+
+    def settle(self, session_id: str, delta: float):
+        """Charges (delta > 0) or refunds (delta < 0) the difference between real and estimated cost."""
+        with self._lock:
+            bucket = self._sessions.get(session_id)
+            if bucket is not None:
+                bucket.charge(delta)
+            self.global_bucket.charge(delta)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self.global_bucket.refill()
+            return {
+                "admitted": self.admitted,
+                "shed": dict(self.shed),
+                "global_tokens": round(self.global_bucket.tokens, 1),
+                "tracked_sessions": len(self._sessions)
+            }
@@ -0,0 +1,211 @@
+import asyncio
+import time
+import ollama
+from typing import AsyncGenerator, Dict
+from vinni.cancellation import CancelToken, TurnCancelled
+from vinni.client import make_async_client
+from vinni.core import ChatBot
+from vinni.history import Message
+
+class AsyncChatBot(ChatBot):
+    """
+    Asyncio variant of the ChatBot pipeline (v0.10.0).
+    Same stages as ChatBot.chat (static intercepts, cache tiers, math engine,
+    verifier, snapshot, logging), but every Ollama call goes through
+    ollama.AsyncClient so one event loop can multiplex many sessions.
+    One instance holds one session's history; create one per conversation.
+    Pass one `async_client` (vinni.client.make_async_client) to share a
+    connection pool across sessions; by default each bot builds its own.
+    `turn_timeout` and `cancel` tokens are honored. The scheduler and admission
+    controller block threads, so they are sync-only and rejected here; turns
+    are not coalesced by single-flight either.
+    """
+    def __init__(self, *args, host: str = None, async_client: ollama.AsyncClient = None, **kwargs):
+        for control in ("scheduler", "admission"):
+            if kwargs.get(control) is not None:
+                raise ValueError(f"AsyncChatBot does not support `{control}` (sync ChatBot only).")
+        super().__init__(*args, **kwargs)
+        self.async_client = async_client or make_async_client(host=host)
+
+    async def _aguarded(self, fn, *args, **kwargs):
+        """Runs a non-streaming AsyncClient call through the circuit breaker, if one is set."""
+        if self.breaker is None:
+            return await fn(*args, **kwargs)
+        return await self.breaker.acall(fn, *args, **kwargs)
+
+    async def _aextract_math_params(self, user_input: str, extraction_key: str) -> Dict:
+        cached = self._cached_extraction(extraction_key)
+        if cached is not None:
+            return cached
+
+        try:
+            resp = await self._aguarded(
+                self.async_client.chat,
+                model=self.model_name,
+                messages=self._extraction_messages(user_input),
+                options={"temperature": 0.0},
+                **self._keep_alive()
+            )
+        except Exception as e:
+            print(f"[DEBUG] Extraction Failed: {e}")
+            return {}
+        return self._parse_extraction(resp['message']['content'], extraction_key)
+
+    async def _aprocess_math_request(self, user_input: str, intent: str, followup_params: Dict = None):
+        if followup_params:
+            return self._followup_math_result(followup_params)
+
+        extraction_key = self._math_extraction_key(user_input)
+        if extraction_key is None:
+            return None
+
+        data = await self._aextract_math_params(user_input, extraction_key)
+        return self._route_math_request(user_input, data, extraction_key)
+
+    async def _alookup_cached(self, user_input: str, turn: Dict):
+        if turn["followup_params"] is not None:
+            return None, None
+
+        if self.cache_backend:
+            # Backend tiers do blocking I/O (SQLite / sockets)
+            cached_response, cache_source = await asyncio.to_thread(self._cache_get, turn["intent"], turn["cache_key"])
+        else:
+            cached_response, cache_source = self._cache_get(turn["intent"], turn["cache_key"])
+
+        if cached_response is None and self.semantic_cache:
+            try:
+                resp = await self._aguarded(self.async_client.embed, model=self.embedding_model, input=user_input)
+                turn["query_vector"] = resp['embeddings'][0]
+            except Exception as e:
+                print(f"[DEBUG] Embedding Failed: {e}")
+                return None, None
+
+            matched_key = self.semantic_cache.lookup(self._semantic_segment(turn["intent"]), turn["query_vector"], user_input)
+            if matched_key:
+                cached_response, source = await asyncio.to_thread(self._cache_get, turn["intent"], matched_key)
+                if cached_response is not None:
+                    cache_source = f"semantic.{source}"
+        return cached_response, cache_source
+
+    async def _anext_chunk(self, chunks, cancel: CancelToken):
+        """Next stream chunk, or TurnCancelled once the turn's deadline passes while waiting for it."""
+        try:
+            return await asyncio.wait_for(chunks.__anext__(), timeout=cancel.remaining())
+        except asyncio.TimeoutError:
+            cancel.cancel("deadline")
+            raise TurnCancelled(cancel.reason)
+
+    async def chat(self, user_input: str, request_id: str = None, cancel: CancelToken = None) -> AsyncGenerator[str, None]:
+        """
+        Sends a message to the Ollama model and yields chunks of the response (async).
+        `cancel` stops the turn cooperatively (defaults to a token with `turn_timeout`).
+        """
+        self._apply_compaction()
+        turn = self._begin_turn(user_input, request_id, cancel)
+        cancel = turn["cancel"]
+
+        self.history.append(Message('user', user_input))
+
+        # 2. Static Response Intercepts
+        static_response = self._static_response(user_input)
+        if static_response:
+            self.history.append(Message('assistant', static_response))
+            yield static_response
+            await asyncio.to_thread(self._log_turn, user_input, turn, static_response,
+                                    {"name": "static", "quant": "N/A"}, static_response=True)
+            return
+
+        # 3. Cache Check
+        cached_response, cache_source = await self._alookup_cached(user_input, turn)
+        if cached_response is not None:
+            self.history.append(Message('assistant', cached_response))
+            yield cached_response
+            await asyncio.to_thread(self._log_turn, user_input, turn, cached_response,
+                                    {"name": "cache", "source": cache_source}, cache_hit=True)
+            return
+
+        parts = []  # Joined once, not re-concatenated per token
+        full_response = ""
+        stream = None
+
+        try:
+            # 3.5 Math Engine Intercept
+            cancel.check()
+            math_result_pkg = await self._aprocess_math_request(user_input, turn["intent"], followup_params=turn["followup_params"])
+            engine_data, assumptions = self._inject_math_context(math_result_pkg)
+            turn["engine"] = engine_data is not None
+
+            # Degraded mode while the breaker is open (no model call); it logs, so off the loop
+            if self.breaker and not self.breaker.allow():
+                for chunk in await asyncio.to_thread(list, self._degraded_reply(user_input, turn, engine_data, assumptions)):
+                    yield chunk
+                return
+
+            cancel.check()
+            started = time.time()
+            first_token = False
+            try:
+                stream = await self.async_client.chat(
+                    model=self.model_name,
+                    messages=self._history_messages(turn),
+                    options=self.options,
+                    stream=True,
+                    **self._keep_alive()
+                )
+
+                while True:
+                    try:
+                        chunk = await self._anext_chunk(stream, cancel)
+                    except StopAsyncIteration:
+                        break
+                    if not first_token and self.breaker:
+                        # First-token latency is the breaker's health signal for streams
+                        self.breaker.record_success((time.time() - started) * 1000)
+                    first_token = True
+                    content = chunk['message']['content']
+                    parts.append(content)
+                    yield content
+                    cancel.check()
+            except TurnCancelled:
+                raise
+            except Exception:
+                if self.breaker:
+                    self.breaker.record_failure()
+                raise
+            if not first_token and self.breaker:
+                self.breaker.record_success((time.time() - started) * 1000)
+
+            full_response = "".join(parts)
+            self.history.append(Message('assistant', full_response))
+
+            # MathVerifier (Post-Generation Check)
+            cancel.check()
+            if self._needs_verification(user_input):
+                 warning = self._verification_warning(await self.verifier.averify(user_input, full_response, self.async_client))
+                 if warning:
+                      yield warning
+                      full_response += warning
+                      self.history[-1]['content'] = full_response
+
+            # Snapshot, cache fill and the audit log touch disk / network
+            cancel.check()
+            await asyncio.to_thread(self._finish_generation, user_input, full_response, turn, engine_data, assumptions)
+            await asyncio.to_thread(self._log_turn, user_input, turn, full_response,
+                                    {"name": self.model_name, "options": self.options, "context": turn["history"]})
+            turn["completed"] = True
+            self._maybe_compact()
+
+        except TurnCancelled as e:
+            await asyncio.to_thread(self._cancel_turn, user_input, turn, full_response or "".join(parts), e.reason)
+            yield f"\n[Cancelled: {e.reason}]"
+        except GeneratorExit:
+            # Consumer closed us (aclose / client disconnect): no verifier, snapshot or cache fill
+            self._cancel_turn(user_input, turn, full_response or "".join(parts), "closed")
+            raise
+        except Exception as e:
+            turn["error"] = str(e)
+            yield f"\n[System Error: {str(e)}]"
+        finally:
+            if hasattr(stream, "aclose"):
+                # Closes the HTTP response, also when the turn was cancelled mid-stream
+                await stream.aclose()
@@ -0,0 +1,218 @@
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Optional, TextIO
+from vinni.sessions import make_bot_factory
+
+# Field names accepted for the query text, in order of preference
+MESSAGE_FIELDS = ("message", "query", "input", "text", "body")
+
+
+def read_records(lines: Iterable[str]) -> Iterator[Dict]:
+    """
+    Parses JSONL lazily. A line may be an object with one of MESSAGE_FIELDS (plus
+    optional "id"/"request_id" and "session_id") or a bare JSON string.
+    Unparseable lines are yielded as {"line": n, "error": ...} so they show up in the output.
+    """
+    for n, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield {"line": n, "error": f"Invalid JSON: {e}"}
+            continue
+
+        if isinstance(data, str):
+            data = {"message": data}
+        if not isinstance(data, dict):
+            yield {"line": n, "error": "Record must be an object or a string"}
+            continue
+
+        message = next((data[f] for f in MESSAGE_FIELDS if isinstance(data.get(f), str) and data[f].strip()), None)
+        if message is None:
+            yield {"line": n, "id": data.get("id") or data.get("request_id"), "error": f"No query field (expected one of {', '.join(MESSAGE_FIELDS)})"}
+            continue
+        yield {
+            "line": n,
+            "id": data.get("id") or data.get("request_id") or f"line-{n}",
+            "session_id": data.get("session_id"),
+            "message": message.strip()
+        }
+
+
+class BatchRunner:
+    """
+    Headless batch mode (v0.10.0).
+    Streams records through the full ChatBot pipeline with at most `concurrency`
+    turns in flight and writes one JSONL result per record as soon as it finishes
+    (completion order, not input order). Records that share a session_id run in
+    input order on one bot, so multi-turn conversations keep their history;
+    every other record gets a fresh session. All bots share caches via the factory.
+    A session's later records queue behind its running one instead of holding a
+    worker thread; once they are done its bot is kept for the session's next
+    record, for up to `max_sessions` idle sessions (least recently used dropped first).
+    """
+    def __init__(self, bot_factory: Callable[[], object], concurrency: int = 4, max_sessions: int = 1000):
+        self.bot_factory = bot_factory
+        self.concurrency = max(1, concurrency)
+        self.max_sessions = max_sessions
+        self._write_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._chains: Dict[str, deque] = {}  # session_id -> records waiting behind its running one
+        self._sessions: "OrderedDict[str, object]" = OrderedDict()  # Idle bots, least recently used first
+        self.stats = {"records": 0, "errors": 0, "cache_hits": 0, "latencies": []}
+
+    def _run_one(self, record: Dict, bot) -> Dict:
+        if "error" in record:
+            return {"id": record.get("id"), "line": record["line"], "error": record["error"]}
+
+        started = time.time()
+        try:
+            response = "".join(bot.chat(record["message"], request_id=str(record["id"])))
+        except Exception as e:
+            return {"id": record["id"], "line": record["line"], "error": str(e)}
+        result = {
+            "id": record["id"],
+            "line": record["line"],
+            "session_id": bot.session_id,
+            "input": record["message"],
+            "response": response,
+            "latency_ms": round((time.time() - started) * 1000, 2)
+        }
+
+        turn = getattr(bot, "last_turn", None)
+        if turn is None:
+            # Generation failed before the turn was logged; the reply carries the error text
+            result["error"] = response.strip()
+            return result
+        flags = turn["flags"]
+        result.update({
+            "intent": turn["intent"],
+            "input_tokens": turn["input_tokens"],
+            "output_tokens": turn["output_tokens"],
+            "cache_hit": flags["cache_hit"],
+            "cache_source": turn["model"].get("source") if flags["cache_hit"] else None,
+            "static": flags["static_response"],
+            "engine": turn["engine"],
+            "shed": flags["shed"],
+            "degraded": flags["degraded"],
+            "cancelled": flags["cancelled"]
+        })
+        return result
+
+    def _write(self, out: TextIO, result: Dict):
+        with self._write_lock:
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+            self.stats["records"] += 1
+            if result.get("error"):
+                self.stats["errors"] += 1
+            if result.get("cache_hit"):
+                self.stats["cache_hits"] += 1
+            if "latency_ms" in result:
+                self.stats["latencies"].append(result["latency_ms"])
+
+    def _process(self, record: Dict, bot, out: TextIO, slots: threading.BoundedSemaphore):
+        try:
+            try:
+                result = self._run_one(record, bot)
+            except Exception as e:
+                # Every record gets an output line, even when the pipeline itself breaks
+                result = {"id": record.get("id"), "line": record.get("line"), "error": f"{type(e).__name__}: {e}"}
+            self._write(out, result)
+        finally:
+            slots.release()
+
+    def _run_session(self, session_id: str, record: Dict, bot, out: TextIO, slots: threading.BoundedSemaphore):
+        # Runs the session's records in input order, including those queued while it ran
+        while record is not None:
+            self._process(record, bot, out, slots)
+            with self._lock:
+                chain = self._chains[session_id]
+                if chain:
+                    record = chain.popleft()
+                    continue
+                del self._chains[session_id]
+                self._sessions[session_id] = bot
+                if len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+                record = None
+
+    def run(self, records: Iterable[Dict], out: TextIO) -> Dict:
+        # Bounded submission: at most 2x concurrency records are read ahead of the workers
+        slots = threading.BoundedSemaphore(self.concurrency * 2)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for record in records:
+                slots.acquire()
+                session_id = record.get("session_id")
+                if not session_id:
+                    executor.submit(self._process, record, self.bot_factory(), out, slots)
+                    continue
+                with self._lock:
+                    chain = self._chains.get(session_id)
+                    if chain is not None:
+                        # Same conversation already running: it picks this record up when its turn ends
+                        chain.append(record)
+                        continue
+                    self._chains[session_id] = deque()
+                    bot = self._sessions.pop(session_id, None)
+                if bot is None:
+                    bot = self.bot_factory()
+                    bot.session_id = session_id
+                executor.submit(self._run_session, session_id, record, bot, out, slots)
+        return self.summary()
+
+    def summary(self) -> Dict:
+        latencies = sorted(self.stats["latencies"])
+
+        def pct(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+        return {
+            "records": self.stats["records"],
+            "errors": self.stats["errors"],
+            "cache_hits": self.stats["cache_hits"],
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95)
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a JSONL file of queries through ViNNi")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="Results JSONL file, or - for stdout")
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument("--max-sessions", type=int, default=1000,
+                        help="Idle conversations (session_id) kept for their next record")
+    parser.add_argument("--model", default="llama3.1")
+    parser.add_argument("--prompt", default="prompts/system_v0.2.7.md")
+    parser.add_argument("--cache-path", default="vinni_cache.db")
+    args = parser.parse_args()
+
+    from vinni.breaker import CircuitBreaker
+    from vinni.client import make_client
+    factory = make_bot_factory(args.model, system_prompt_path=args.prompt, cache_path=args.cache_path,
+                               breaker=CircuitBreaker(), client=make_client(max_connections=args.concurrency * 2 + 4))
+
+    src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        summary = BatchRunner(factory, concurrency=args.concurrency, max_sessions=args.max_sessions).run(read_records(src), out)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+    print(json.dumps(summary), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
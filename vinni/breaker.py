@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Ollama while the breaker is open."""
+    def __init__(self, retry_after: float):
+        super().__init__(f"Model backend unavailable (circuit open, retry in {retry_after:.1f}s)")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for Ollama calls (v0.10.0).
+    Tracks the outcome of the last `window` calls; a call fails if it raises or if
+    its first token (or whole reply, for non-streaming calls) takes longer than
+    `slow_call_ms`. Once at least `min_calls` are recorded and the failure rate
+    reaches `failure_rate`, the breaker opens and callers fail fast for
+    `open_seconds`. Then it goes half-open: `half_open_probes` real calls are let
+    through, and one success closes it while one failure re-opens it.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, window: int = 20, failure_rate: float = 0.5, min_calls: int = 5,
+                 slow_call_ms: float = 15000.0, open_seconds: float = 30.0, half_open_probes: int = 1):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.slow_call_ms = slow_call_ms
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._outcomes = deque(maxlen=window)  # True = failure
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_started_at = 0.0
+        self.opened_count = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return self._state
+
+    def _maybe_half_open(self, now: float):
+        if self._state == self.OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+
+    def _open(self, now: float):
+        self._state = self.OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self.opened_count += 1
+
+    def retry_after(self) -> float:
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        """True if a call may go to Ollama now. In half-open state this claims a probe."""
+        now = time.monotonic()
+        with self._lock:
+            self._maybe_half_open(now)
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN:
+                # A probe that never reported back (e.g. cancelled) frees its place after open_seconds
+                if self._probes >= self.half_open_probes and now - self._probe_started_at >= self.open_seconds:
+                    self._probes = 0
+                if self._probes < self.half_open_probes:
+                    self._probes += 1
+                    self._probe_started_at = now
+                    return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, latency_ms: float = None):
+        if latency_ms is not None and latency_ms > self.slow_call_ms:
+            self.record_failure()
+            return
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._state = self.CLOSED
+                self._outcomes.clear()
+            self._outcomes.append(False)
+
+    def record_failure(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open(now)
+                return
+            self._outcomes.append(True)
+            if self._state == self.CLOSED and len(self._outcomes) >= self.min_calls:
+                if sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+                    self._open(now)
+
+    def call(self, fn: Callable, *args, **kwargs) -> Any:
+        """Runs a non-streaming Ollama call through the breaker."""
+        if not self.allow():
+            raise CircuitOpenError(self.retry_after())
+        started = time.time()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success((time.time() - started) * 1000)
+        return result
+
+    async def acall(self, fn: Callable, *args, **kwargs) -> Any:
+        """call() for coroutine functions (ollama.AsyncClient)."""
+        if not self.allow():
+            raise CircuitOpenError(self.retry_after())
+        started = time.time()
+        try:
+            result = await fn(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success((time.time() - started) * 1000)
+        return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return {
+                "state": self._state,
+                "recent_calls": len(self._outcomes),
+                "recent_failures": sum(self._outcomes),
+                "opened": self.opened_count,
+                "rejected": self.rejected
+            }
@@ -0,0 +1,616 @@
+import os
+import queue
+import re
+import socket
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from vinni.streaming import StreamBuffer
+
+try:
+    import numpy as np
+except ImportError:  # Semantic tier is optional
+    np = None
+
+
+class _Compressed:
+    """Stored form of a compressed text entry (v0.10.0)."""
+    __slots__ = ("data", "raw_size", "zdict")
+
+    def __init__(self, data: bytes, raw_size: int, zdict: Optional[bytes]):
+        self.data = data
+        self.raw_size = raw_size
+        self.zdict = zdict  # Shared reference, not a copy
+
+
+class LRUCache:
+    """
+    Least-recently-used cache with entry and byte budgets (v0.10.0).
+    OrderedDict gives O(1) recency updates; a hit moves the entry to the end,
+    eviction pops from the front until both budgets are satisfied.
+
+    With compress_threshold set, text entries at or above that many bytes are
+    stored zlib-compressed and transparently decompressed on hit. Once enough
+    responses have been seen, a shared zlib dictionary is built from them so
+    recurring boilerplate (headers, disclaimers, markdown) compresses well
+    even in short entries.
+    """
+    ZDICT_SIZE = 32 * 1024  # zlib uses at most a 32 KB window
+
+    def __init__(self, max_entries: int = 100, max_bytes: int = None, compress_threshold: int = None, compress_level: int = 6):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, Tuple[int, int]] = {}  # key -> (stored bytes, raw bytes)
+        self._lock = threading.Lock()
+        self._zdict: Optional[bytes] = None
+        self._samples = []
+        self._sample_bytes = 0
+        self.bytes_used = 0
+        self.raw_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.compressed_entries = 0
+
+    @staticmethod
+    def _sizeof(key: str, value: Any) -> int:
+        if isinstance(value, _Compressed):
+            size = len(value.data)
+        elif isinstance(value, (bytes, bytearray)):
+            size = len(value)
+        else:
+            size = len(str(value).encode("utf-8"))
+        return size + len(key)
+
+    def _sample(self, raw: bytes):
+        # Collect past responses until there is enough text for a shared dictionary
+        if self._zdict is not None:
+            return
+        self._samples.append(raw)
+        self._sample_bytes += len(raw)
+        if self._sample_bytes >= self.ZDICT_SIZE:
+            self._zdict = b"".join(self._samples)[-self.ZDICT_SIZE:]
+            self._samples = []
+
+    def _compress(self, value: Any) -> Any:
+        if self.compress_threshold is None or not isinstance(value, str):
+            return value
+        raw = value.encode("utf-8")
+        if len(raw) < self.compress_threshold:
+            return value
+
+        zdict = self._zdict
+        compressor = zlib.compressobj(self.compress_level, zdict=zdict) if zdict else zlib.compressobj(self.compress_level)
+        data = compressor.compress(raw) + compressor.flush()
+        with self._lock:
+            self._sample(raw)
+        if len(data) >= len(raw):
+            return value
+        return _Compressed(data, len(raw), zdict)
+
+    @staticmethod
+    def _decompress(value: Any) -> Any:
+        if not isinstance(value, _Compressed):
+            return value
+        decompressor = zlib.decompressobj(zdict=value.zdict) if value.zdict else zlib.decompressobj()
+        return (decompressor.decompress(value.data) + decompressor.flush()).decode("utf-8")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            value = self._data[key]
+        return self._decompress(value)
+
+    def _drop(self, key: str) -> Any:
+        stored, raw = self._sizes.pop(key)
+        self.bytes_used -= stored
+        self.raw_bytes -= raw
+        value = self._data.pop(key)
+        if isinstance(value, _Compressed):
+            self.compressed_entries -= 1
+        return value
+
+    def put(self, key: str, value: Any):
+        raw_size = self._sizeof(key, value)
+        value = self._compress(value)
+        size = self._sizeof(key, value)
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+
+            # Entries bigger than the whole budget are never admitted
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+
+            self._data[key] = value
+            self._sizes[key] = (size, raw_size)
+            self.bytes_used += size
+            self.raw_bytes += raw_size
+            if isinstance(value, _Compressed):
+                self.compressed_entries += 1
+
+            while self._data and (
+                len(self._data) > self.max_entries
+                or (self.max_bytes is not None and self.bytes_used > self.max_bytes)
+            ):
+                self._drop(next(iter(self._data)))
+                self.evictions += 1
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            value = self._drop(key)
+        return self._decompress(value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.bytes_used = 0
+            self.raw_bytes = 0
+            self.compressed_entries = 0
+
+    def __contains__(self, key: str) -> bool:
+        # Membership does not count as a hit or refresh recency
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def keys(self):
+        return list(self._data.keys())
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "bytes_used": self.bytes_used,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "compressed_entries": self.compressed_entries,
+            "compression_ratio": round(self.raw_bytes / self.bytes_used, 2) if self.bytes_used else 1.0,
+            "shared_dictionary": self._zdict is not None
+        }
+
+
+class SemanticCache:
+    """
+    Optional semantic tier (v0.10.0): maps query embeddings to exact cache keys.
+    Each segment keeps its unit-normalized vectors in one contiguous NumPy matrix,
+    so lookup is a single matrix-vector product followed by argmax (cosine top-1).
+    Rows are overwritten ring-style once max_entries is reached.
+    """
+    NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)*")
+
+    def __init__(self, threshold: float = 0.92, max_entries: int = 1000):
+        if np is None:
+            raise ImportError("SemanticCache requires numpy (pip install numpy).")
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._segments: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def fingerprint(cls, text: str) -> Tuple[str, ...]:
+        # Paraphrases must agree on every number ("5%" vs "6%" is not a paraphrase)
+        return tuple(cls.NUMBER_PATTERN.findall(text))
+
+    def _segment(self, segment: str, dim: int) -> Dict[str, Any]:
+        seg = self._segments.get(segment)
+        if seg is None or seg["matrix"].shape[1] != dim:
+            seg = {
+                "matrix": np.zeros((self.max_entries, dim), dtype=np.float32),
+                "keys": [None] * self.max_entries,
+                "fingerprints": [None] * self.max_entries,
+                "size": 0,
+                "next": 0
+            }
+            self._segments[segment] = seg
+        return seg
+
+    @staticmethod
+    def _normalize(vector) -> "np.ndarray":
+        v = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(v)
+        return v / norm if norm > 0 else v
+
+    def lookup(self, segment: str, vector, text: str) -> Optional[str]:
+        """Returns the cache key of the closest stored query above threshold, else None."""
+        v = self._normalize(vector)
+        with self._lock:
+            seg = self._segments.get(segment)
+            if seg is None or seg["size"] == 0 or seg["matrix"].shape[1] != v.shape[0]:
+                self.misses += 1
+                return None
+
+            scores = seg["matrix"][:seg["size"]] @ v
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold and seg["fingerprints"][best] == self.fingerprint(text):
+                self.hits += 1
+                return seg["keys"][best]
+
+            self.misses += 1
+            return None
+
+    def add(self, segment: str, vector, text: str, cache_key: str):
+        v = self._normalize(vector)
+        with self._lock:
+            seg = self._segment(segment, v.shape[0])
+            row = seg["next"]
+            seg["matrix"][row] = v
+            seg["keys"][row] = cache_key
+            seg["fingerprints"][row] = self.fingerprint(text)
+            seg["next"] = (row + 1) % self.max_entries
+            seg["size"] = min(seg["size"] + 1, self.max_entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "segments": {name: seg["size"] for name, seg in self._segments.items()},
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+class CacheBackend:
+    """
+    Interface for shared response cache tiers behind ChatBot's memory segments (v0.10.0).
+    Implementations store text values by (segment, key) and must be safe to call
+    from several threads.
+    """
+    name = "backend"
+
+    def get(self, segment: str, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, segment: str, key: str, value: str):
+        raise NotImplementedError
+
+    def get_many(self, segment: str, keys: List[str]) -> Dict[str, str]:
+        """Returns only the keys that were found."""
+        found = {}
+        for key in keys:
+            value = self.get(segment, key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set_many(self, segment: str, items: Dict[str, str]):
+        for key, value in items.items():
+            self.set(segment, key, value)
+
+    def close(self):
+        pass
+
+
+class DiskCache(CacheBackend):
+    """
+    Persistent response cache tier (v0.10.0).
+    Backed by SQLite in WAL mode so cached answers survive restarts and can be
+    shared by several ViNNi processes on the same host.
+    Keys are the composite cache keys built by ChatBot, stored per intent segment.
+    """
+    name = "disk"
+    PRUNE_EVERY = 100
+
+    def __init__(self, path: str = "vinni_cache.db", max_entries: int = 10000, timeout: float = 5.0, mmap_size: int = 0):
+        self.path = path
+        self.max_entries = max_entries  # Per segment
+        self.timeout = timeout
+        # >0: reads go through a shared memory map of the database file, so processes
+        # on one host serve hits from the same OS page cache pages instead of copying via read()
+        self.mmap_size = mmap_size
+        self._local = threading.local()
+        self._writes = 0  # Since the last prune; one backend is shared by every server thread
+        self._writes_lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "segment TEXT NOT NULL, "
+            "key TEXT NOT NULL, "
+            "value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "PRIMARY KEY (segment, key)) WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_age ON responses (segment, created_at)")
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads; keep one per thread.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")       # Readers never block the writer
+            conn.execute("PRAGMA synchronous=NORMAL")     # Safe with WAL, avoids fsync per insert
+            conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+            if self.mmap_size:
+                conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            self._local.conn = conn
+        return conn
+
+    def get(self, segment: str, key: str) -> Optional[str]:
+        row = self._conn().execute(
+            "SELECT value FROM responses WHERE segment = ? AND key = ?", (segment, key)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, segment: str, key: str, value: str):
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (segment, key, value, created_at) VALUES (?, ?, ?, ?)",
+            (segment, key, value, time.time())
+        )
+        conn.commit()
+        self._count_writes(1)
+
+    def set_many(self, segment: str, items: Dict[str, str]):
+        # One transaction instead of a commit per entry
+        conn = self._conn()
+        now = time.time()
+        conn.executemany(
+            "INSERT OR REPLACE INTO responses (segment, key, value, created_at) VALUES (?, ?, ?, ?)",
+            [(segment, k, v, now) for k, v in items.items()]
+        )
+        conn.commit()
+        self._count_writes(len(items))
+
+    def _count_writes(self, n: int):
+        with self._writes_lock:
+            self._writes += n
+            due = self._writes >= self.PRUNE_EVERY
+            if due:
+                self._writes = 0
+        if due:
+            self.prune()
+
+    def prune(self, segment: str = None):
+        """Drops the oldest entries beyond max_entries, in `segment` or in every segment over budget."""
+        conn = self._conn()
+        if segment is None:
+            segments = [row[0] for row in conn.execute(
+                "SELECT segment FROM responses GROUP BY segment HAVING COUNT(*) > ?", (self.max_entries,)
+            )]
+        else:
+            segments = [segment]
+        for seg in segments:
+            conn.execute(
+                "DELETE FROM responses WHERE segment = ? AND key NOT IN ("
+                "SELECT key FROM responses WHERE segment = ? ORDER BY created_at DESC LIMIT ?)",
+                (seg, seg, self.max_entries)
+            )
+        conn.commit()
+
+    def count(self, segment: str = None) -> int:
+        if segment:
+            row = self._conn().execute("SELECT COUNT(*) FROM responses WHERE segment = ?", (segment,)).fetchone()
+        else:
+            row = self._conn().execute("SELECT COUNT(*) FROM responses").fetchone()
+        return row[0]
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class RespError(Exception):
+    """Error reply (-ERR ...) from a RESP server."""
+
+
+class RedisCache(CacheBackend):
+    """
+    Remote cache tier speaking RESP, the Redis wire protocol (v0.10.0).
+    Lets a fleet of ViNNi processes share one cache server. Sockets are pooled
+    and reused; get_many/set_many pipeline their commands in one round trip.
+    Entries expire after `ttl` seconds (SET ... EX).
+    After a failed connect, calls fail fast for `backoff` seconds (doubling up to
+    `max_backoff` while the server stays down) instead of paying a connect timeout every turn.
+    """
+    name = "redis"
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 6379, ttl: int = 86400,
+                 namespace: str = "vinni", pool_size: int = 8, timeout: float = 2.0,
+                 backoff: float = 1.0, max_backoff: float = 30.0):
+        self.host = host
+        self.port = port
+        self.ttl = ttl
+        self.namespace = namespace
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._pool: "queue.LifoQueue" = queue.LifoQueue(maxsize=pool_size)
+        self._down_lock = threading.Lock()
+        self._down_until = 0.0
+        self._next_backoff = backoff
+
+    # --- Connection Pool ---
+    def _connect(self):
+        with self._down_lock:
+            wait = self._down_until - time.monotonic()
+        if wait > 0:
+            raise ConnectionError(f"RESP server unavailable (retry in {wait:.1f}s).")
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        except OSError:
+            with self._down_lock:
+                self._down_until = time.monotonic() + self._next_backoff
+                self._next_backoff = min(self._next_backoff * 2, self.max_backoff)
+            raise
+        with self._down_lock:
+            self._next_backoff = self.backoff
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock, sock.makefile("rb")
+
+    def _acquire(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _release(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            self._discard(conn)
+
+    @staticmethod
+    def _discard(conn):
+        sock, rfile = conn
+        try:
+            rfile.close()
+            sock.close()
+        except OSError:
+            pass
+
+    # --- Protocol ---
+    @staticmethod
+    def _encode(*args) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    @classmethod
+    def _read_reply(cls, rfile):
+        line = rfile.readline()
+        if not line:
+            raise ConnectionError("RESP server closed the connection.")
+        prefix, body = line[:1], line[1:-2]
+        if prefix == b"+":
+            return body.decode("utf-8")
+        if prefix == b"-":
+            return RespError(body.decode("utf-8"))
+        if prefix == b":":
+            return int(body)
+        if prefix == b"$":
+            length = int(body)
+            if length == -1:
+                return None
+            data = rfile.read(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            count = int(body)
+            if count == -1:
+                return None
+            return [cls._read_reply(rfile) for _ in range(count)]
+        raise ConnectionError(f"Unexpected RESP reply: {line!r}")
+
+    def execute_pipeline(self, commands: List[Tuple]) -> List[Any]:
+        """Sends all commands in one write, then reads the replies in order."""
+        conn = self._acquire()
+        sock, rfile = conn
+        try:
+            sock.sendall(b"".join(self._encode(*cmd) for cmd in commands))
+            replies = [self._read_reply(rfile) for _ in commands]
+        except (OSError, ConnectionError):
+            # Broken socket: never hand it back to the pool
+            self._discard(conn)
+            raise
+        self._release(conn)
+
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    def execute(self, *args) -> Any:
+        return self.execute_pipeline([args])[0]
+
+    # --- CacheBackend ---
+    def _key(self, segment: str, key: str) -> str:
+        return f"{self.namespace}:{segment}:{key}"
+
+    def get(self, segment: str, key: str) -> Optional[str]:
+        value = self.execute("GET", self._key(segment, key))
+        return value.decode("utf-8") if value is not None else None
+
+    def set(self, segment: str, key: str, value: str):
+        self.execute("SET", self._key(segment, key), value, "EX", self.ttl)
+
+    def get_many(self, segment: str, keys: List[str]) -> Dict[str, str]:
+        if not keys:
+            return {}
+        replies = self.execute_pipeline([("GET", self._key(segment, k)) for k in keys])
+        return {k: v.decode("utf-8") for k, v in zip(keys, replies) if v is not None}
+
+    def set_many(self, segment: str, items: Dict[str, str]):
+        if not items:
+            return
+        self.execute_pipeline([("SET", self._key(segment, k), v, "EX", self.ttl) for k, v in items.items()])
+
+    def close(self):
+        while True:
+            try:
+                self._discard(self._pool.get_nowait())
+            except queue.Empty:
+                break
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight generations (v0.10.0).
+    The first caller for a key becomes the leader and publishes its chunks; callers
+    arriving before it finishes subscribe to the same StreamBuffer instead of
+    starting another generation. Finished flights are dropped: by then
+    the answer is in the response cache. A flight closed with ABANDONED (the
+    leader's consumer went away) is taken over by its followers.
+    """
+    ABANDONED = "Generation abandoned"
+
+    def __init__(self):
+        self._flights: Dict[str, StreamBuffer] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def join(self, key: str) -> Tuple[StreamBuffer, bool]:
+        """Returns (flight, is_leader)."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.followers += 1
+                return flight, False
+            flight = StreamBuffer()
+            self._flights[key] = flight
+            self.leaders += 1
+            return flight, True
+
+    def finish(self, key: str, flight: StreamBuffer, error: Optional[str] = None):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.close(error)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._flights
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"in_flight": len(self._flights), "leaders": self.leaders, "followers": self.followers}
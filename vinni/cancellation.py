@@ -0,0 +1,114 @@
+import queue
+import threading
+import time
+from typing import Callable, Iterable, Iterator, List, Optional
+
+class TurnCancelled(Exception):
+    """Raised at a pipeline checkpoint once a turn's CancelToken has fired."""
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class CancelToken:
+    """
+    Cooperative cancellation for one turn (v0.10.0).
+    Fires when `cancel()` is called (client disconnect, Ctrl-C, shutdown) or when
+    the optional deadline passes. ChatBot checks it between stream chunks and
+    before each post-processing stage, then closes the Ollama stream. With a
+    deadline, the stream is read through watch(), so a stalled model cannot
+    hold the turn past it.
+    """
+    def __init__(self, timeout: Optional[float] = None):
+        self._event = threading.Event()
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.reason: Optional[str] = None
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def cancel(self, reason: str = "cancelled"):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], None]):
+        """Calls `callback` once the token is cancelled (right away if it already is)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._event.is_set() and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel("deadline")
+        return self._event.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline (None without one)."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def check(self):
+        if self.cancelled:
+            raise TurnCancelled(self.reason)
+
+
+class _StreamEnd:
+    """Marks the end of a watched stream, with the reader's exception if it failed."""
+    __slots__ = ("error",)
+
+    def __init__(self):
+        self.error: Optional[BaseException] = None
+
+
+def watch(stream: Iterable, token: CancelToken) -> Iterator:
+    """
+    Iterates `stream` on a reader thread, so the token's deadline (or a cancel()
+    from another thread) raises TurnCancelled while a read is still blocked,
+    instead of at the next chunk. The reader closes `stream` itself once it stops;
+    a read already in progress ends on its own (bounded by the client's read timeout).
+    """
+    items = queue.Queue()
+    stopped = threading.Event()
+    end = _StreamEnd()
+
+    def read():
+        try:
+            for item in stream:
+                items.put(item)
+                if stopped.is_set():
+                    break
+        except BaseException as e:
+            end.error = e
+        finally:
+            if hasattr(stream, "close"):
+                stream.close()
+            items.put(end)
+
+    token.add_callback(lambda: items.put(None))
+    threading.Thread(target=read, daemon=True, name="vinni-stream-reader").start()
+    try:
+        while True:
+            try:
+                item = items.get(timeout=token.remaining())
+            except queue.Empty:
+                item = None
+            if item is None:
+                # Woken by cancel() or the deadline
+                token.check()
+                continue
+            if item is end:
+                if end.error is not None:
+                    raise end.error
+                return
+            yield item
+    finally:
+        stopped.set()
@@ -0,0 +1,33 @@
+import httpx
+import ollama
+from typing import Optional
+
+# Generation can legitimately take minutes; connecting or waiting for a pooled
+# connection should not. ollama.Client defaults to no timeout at all.
+DEFAULT_TIMEOUT = httpx.Timeout(connect=5.0, read=300.0, write=30.0, pool=30.0)
+
+def _pool_settings(max_connections: int, max_keepalive: int, keepalive_expiry: float,
+                   timeout: Optional[httpx.Timeout]) -> dict:
+    return {
+        "timeout": timeout or DEFAULT_TIMEOUT,
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        )
+    }
+
+def make_client(host: Optional[str] = None, max_connections: int = 16, max_keepalive: int = 8,
+                keepalive_expiry: float = 120.0, timeout: httpx.Timeout = None) -> ollama.Client:
+    """
+    One pooled Ollama client (v0.10.0).
+    Extraction, the main stream and the MathVerifier fallback all go through it,
+    so a math turn's three sequential calls reuse one keep-alive connection.
+    `host` defaults to OLLAMA_HOST, like the ollama package.
+    """
+    return ollama.Client(host=host, **_pool_settings(max_connections, max_keepalive, keepalive_expiry, timeout))
+
+def make_async_client(host: Optional[str] = None, max_connections: int = 16, max_keepalive: int = 8,
+                      keepalive_expiry: float = 120.0, timeout: httpx.Timeout = None) -> ollama.AsyncClient:
+    """make_client() for AsyncChatBot: same pool limits and timeouts, on ollama.AsyncClient."""
+    return ollama.AsyncClient(host=host, **_pool_settings(max_connections, max_keepalive, keepalive_expiry, timeout))
@@ -0,0 +1,88 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from vinni.history import Message
+
+SUMMARY_PREFIX = "[Conversation Summary]"
+# Scheduler intent for summary generations (lowest default priority in IntentScheduler)
+SUMMARY_INTENT = "COMPACT"
+
+SUMMARY_INSTRUCTIONS = (
+    "You compress chat transcripts. Summarize the conversation below in at most a few short "
+    "bullet points: the user's goals, facts and numbers they gave, decisions and answers reached, "
+    "and open questions. Fold any earlier summary into yours. Output only the summary."
+)
+
+
+class HistoryCompactor:
+    """
+    Background compaction of old turns (v0.10.0).
+    Once a session's history passes `threshold_tokens` (default: `threshold_ratio`
+    of its history window budget), the oldest messages — everything but the system
+    prompt, pinned messages and the last `keep_recent` — are summarized by the model
+    on a worker thread. The session swaps them for one system note before its next
+    request, so nobody waits for the summary and later prompts are shorter.
+    Share one compactor per process; `workers` bounds concurrent summaries, and
+    with a scheduler each summary also waits for a SUMMARY_INTENT slot.
+    """
+    def __init__(self, threshold_tokens: Optional[int] = None, threshold_ratio: float = 0.75,
+                 keep_recent: int = 6, max_summary_tokens: int = 256, workers: int = 1):
+        self.threshold_tokens = threshold_tokens
+        self.threshold_ratio = threshold_ratio
+        self.keep_recent = keep_recent
+        self.max_summary_tokens = max_summary_tokens
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vinni-compact")
+        self._lock = threading.Lock()
+        self.compactions = 0
+        self.failures = 0
+        self.saved_tokens = 0
+
+    def threshold(self, budget: int) -> int:
+        if self.threshold_tokens is not None:
+            return self.threshold_tokens
+        return int(budget * self.threshold_ratio)
+
+    def select_block(self, history: List[Dict], pinned: List[Dict] = ()) -> List[Dict]:
+        """The oldest compactable messages (at least two, or none)."""
+        pinned_ids = {id(m) for m in pinned}
+        start = 1 if history and history[0]['role'] == 'system' else 0
+        block = [m for m in history[start:len(history) - self.keep_recent] if id(m) not in pinned_ids]
+        return block if len(block) >= 2 else []
+
+    def submit(self, summarize: Callable[[List[Dict]], str], block: List[Dict]) -> Future:
+        # The worker only sees a copy; the live history is only touched by apply()
+        snapshot = [{'role': m['role'], 'content': m['content']} for m in block]
+        return self._executor.submit(summarize, snapshot)
+
+    def apply(self, history: List[Dict], block: List[Dict], summary: str,
+              estimate: Callable[[str], int], pinned: List[Dict] = ()) -> Optional[Dict]:
+        """
+        Replaces `block` in `history` (in place) with one system note at the block's position.
+        Returns the note, or None if the history no longer holds the whole block or a
+        message in it was pinned after the summary was started.
+        """
+        block_ids = {id(m) for m in block}
+        positions = [i for i, m in enumerate(history) if id(m) in block_ids]
+        if len(positions) != len(block) or not summary:
+            return None
+        if any(id(m) in block_ids for m in pinned):
+            return None
+
+        note = Message('system', f"{SUMMARY_PREFIX}\n{summary}")
+        history[positions[0]:positions[0] + 1] = [note]
+        history[:] = [m for m in history if id(m) not in block_ids]
+        with self._lock:
+            self.compactions += 1
+            self.saved_tokens += sum(estimate(m['content']) for m in block) - estimate(note['content'])
+        return note
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"compactions": self.compactions, "failures": self.failures, "saved_tokens": self.saved_tokens}
+
+    def close(self):
+        self._executor.shutdown(wait=False)
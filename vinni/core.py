@@ -1,39 +1,106 @@
 import ollama
 import time
 import os
-from typing import List, Dict, Generator
+from typing import List, Dict, Generator, Optional
 from vinni.monitor import IntentTagger, SecurityLogger
 from vinni.math_engine import FinanceEngine, ProbabilityEngine
+from vinni.cache import CacheBackend, DiskCache, LRUCache, SemanticCache, SingleFlight
+from vinni.scheduler import IntentScheduler
+from vinni.admission import AdmissionController
+from vinni.cancellation import CancelToken, TurnCancelled, watch
+from vinni.breaker import CircuitBreaker
+from vinni.verifier import MathVerifier
+from vinni.lifecycle import ModelLifecycle
+from vinni.streaming import StreamBuffer
+from vinni.history import HistoryWindow, Message
+from vinni.compaction import SUMMARY_INSTRUCTIONS, SUMMARY_INTENT, HistoryCompactor
 import json
 import re
 
 import hashlib
+import threading
 import uuid
 import os
 
 class ChatBot:
-    def __init__(self, model_name: str = "llama3", options: Dict = None, system_prompt_path: str = None):
+    # v0.10.0: Phrases that mark a delta on the previous math turn
+    FOLLOWUP_CUES = ["what if", "instead", "how about", "what about", "and if", "suppose", "same loan", "same mortgage"]
+    # v0.10.0: Words that tie a follow-up to the stored loan even after unrelated turns
+    FOLLOWUP_TOPICS = ["loan", "mortgage", "payment", "principal", "interest", "rate", "term", "extra", "additional", "refinanc", "amortiz", "pay off", "payoff"]
+
+    # v0.10.0: Process-wide extraction caches (keyed on normalized text + model, shared by all sessions)
+    extraction_cache = LRUCache(max_entries=512)
+    extraction_negative_cache = LRUCache(max_entries=512)
+
+    # v0.10.0: Process-wide single-flight table (identical concurrent misses share one generation)
+    in_flight = SingleFlight()
+
+    def __init__(self, model_name: str = "llama3", options: Dict = None, system_prompt_path: str = None, cache_path: str = None, cache_backend: CacheBackend = None, semantic_threshold: float = None, embedding_model: str = "nomic-embed-text", caches: Dict[str, LRUCache] = None, scheduler: IntentScheduler = None, admission: AdmissionController = None, turn_timeout: float = None, breaker: CircuitBreaker = None, client: ollama.Client = None, lifecycle: ModelLifecycle = None, history_window: HistoryWindow = None, compactor: HistoryCompactor = None, semantic_cache: SemanticCache = None):
         self.model_name = model_name
         self.options = options or {}
-        self.history: List[Dict[str, str]] = []
+        self.history: List[Message] = []  # v0.10.0: Slot-based entries that read like {'role', 'content'}
+        # v0.10.0: What is sent to the model each turn (system prompt + pinned + recent turns within num_ctx)
+        self.history_window = history_window or HistoryWindow.for_options(self.options)
+        self.pinned: List[Message] = []
+        # v0.10.0: Optional background summarization of old turns (share one across sessions)
+        self.compactor = compactor
+        self._compaction = None  # (block, Future) while a summary is being written
         self.tagger = IntentTagger()
         self.system_prompt_content = ""
         self.session_id = str(uuid.uuid4())[:8]
         self.prompt_version = "unknown"
         self.prompt_hash = "none"
         self.last_turn_tokens = 0
-        self.caches = {
-            "CHAT": {},
-            "CODE": {},
-            "ANALYSIS": {},
-            "DOCUMENT": {}
-        }
+        self.last_turn = None  # v0.10.0: Metrics + flags of the last logged turn
+        self.math_context = None # v0.10.0: Last loan params + engine result (follow-ups)
         self.cache_limits = {
             "CHAT": 100,      # High freq, small
             "CODE": 50,       # Med freq
             "ANALYSIS": 20,   # Low freq, Large content
             "DOCUMENT": 20
         }
+        # v0.10.0: Byte budgets so a few large answers cannot crowd out the rest
+        self.cache_byte_limits = {
+            "CHAT": 256 * 1024,
+            "CODE": 512 * 1024,
+            "ANALYSIS": 1024 * 1024,
+            "DOCUMENT": 1024 * 1024
+        }
+        # v0.10.0: Long-form segments store large answers zlib-compressed
+        self.cache_compress_thresholds = {
+            "ANALYSIS": 1024,
+            "DOCUMENT": 1024
+        }
+        # v0.10.0: True LRU per intent segment (was FIFO dicts)
+        # Pass `caches` to share one set of segments between sessions (e.g. the HTTP server)
+        self.caches = caches or self.build_caches()
+        # v0.10.0: Optional shared tier (SQLite on disk via cache_path, or any CacheBackend e.g. RedisCache)
+        self.cache_backend = cache_backend or (DiskCache(cache_path) if cache_path else None)
+        # v0.10.0: Optional semantic tier (paraphrase hits via Ollama embeddings)
+        # Pass `semantic_cache` to share one index between sessions, like `caches`
+        self.embedding_model = embedding_model
+        self.semantic_cache = semantic_cache
+        # v0.10.0: Optional intent-aware admission to the model (share one across sessions)
+        self.scheduler = scheduler
+        # v0.10.0: Optional token-bucket load shedding (share one across sessions)
+        self.admission = admission
+        self.last_busy = None  # {"reason", "retry_after"} when the last turn was shed
+        # v0.10.0: Default per-turn deadline in seconds (None = no deadline)
+        self.turn_timeout = turn_timeout
+        # v0.10.0: Optional circuit breaker around every Ollama call (share one per backend)
+        self.breaker = breaker
+        # v0.10.0: One Ollama client for extraction, streaming and verification (see vinni.client.make_client).
+        # Without one, calls go through the ollama module's default client.
+        self.client = client or ollama
+        # v0.10.0: Optional model warm-up / keep_alive manager (share one per process)
+        self.lifecycle = lifecycle
+        self.verifier = MathVerifier(model_name=self.model_name, breaker=self.breaker, client=self.client,
+                                     keep_alive=lifecycle.keep_alive_for(model_name) if lifecycle else None)
+        if semantic_cache is None and semantic_threshold is not None:
+            try:
+                self.semantic_cache = SemanticCache(threshold=semantic_threshold)
+            except ImportError as e:
+                print(f"[DEBUG] Semantic Cache Disabled: {e}")
         
         self.tone = "adaptive" # v0.2.8
         self.TONE_PROMPTS = {
@@ -78,23 +145,25 @@ class ChatBot:
         if self.history and self.history[0]["role"] == "system":
             self.history[0]["content"] = self.system_prompt_content
         else:
-            self.history.insert(0, {'role': 'system', 'content': self.system_prompt_content})
+            self.history.insert(0, Message('system', self.system_prompt_content))
             
         # Re-hash for cache invalidation (Auto-handles v0.2.5 requirement)
         self.prompt_hash = hashlib.sha256(self.system_prompt_content.encode()).hexdigest()[:8]
 
-    def _process_math_request(self, user_input: str, intent: str) -> str:
-        """
-        v0.3.0: Deterministic Math Engine.
-        Returns a context string if math detected, else None.
-        """
-        # 1. Trigger Check
-        triggers = ["loan", "interest", "annuity", "bond", "mortgage", "blackjack", "poker", "odds", "probability", "calculate", "invest", "compound", "growth", "rate", "%", "return"]
-        # v0.5.0: ALWAYS validation trigger if keywords present (removed ANALYSIS exclusion)
-        if not any(t in user_input.lower() for t in triggers):
-            return None
-        
-        # 2. Extraction Prompt
+    def _extraction_key(self, user_input: str) -> str:
+        normalized = " ".join(user_input.lower().split())
+        return hashlib.md5(f"{normalized}|{self.model_name}".encode()).hexdigest()
+
+    def _cached_extraction(self, extraction_key: str) -> Optional[Dict]:
+        """Returns a cached extraction ({} for known failures), or None on a miss."""
+        cached = self.extraction_cache.get(extraction_key)
+        if cached is not None:
+            return dict(cached)
+        if self.extraction_negative_cache.get(extraction_key) == "failed":
+            return {}
+        return None
+
+    def _extraction_messages(self, user_input: str) -> List[Dict[str, str]]:
         extraction_prompt = (
             "Extract mathematical variables from the user query into a valid JSON object. "
             "Supported keys: 'type' (loan, annuity, bond, probability_blackjack, probability_generic, compound_interest, simple_interest), 'principal', 'rate_annual', 'years', 'payment_freq', 'compounding_freq', 'face_value', 'coupon_rate', 'ytm', 'hand_size', 'payment_amount'. "
@@ -102,18 +171,13 @@ class ChatBot:
             "Convert percentages to decimals (e.g. 18.99% -> 0.1899). "
             "Output JSON ONLY. No markdown."
         )
-        
+        return [
+            {'role': 'system', 'content': extraction_prompt},
+            {'role': 'user', 'content': user_input}
+        ]
+
+    def _parse_extraction(self, content: str, extraction_key: str) -> Dict:
         try:
-            # Single-shot extraction
-            resp = ollama.chat(
-                model=self.model_name,
-                messages=[
-                    {'role': 'system', 'content': extraction_prompt},
-                    {'role': 'user', 'content': user_input}
-                ],
-                options={"temperature": 0.0}
-            )
-            content = resp['message']['content']
             # Clean json
             json_str = content.replace("```json", "").replace("```", "").strip()
             # Attempt to find '{' and '}' if extra text exists
@@ -123,13 +187,103 @@ class ChatBot:
                 json_str = json_str[start:end+1]
             
             data = json.loads(json_str)
+            if not isinstance(data, dict):
+                raise ValueError(f"Expected JSON object, got {type(data).__name__}")
         except Exception as e:
             print(f"[DEBUG] Extraction Failed: {e}")
-            data = {} 
+            self.extraction_negative_cache.put(extraction_key, "failed")
+            return {}
         
-        # Logic Flow continues even if extraction failed (using Force Logic)
+        self.extraction_cache.put(extraction_key, data)
+        return dict(data)
+
+    def _keep_alive(self) -> Dict:
+        # Every request resets Ollama's unload timer, so all of them must carry our keep_alive
+        return {"keep_alive": self.lifecycle.keep_alive_for(self.model_name)} if self.lifecycle else {}
+
+    def warm_model(self, background: bool = False) -> Optional[float]:
+        """
+        Loads the model and prefills the current system prompt (v0.10.0).
+        Returns the reported load time in ms (None on failure or when running in the background).
+        """
+        lifecycle = self.lifecycle or ModelLifecycle(client=self.client)
+        if background:
+            threading.Thread(target=lifecycle.warm, args=(self.model_name, self.system_prompt_content, self.options), daemon=True).start()
+            return None
+        return lifecycle.warm(self.model_name, self.system_prompt_content, self.options)
+
+    def _guarded(self, fn, *args, **kwargs):
+        """Runs a non-streaming Ollama call through the circuit breaker, if one is set."""
+        if self.breaker is None:
+            return fn(*args, **kwargs)
+        return self.breaker.call(fn, *args, **kwargs)
+
+    def _extract_math_params(self, user_input: str, extraction_key: str) -> Dict:
+        """
+        LLM parameter extraction with positive and negative caching (v0.10.0).
+        Returns the extracted dict, or {} if extraction failed (Force Logic still applies).
+        """
+        cached = self._cached_extraction(extraction_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            # Single-shot extraction
+            resp = self._guarded(
+                self.client.chat,
+                model=self.model_name,
+                messages=self._extraction_messages(user_input),
+                options={"temperature": 0.0},
+                **self._keep_alive()
+            )
+        except Exception as e:
+            # Transport errors (and an open breaker) are not negative-cached; the next attempt may succeed
+            print(f"[DEBUG] Extraction Failed: {e}")
+            return {}
+        return self._parse_extraction(resp['message']['content'], extraction_key)
+
+    def _math_extraction_key(self, user_input: str) -> Optional[str]:
+        """Returns the extraction key if the input needs the Math Engine, else None."""
+        # 1. Trigger Check
+        triggers = ["loan", "interest", "annuity", "bond", "mortgage", "blackjack", "poker", "odds", "probability", "calculate", "invest", "compound", "growth", "rate", "%", "return"]
+        # v0.5.0: ALWAYS validation trigger if keywords present (removed ANALYSIS exclusion)
+        if not any(t in user_input.lower() for t in triggers):
+            return None
         
-        # Strict Routing (v0.3.1)
+        extraction_key = self._extraction_key(user_input)
+        if self.extraction_negative_cache.get(extraction_key) == "unknown":
+            # v0.10.0: Known to route to "unknown" -> Bypass Engine without an LLM call
+            return None
+        return extraction_key
+
+    def _followup_math_result(self, followup_params: Dict):
+        # v0.10.0: Follow-up delta -> straight to the engine, no extraction round-trip
+        result = self._compute_loan_scenarios(followup_params)
+        self.math_context = {"params": followup_params, "result": result, "recent": True}
+        assumptions = ["Loan terms carried over from the previous question"]
+        return self._format_math_context(result, assumptions), result, assumptions
+
+    def _process_math_request(self, user_input: str, intent: str, followup_params: Dict = None) -> str:
+        """
+        v0.3.0: Deterministic Math Engine.
+        Returns a context string if math detected, else None.
+        """
+        if followup_params:
+            return self._followup_math_result(followup_params)
+        
+        extraction_key = self._math_extraction_key(user_input)
+        if extraction_key is None:
+            return None
+        
+        # 2. Extraction (v0.10.0: cached, see _extract_math_params)
+        data = self._extract_math_params(user_input, extraction_key)
+        return self._route_math_request(user_input, data, extraction_key)
+
+    def _route_math_request(self, user_input: str, data: Dict, extraction_key: str):
+        """Routes extracted parameters to the engines and builds the injected context."""
+        # Logic Flow continues even if extraction failed (using Force Logic)
+        try:
+            # Strict Routing (v0.3.1)
             # If the extracted type isn't explicitly supported, RETURN NONE.
             # This prevents generic "probability" queries (Coin Flip) from triggering Blackjack logic.
             supported_types = ["loan", "annuity", "bond", "probability_blackjack", "compound_interest", "simple_interest"] 
@@ -201,40 +355,17 @@ class ChatBot:
                 if extra_match:
                      extra_payment = float(extra_match.group(1).replace(",", ""))
                 
-                # v0.7.0 Multi-Scenario Calculation (Super-Context)
-                scenarios = {}
-                
-                # 1. Primary Request
-                scenarios["PRIMARY_REQUEST"] = FinanceEngine.calculate_loan_interest(
-                    principal=principal,
-                    annual_rate=float(data.get("rate_annual", 0)),
-                    months=int(data.get("years", 1)) * 12, # approx
-                    payment_freq=freq,
-                    compounding_freq=comp_freq,
-                    extra_payment=extra_payment
-                )
-                
-                # 2. Contextual Monthly (if needed)
-                if freq != "monthly":
-                    scenarios["CONTEXT_MONTHLY"] = FinanceEngine.calculate_loan_interest(
-                        principal=principal,
-                        annual_rate=float(data.get("rate_annual", 0)),
-                        months=int(data.get("years", 1)) * 12,
-                        payment_freq="monthly",
-                        compounding_freq=comp_freq
-                    )
-                    
-                # 3. Contextual Bi-weekly (if needed - Auto-Comparison for "Part d")
-                if "biweekly" not in freq and "bi-weekly" not in freq:
-                     scenarios["CONTEXT_BIWEEKLY"] = FinanceEngine.calculate_loan_interest(
-                        principal=principal,
-                        annual_rate=float(data.get("rate_annual", 0)),
-                        months=int(data.get("years", 1)) * 12,
-                        payment_freq="biweekly",
-                        compounding_freq=comp_freq
-                    )
-                
-                result = scenarios
+                params = {
+                    "principal": principal,
+                    "rate_annual": float(data.get("rate_annual", 0)),
+                    "years": int(data.get("years", 1)),
+                    "payment_freq": freq,
+                    "compounding_freq": comp_freq,
+                    "extra_payment": extra_payment
+                }
+                result = self._compute_loan_scenarios(params)
+                # v0.10.0: Remember for follow-ups ("what if I add an extra $200?")
+                self.math_context = {"params": params, "result": result, "recent": True}
             elif "compound" in extracted_type:
                  # Default frequency 1 (annual)
                  result = FinanceEngine.calculate_compound_interest(
@@ -265,24 +396,12 @@ class ChatBot:
                  result = ProbabilityEngine.solve_blackjack_probability()
             else:
                  # Generic probability or unknown type -> Bypass Engine
+                 # v0.10.0: Remember so repeats skip the extraction call entirely
+                 self.extraction_negative_cache.put(extraction_key, "unknown")
                  return None, None, None
             
             if result:
-                # v0.9.0 Enhanced Context Injection
-                assumption_text = ""
-                if assumptions:
-                    assumption_text = f"\nASSUMPTIONS APPLIED: {', '.join(assumptions)}. User did not specify these, but I used defaults. MENTION THIS."
-                
-                return (
-                    f"SYSTEM: I have utilized the underlying math engine to provide accurate calculations.\n"
-                    f"VERIFIED RESULT JSON: {json.dumps(result, indent=2)}\n"
-                    f"{assumption_text}\n"
-                    f"INSTRUCTION: Start with a 'TL;DR' summary (2 lines). Then provide a 'Detailed Breakdown'.\n"
-                    f"INSTRUCTION: You MUST use these exact numbers. Do not re-calculate.\n"
-                    f"INSTRUCTION: At the end of your response, append exactly: '[Confidence: 1.0 (Deterministic Math)]'\n",
-                    result,
-                    assumptions
-                )
+                return self._format_math_context(result, assumptions), result, assumptions
                 
         except Exception as e:
             # Fallback (Silent fail, let LLM handle it normally)
@@ -290,108 +409,378 @@ class ChatBot:
             
         return None
 
-    def _estimate_tokens(self, text: str) -> int:
-        return len(text) // 4
+    def _compute_loan_scenarios(self, params: Dict) -> Dict:
+        """v0.7.0 Multi-Scenario Calculation (Super-Context) from canonical loan params."""
+        freq = params["payment_freq"]
+        scenarios = {}
+        
+        # 1. Primary Request
+        scenarios["PRIMARY_REQUEST"] = FinanceEngine.calculate_loan_interest(
+            principal=params["principal"],
+            annual_rate=params["rate_annual"],
+            months=params["years"] * 12, # approx
+            payment_freq=freq,
+            compounding_freq=params["compounding_freq"],
+            extra_payment=params["extra_payment"]
+        )
+        
+        # 2. Contextual Monthly (if needed)
+        if freq != "monthly":
+            scenarios["CONTEXT_MONTHLY"] = FinanceEngine.calculate_loan_interest(
+                principal=params["principal"],
+                annual_rate=params["rate_annual"],
+                months=params["years"] * 12,
+                payment_freq="monthly",
+                compounding_freq=params["compounding_freq"]
+            )
+            
+        # 3. Contextual Bi-weekly (if needed - Auto-Comparison for "Part d")
+        if "biweekly" not in freq and "bi-weekly" not in freq:
+            scenarios["CONTEXT_BIWEEKLY"] = FinanceEngine.calculate_loan_interest(
+                principal=params["principal"],
+                annual_rate=params["rate_annual"],
+                months=params["years"] * 12,
+                payment_freq="biweekly",
+                compounding_freq=params["compounding_freq"]
+            )
+        
+        return scenarios
+
+    def _format_math_context(self, result: Dict, assumptions: List[str]) -> str:
+        # v0.9.0 Enhanced Context Injection
+        assumption_text = ""
+        if assumptions:
+            assumption_text = f"\nASSUMPTIONS APPLIED: {', '.join(assumptions)}. User did not specify these, but I used defaults. MENTION THIS."
+        
+        return (
+            f"SYSTEM: I have utilized the underlying math engine to provide accurate calculations.\n"
+            f"VERIFIED RESULT JSON: {json.dumps(result, indent=2)}\n"
+            f"{assumption_text}\n"
+            f"INSTRUCTION: Start with a 'TL;DR' summary (2 lines). Then provide a 'Detailed Breakdown'.\n"
+            f"INSTRUCTION: You MUST use these exact numbers. Do not re-calculate.\n"
+            f"INSTRUCTION: At the end of your response, append exactly: '[Confidence: 1.0 (Deterministic Math)]'\n"
+        )
 
-    def chat(self, user_input: str) -> Generator[str, None, None]:
+    def _math_followup_params(self, user_input: str) -> Optional[Dict]:
         """
-        Sends a message to the Ollama model and yields chunks of the response.
+        v0.10.0: Session Math Memory.
+        If the input is a follow-up to the previous loan turn ("what if I add an extra $200 a month?"),
+        returns the previous params with the requested changes applied, else None.
+        Bare numbers ("how about 6% over 15 years?") only count right after the loan turn;
+        once other turns came in between, the input has to name the loan topic.
         """
-        start_time = time.time()
-        request_id = f"req-{uuid.uuid4().hex[:5]}"
-        self.last_turn_tokens = 0
-        input_tokens = self._estimate_tokens(user_input)
+        if not self.math_context:
+            return None
         
-        # 0. Hash Input (v0.2.3)
-        input_hash = hashlib.md5(user_input.encode()).hexdigest()
-
-        # 1. Intent Tagging (v0.1.4: Returns Dict)
-        intent_info = self.tagger.tag(user_input)
+        text = user_input.lower()
+        if not any(cue in text for cue in self.FOLLOWUP_CUES):
+            return None
+        if not self.math_context.get("recent", True) and not any(topic in text for topic in self.FOLLOWUP_TOPICS):
+            return None
         
-        self.history.append({'role': 'user', 'content': user_input})
+        params = dict(self.math_context["params"])
+        changed = False
         
-        # 2. Static Response Intercepts
+        # Extra payment ("extra $200", "additional 150")
+        extra_match = re.search(r"(?:extra|additional)\D{0,20}?\$?([\d,]+(?:\.\d+)?)", text)
+        if extra_match:
+            params["extra_payment"] = float(extra_match.group(1).replace(",", ""))
+            changed = True
+        
+        # New principal (any other dollar amount)
+        for m in re.finditer(r"\$([\d,]+(?:\.\d+)?)(k?)", text):
+            if extra_match and m.start(1) == extra_match.start(1):
+                continue
+            amount = float(m.group(1).replace(",", "")) * (1000 if m.group(2) else 1)
+            if amount > 0:
+                params["principal"] = amount
+                changed = True
+        
+        rate_match = re.search(r"(\d+(?:\.\d+)?)\s*%", text)
+        if rate_match:
+            params["rate_annual"] = float(rate_match.group(1)) / 100
+            changed = True
+        
+        years_match = re.search(r"(\d+)[\s-]*(?:years?|yrs?)", text)
+        if years_match:
+            params["years"] = int(years_match.group(1))
+            changed = True
+        
+        # Payment frequency (first match wins, most specific first)
+        for pattern, freq in [(r"\bbi-?weekly\b", "biweekly"), (r"\bsemi-monthly\b", "semi-monthly"), (r"\bweekly\b", "weekly"), (r"\bmonthly\b", "monthly")]:
+            if re.search(pattern, text):
+                params["payment_freq"] = freq
+                changed = True
+                break
+        
+        if "semi-annual" in text:
+            params["compounding_freq"] = "semi-annually"
+            changed = True
+        elif "annually" in text and "compound" in text:
+            params["compounding_freq"] = "annually"
+            changed = True
+        
+        return params if changed else None
+
+    def _cache_key(self, input_hash: str) -> str:
+        # v0.2.5: Composite Key for Stale Prevention
+        # We assume input_hash is just the user input. We combine it with model config.
+        composite_key_str = f"{input_hash}|{self.model_name}|{self.prompt_hash}"
+        return hashlib.md5(composite_key_str.encode()).hexdigest()
+
+    def warm_cache(self, log_path: str = "vinni.log", top_n: int = 20, background: bool = False) -> int:
+        """
+        Pre-populates the intent caches from the most frequent logged answers (v0.10.0).
+        Only answers generated by the current model under the current prompt_hash are used.
+        Returns the number of entries loaded (0 when running in the background).
+        """
+        if background:
+            threading.Thread(target=self.warm_cache, args=(log_path, top_n), daemon=True).start()
+            return 0
+
+        if not os.path.exists(log_path):
+            return 0
+
+        try:
+            turns = SecurityLogger.top_turns(log_path, self.model_name, self.prompt_hash, top_n)
+        except Exception as e:
+            print(f"[DEBUG] Cache Warm-up Failed: {e}")
+            return 0
+
+        by_intent: Dict[str, Dict[str, str]] = {}
+        for turn in turns:
+            key = self._cache_key(turn["input_hash"])
+            self._cache_put_memory(turn["intent"], key, turn["output"])
+            by_intent.setdefault(turn["intent"], {})[key] = turn["output"]
+
+        if self.cache_backend:
+            # Backfill a new or flushed shared tier: one get_many + one set_many per segment
+            try:
+                for intent, items in by_intent.items():
+                    present = self.cache_backend.get_many(intent, list(items))
+                    missing = {k: v for k, v in items.items() if k not in present}
+                    if missing:
+                        self.cache_backend.set_many(intent, missing)
+            except Exception as e:
+                print(f"[DEBUG] Cache Backend Warm-up Failed: {e}")
+        return len(turns)
+
+    def _cache_get(self, intent: str, cache_key: str):
+        """
+        Looks up memory first, then the shared backend tier (v0.10.0).
+        Returns (response, source) or (None, None).
+        """
+        target_cache = self.caches.get(intent, self.caches["CHAT"])
+        cached = target_cache.get(cache_key)
+        if cached is not None:
+            return cached, f"memory.{intent}"
+
+        if self.cache_backend:
+            try:
+                cached = self.cache_backend.get(intent, cache_key)
+            except Exception as e:
+                print(f"[DEBUG] Cache Backend Read Failed: {e}")
+                cached = None
+            if cached is not None:
+                # Promote to memory so repeats skip the backend
+                self._cache_put_memory(intent, cache_key, cached)
+                return cached, f"{self.cache_backend.name}.{intent}"
+
+        return None, None
+
+    def _semantic_segment(self, intent: str) -> str:
+        # Scope vectors to model + prompt so a config change cannot resurrect stale answers
+        return f"{intent}|{self.model_name}|{self.prompt_hash}"
+
+    def _embed(self, text: str):
+        resp = self._guarded(self.client.embed, model=self.embedding_model, input=text)
+        return resp['embeddings'][0]
+
+    def _semantic_lookup(self, intent: str, user_input: str):
+        """
+        Paraphrase lookup (v0.10.0).
+        Returns (response, source, query_vector); the vector is reused when storing a miss.
+        """
+        try:
+            query_vector = self._embed(user_input)
+        except Exception as e:
+            print(f"[DEBUG] Embedding Failed: {e}")
+            return None, None, None
+
+        matched_key = self.semantic_cache.lookup(self._semantic_segment(intent), query_vector, user_input)
+        if matched_key:
+            cached, source = self._cache_get(intent, matched_key)
+            if cached is not None:
+                return cached, f"semantic.{source}", query_vector
+        return None, None, query_vector
+
+    def _cache_put_memory(self, intent: str, cache_key: str, response: str):
+        # Update Cache (v0.10.0 Segmented LRU, evicts by entries and bytes)
+        target_cache = self.caches.get(intent, self.caches["CHAT"])
+        target_cache.put(cache_key, response)
+
+    def _cache_put(self, intent: str, cache_key: str, response: str):
+        self._cache_put_memory(intent, cache_key, response)
+        if self.cache_backend:
+            try:
+                self.cache_backend.set(intent, cache_key, response)
+            except Exception as e:
+                print(f"[DEBUG] Cache Backend Write Failed: {e}")
+
+    def build_caches(self) -> Dict[str, LRUCache]:
+        """Fresh intent segments using this bot's limits (for sharing across sessions)."""
+        return {
+            intent: LRUCache(
+                max_entries=limit,
+                max_bytes=self.cache_byte_limits.get(intent),
+                compress_threshold=self.cache_compress_thresholds.get(intent)
+            )
+            for intent, limit in self.cache_limits.items()
+        }
+
+    def pin(self, index: int = -1) -> Message:
+        """Keeps history[index] in every prompt, however old it gets (v0.10.0)."""
+        message = self.history[index]
+        if not any(m is message for m in self.pinned):
+            self.pinned.append(message)
+        return message
+
+    def unpin(self, message: Message):
+        self.pinned = [m for m in self.pinned if m is not message]
+
+    def export_state(self) -> Dict:
+        """Conversation state for a SessionStore (v0.10.0): messages, tone, pins, last loan."""
+        pinned_ids = {id(m) for m in self.pinned}
+        return {
+            "messages": [m.to_record() for m in self.history],
+            "tone": self.tone,
+            "pinned": [i for i, m in enumerate(self.history) if id(m) in pinned_ids],
+            "math_context": self.math_context
+        }
+
+    def restore_state(self, state: Dict):
+        """Inverse of export_state(). The system prompt is rebuilt from the current prompt file."""
+        self.history = [Message.from_record(m) for m in state.get("messages", [])]
+        self.pinned = [self.history[i] for i in state.get("pinned", []) if i < len(self.history)]
+        self.math_context = state.get("math_context")
+        if state.get("tone") in self.TONE_PROMPTS:
+            self.tone = state["tone"]
+        self.update_system_prompt()
+
+    def _history_messages(self, turn: Dict) -> List[Message]:
+        """The budgeted window for this turn's model call; the report goes to the audit log."""
+        messages, turn["history"] = self.history_window.select(self.history, self.pinned)
+        return messages
+
+    def _maybe_compact(self):
+        """Starts a background summary of the oldest turns once history passes the compactor's threshold."""
+        if self.compactor is None or self._compaction is not None:
+            return
+        total = sum(self._estimate_tokens(m['content']) for m in self.history)
+        if total <= self.compactor.threshold(self.history_window.max_tokens):
+            return
+        block = self.compactor.select_block(self.history, self.pinned)
+        if block:
+            self._compaction = (block, self.compactor.submit(self._summarize_messages, block))
+
+    def _apply_compaction(self):
+        """Swaps a finished summary in for the turns it covers; runs between requests only."""
+        if self._compaction is None or not self._compaction[1].done():
+            return
+        block, future = self._compaction
+        self._compaction = None
+        try:
+            summary = future.result()
+        except Exception as e:
+            self.compactor.record_failure()
+            print(f"[DEBUG] History Compaction Failed: {e}")
+            return
+        self.compactor.apply(self.history, block, summary, self._estimate_tokens, self.pinned)
+
+    def _summarize_messages(self, messages: List[Dict[str, str]]) -> str:
+        if self.scheduler is None:
+            return self._request_summary(messages)
+        # Summaries share the generation slots, behind every waiting user turn
+        with self.scheduler.slot(SUMMARY_INTENT) as ticket:
+            summary = self._request_summary(messages)
+            ticket.output_tokens = self._estimate_tokens(summary)
+        return summary
+
+    def _request_summary(self, messages: List[Dict[str, str]]) -> str:
+        transcript = "\n\n".join(f"{m['role'].upper()}: {m['content']}" for m in messages)
+        resp = self._guarded(
+            self.client.chat,
+            model=self.model_name,
+            messages=[{'role': 'system', 'content': SUMMARY_INSTRUCTIONS}, {'role': 'user', 'content': transcript}],
+            # Same num_ctx as real turns, or Ollama reloads the model for the summary
+            options={**self.options, "temperature": 0.0, "num_predict": self.compactor.max_summary_tokens},
+            **self._keep_alive()
+        )
+        return resp['message']['content'].strip()
+
+    def cache_stats(self) -> Dict[str, Dict]:
+        """Hit/miss/eviction/bytes counters per intent segment."""
+        return {intent: cache.stats() for intent, cache in self.caches.items()}
+
+    def _estimate_tokens(self, text: str) -> int:
+        return len(text) // 4
+
+    def _static_response(self, user_input: str) -> Optional[str]:
         normalized_input = user_input.lower()
-        static_response = None
-        is_static = False
         
         # v0.7.1: Strict Phrase Matching (Fixes "Canadian" trigger loop)
         help_phrases = ["what can you do", "your capabilities", "list intents", "what are your features", "help me understand what you do"]
         if any(p in normalized_input for p in help_phrases) or normalized_input.strip() == "help":
-            static_response = (
+            return (
                 "I support the following response intents:\n"
                 "- CHAT: General conversation, greetings, and simple explanations.\n"
                 "- CODE: Writing or explaining code snippets.\n"
                 "- ANALYSIS: Structured explanations of concepts and reasoning.\n"
                 "- DOCUMENT: Editing, drafting, or improving written text."
             )
-            is_static = True
         elif "who created you" in normalized_input or "who initialized you" in normalized_input:
-             static_response = "I am ViNNi, a locally run AI system initialized by Abhishek Arora."
-             is_static = True
+             return "I am ViNNi, a locally run AI system initialized by Abhishek Arora."
+        return None
 
-        if static_response:
-            self.history.append({'role': 'assistant', 'content': static_response})
-            yield static_response
-            
-            output_tokens = self._estimate_tokens(static_response)
-            self.last_turn_tokens = output_tokens
-            latency = (time.time() - start_time) * 1000
-            
-            SecurityLogger.log_turn(
-                session_id=self.session_id,
-                request_id=request_id,
-                model={"name": "static", "quant": "N/A"},
-                system_info={"name": "ViNNi", "version": self.prompt_version, "system_prompt_hash": self.prompt_hash},
-                user_input=user_input,
-                input_tokens=input_tokens,
-                intent_info=intent_info,
-                output=static_response,
-                output_tokens=output_tokens,
-                latency_ms=latency,
-                flags={"asked_clarification": False, "refusal": False, "static_response": True, "cache_hit": False},
-                input_hash=input_hash
-            )
-            return
+    def _begin_turn(self, user_input: str, request_id: str = None, cancel: CancelToken = None) -> Dict:
+        """Per-turn bookkeeping shared by the sync and async pipelines (v0.10.0)."""
+        self.last_turn_tokens = 0
+        self.last_busy = None
+        self.last_turn = None
+        # 0. Hash Input (v0.2.3)
+        input_hash = hashlib.md5(user_input.encode()).hexdigest()
+        # 1. Intent Tagging (v0.1.4: Returns Dict)
+        intent_info = self.tagger.tag(user_input)
+        followup_params = self._math_followup_params(user_input)
+        if self.math_context and followup_params is None:
+            # Stays stale unless this turn computes a new loan
+            self.math_context["recent"] = False
+        return {
+            "start_time": time.time(),
+            "request_id": request_id or f"req-{uuid.uuid4().hex[:5]}",
+            "input_tokens": self._estimate_tokens(user_input),
+            "input_hash": input_hash,
+            "intent_info": intent_info,
+            "intent": intent_info.get("predicted", "CHAT"),
+            "cache_key": self._cache_key(input_hash),
+            # v0.10.0: Math follow-ups depend on this session's previous loan, so they bypass the shared cache
+            "followup_params": followup_params,
+            "query_vector": None,
+            "cancel": cancel or CancelToken(self.turn_timeout)
+        }
 
-        # 3. Cache Check (v0.2.2)
-        # 3. Cache Check (v0.2.2/v0.2.4 Segmented)
-        # 3. Cache Check (v0.2.2/v0.2.4 Segmented)
-        predicted_intent = intent_info.get("predicted", "CHAT")
-        target_cache = self.caches.get(predicted_intent, self.caches["CHAT"])
-        
-        # v0.2.5: Composite Key for Stale Prevention
-        # We assume input_hash is just the user input. We combine it with model config.
-        composite_key_str = f"{input_hash}|{self.model_name}|{self.prompt_hash}"
-        cache_key = hashlib.md5(composite_key_str.encode()).hexdigest()
+    def _lookup_cached(self, user_input: str, turn: Dict):
+        """Exact tiers first, then the semantic tier. Returns (response, source) or (None, None)."""
+        if turn["followup_params"] is not None:
+            return None, None
         
-        if cache_key in target_cache:
-            cached_response = target_cache[cache_key]
-            self.history.append({'role': 'assistant', 'content': cached_response})
-            yield cached_response
-            
-            output_tokens = self._estimate_tokens(cached_response)
-            self.last_turn_tokens = output_tokens
-            latency = (time.time() - start_time) * 1000
-            
-            SecurityLogger.log_turn(
-                session_id=self.session_id,
-                request_id=request_id,
-                model={"name": "cache", "source": f"memory.{predicted_intent}"},
-                system_info={"name": "ViNNi", "version": self.prompt_version, "system_prompt_hash": self.prompt_hash},
-                user_input=user_input,
-                input_tokens=input_tokens,
-                intent_info=intent_info,
-                output=cached_response,
-                output_tokens=output_tokens,
-                latency_ms=latency,
-                flags={"asked_clarification": False, "refusal": False, "static_response": False, "cache_hit": True},
-                input_hash=input_hash
-            )
-            return
+        cached_response, cache_source = self._cache_get(turn["intent"], turn["cache_key"])
+        if cached_response is None and self.semantic_cache:
+            cached_response, cache_source, turn["query_vector"] = self._semantic_lookup(turn["intent"], user_input)
+        return cached_response, cache_source
 
-        # 3.5 Math Engine Intercept (v0.3.0)
-        math_result_pkg = self._process_math_request(user_input, predicted_intent)
+    def _inject_math_context(self, math_result_pkg):
+        """Appends engine context to the last user message. Returns (engine_data, assumptions)."""
         math_context = None
         engine_data = None
         assumptions = []
@@ -404,85 +793,374 @@ class ChatBot:
                  math_context = math_result_pkg
             
             if math_context:
-                # Inject context by appending to user message (Avoids System-at-end issue)
-                self.history[-1]['content'] += f"\n\n{math_context}"
+                # Inject context into the user message (Avoids System-at-end issue); kept apart from the
+                # user's own text (v0.10.0) and only joined when the message is sent
+                self.history[-1].context = math_context
+        return engine_data, assumptions or []
+
+    def _needs_verification(self, user_input: str) -> bool:
+        # Only verify if we triggered Math Engine OR if "probability"/"calculate" in query
+        triggers = ["loan", "interest", "annuity", "bond", "blackjack", "probability", "calculate"]
+        return any(t in user_input.lower() for t in triggers)
+
+    def _verification_warning(self, v_result: Dict) -> Optional[str]:
+        if v_result.get("status") == "FAIL":
+            rule_id = v_result.get("rule_id", "MV-XXX")
+            severity = v_result.get("severity", "HARD")
+            return f"\n\n⚠️ [MathVerifier] {rule_id} ({severity}): {v_result.get('reason')} RESULT IS INVALID."
+        return None
+
+    def _finish_generation(self, user_input: str, full_response: str, turn: Dict, engine_data, assumptions):
+        """Snapshot + cache fill after a completed generation."""
+        # v0.9.0 Regression Snapshot
+        if engine_data:
+             from vinni.snapshot import RegressionSnapshot
+             RegressionSnapshot.save(
+                 question=user_input,
+                 engine_input=turn["intent_info"], # Log extracted data
+                 engine_output=engine_data,
+                 final_response=full_response,
+                 model_config={"name": self.model_name, "ver": self.prompt_version},
+                 assumptions=assumptions
+             )
         
-        full_response = ""
+        if turn["followup_params"] is None:
+            self._cache_put(turn["intent"], turn["cache_key"], full_response)
+        if turn["query_vector"] is not None:
+            self.semantic_cache.add(self._semantic_segment(turn["intent"]), turn["query_vector"], user_input, turn["cache_key"])
+
+    def _log_turn(self, user_input: str, turn: Dict, output: str, model: Dict, static_response: bool = False, cache_hit: bool = False, shed: bool = False, cancelled: bool = False, degraded: bool = False):
+        # 4. Observability
+        latency = (time.time() - turn["start_time"]) * 1000
+        output_tokens = self._estimate_tokens(output)
+        self.last_turn_tokens = output_tokens
+        flags = {"asked_clarification": False, "refusal": False, "static_response": static_response, "cache_hit": cache_hit, "shed": shed, "cancelled": cancelled, "degraded": degraded, "followup": turn.get("followup_params") is not None}
+        # v0.10.0: Same facts as the audit entry, for in-process callers (batch mode, server)
+        self.last_turn = {
+            "request_id": turn["request_id"],
+            "intent": turn["intent"],
+            "latency_ms": round(latency, 2),
+            "input_tokens": turn["input_tokens"],
+            "output_tokens": output_tokens,
+            "model": model,
+            "engine": turn.get("engine", False),
+            "dropped_tokens": turn["history"]["dropped_tokens"] if "history" in turn else 0,
+            "flags": flags
+        }
         
+        SecurityLogger.log_turn(
+            session_id=self.session_id,
+            request_id=turn["request_id"],
+            model=model,
+            system_info={"name": "ViNNi", "version": self.prompt_version, "system_prompt_hash": self.prompt_hash},
+            user_input=user_input,
+            input_tokens=turn["input_tokens"],
+            intent_info=turn["intent_info"],
+            output=output,
+            output_tokens=output_tokens,
+            latency_ms=latency,
+            flags=flags,
+            input_hash=turn["input_hash"]
+        )
+
+    def chat(self, user_input: str, request_id: str = None, cancel: CancelToken = None) -> Generator[str, None, None]:
+        """
+        Sends a message to the Ollama model and yields chunks of the response.
+        `request_id` lets front-ends correlate their request with the audit log entry.
+        `cancel` stops the turn cooperatively (defaults to a token with `turn_timeout`);
+        closing the generator has the same effect.
+        """
+        self._apply_compaction()
+        turn = self._begin_turn(user_input, request_id, cancel)
+        
+        self.history.append(Message('user', user_input))
+        
+        # 2. Static Response Intercepts
+        static_response = self._static_response(user_input)
+        if static_response:
+            self.history.append(Message('assistant', static_response))
+            yield static_response
+            self._log_turn(user_input, turn, static_response, {"name": "static", "quant": "N/A"}, static_response=True)
+            return
+
+        # 3. Cache Check (v0.2.2/v0.2.4 Segmented, v0.10.0 Tiered)
+        cached_response, cache_source = self._lookup_cached(user_input, turn)
+        if cached_response is not None:
+            self.history.append(Message('assistant', cached_response))
+            yield cached_response
+            self._log_turn(user_input, turn, cached_response, {"name": "cache", "source": cache_source}, cache_hit=True)
+            return
+
+        # 3.4 Single-Flight (v0.10.0): attach to an identical generation already running
+        # Keyed like the cache, so only turns whose answer would be cached are shared
+        flight_key = f"{turn['intent']}:{turn['cache_key']}" if turn["followup_params"] is None else None
+
+        # 3.45 Admission Control (v0.10.0): followers of a running generation cost nothing
+        if self.admission and (flight_key is None or flight_key not in self.in_flight):
+            busy_reply = self._admit(user_input, turn)
+            if busy_reply:
+                yield busy_reply
+                return
+
+        if flight_key is None:
+            yield from self._generate(user_input, turn)
+            return
+
+        yield from self._lead_flight(user_input, turn, flight_key)
+
+    def _lead_flight(self, user_input: str, turn: Dict, flight_key: str):
+        """Generates and publishes for `flight_key`, or follows the generation already running."""
+        flight, leader = self.in_flight.join(flight_key)
+        if not leader:
+            yield from self._follow_flight(user_input, turn, flight, flight_key)
+            return
+
         try:
-            stream = ollama.chat(
-                model=self.model_name,
-                messages=self.history,
-                options=self.options,
-                stream=True,
+            for chunk in self._generate(user_input, turn):
+                flight.publish(chunk)
+                yield chunk
+        finally:
+            # Also runs when the client abandons the generator, so followers never hang.
+            # This leader's own cancellation is not the followers': they take over instead.
+            error = turn.get("error")
+            if not turn.get("completed") and (error is None or error.startswith("Cancelled")):
+                error = SingleFlight.ABANDONED
+            self.in_flight.finish(flight_key, flight, error=error)
+
+    def chat_buffered(self, user_input: str, request_id: str = None, cancel: CancelToken = None,
+                      flush_chars: int = 64, flush_interval: float = 0.05) -> StreamBuffer:
+        """
+        Runs chat() on a background thread into a StreamBuffer (v0.10.0), so several
+        readers (e.g. a client and a transcript writer) can subscribe to one turn.
+        Cache fill, verification and logging still run inside chat() as usual.
+        Readers that stop early do not stop the turn; use `cancel` for that.
+        """
+        buffer = StreamBuffer(flush_chars, flush_interval)
+
+        def pump():
+            error = None
+            try:
+                for chunk in self.chat(user_input, request_id, cancel):
+                    buffer.publish(chunk)
+            except Exception as e:
+                error = str(e)
+            finally:
+                buffer.close(error)
+
+        threading.Thread(target=pump, daemon=True).start()
+        return buffer
+
+    def _admit(self, user_input: str, turn: Dict) -> Optional[str]:
+        """
+        Charges the session and global buckets for this turn's estimated cost.
+        Returns a busy reply (and logs the shed turn) when either is exhausted.
+        """
+        expected_output = self.admission.expected_output
+        if self.scheduler:
+            expected_output = self.scheduler.expected_tokens(turn["intent"])
+        turn["admitted_output_tokens"] = expected_output
+        # Charge the prompt the model will read (system prompt, pinned entries, history window), not just the new message
+        _, window = self.history_window.select(self.history, self.pinned)
+        admitted, busy = self.admission.admit(self.session_id, window["tokens"] + expected_output)
+        if admitted:
+            return None
+
+        # Structured for front-ends (e.g. HTTP 429 + Retry-After); the text is for the CLI
+        self.last_busy = busy
+        busy_reply = f"[System Busy: ViNNi is at capacity ({busy['reason']} limit). Please retry in {busy['retry_after']:.1f}s.]"
+        self.history.pop()  # The turn never reached the model
+        self._log_turn(user_input, turn, busy_reply, {"name": "admission", "reason": busy["reason"]}, shed=True)
+        return busy_reply
+
+    def _follow_flight(self, user_input: str, turn: Dict, flight, flight_key: str):
+        response = []
+        try:
+            for chunk in flight.subscribe():
+                turn["cancel"].check()
+                response.append(chunk)
+                yield chunk
+        except TurnCancelled as e:
+            # Only this follower stops; the leader's generation is unaffected
+            self._cancel_turn(user_input, turn, "".join(response), e.reason)
+            yield f"\n[Cancelled: {e.reason}]"
+            return
+        except GeneratorExit:
+            self._cancel_turn(user_input, turn, "".join(response), "closed")
+            raise
+
+        if flight.error == SingleFlight.ABANDONED:
+            # The leader's client went away: regenerate here (leading any other followers)
+            if response:
+                yield "\n[Interrupted: the shared answer was abandoned by its requester; regenerating]\n"
+            yield from self._lead_flight(user_input, turn, flight_key)
+            return
+        if flight.error:
+            # Leader failed and its error chunk was replayed; the turn never got an answer
+            turn["error"] = flight.error
+            if self.history[-1]['role'] == 'user':
+                self.history.pop()
+            self._log_turn(user_input, turn, "".join(response), {"name": "cache", "source": "inflight", "error": flight.error})
+            return
+        full_response = "".join(response)
+        self.history.append(Message('assistant', full_response))
+        self._log_turn(user_input, turn, full_response, {"name": "cache", "source": "inflight"}, cache_hit=True)
+
+    def _cancel_turn(self, user_input: str, turn: Dict, partial: str, reason: str):
+        """Records a turn stopped by its CancelToken or by the consumer closing the stream."""
+        turn["error"] = f"Cancelled: {reason}"
+        if partial:
+            # Keep what the user already saw, so the next turn has consistent context
+            if self.history[-1]['role'] == 'assistant':
+                self.history[-1]['content'] = partial
+            else:
+                self.history.append(Message('assistant', partial))
+        elif self.history[-1]['role'] == 'user':
+            self.history.pop()
+        self._log_turn(user_input, turn, partial, {"name": self.model_name, "options": self.options, "reason": reason}, cancelled=True)
+        if "admitted_output_tokens" in turn:
+            self.admission.settle(self.session_id, self.last_turn_tokens - turn["admitted_output_tokens"])
+
+    def _degraded_reply(self, user_input: str, turn: Dict, engine_data, assumptions: List[str]) -> Generator[str, None, None]:
+        """
+        Answers without the model while the breaker is open (v0.10.0).
+        Math turns whose parameters are already known (follow-ups, cached extractions)
+        get the deterministic engine result; anything else fails fast.
+        """
+        if engine_data:
+            reply = (
+                "[Degraded Mode: the language model is unavailable, so here is the math engine result directly.]\n"
+                f"{json.dumps(engine_data, indent=2)}\n"
+                + (f"Assumptions: {', '.join(assumptions)}.\n" if assumptions else "")
+                + "[Confidence: 1.0 (Deterministic Math)]"
             )
-            
-            for chunk in stream:
-                content = chunk['message']['content']
-                full_response += content
-                yield content
+            self.history.append(Message('assistant', reply))
+            turn["completed"] = True
+        else:
+            reply = f"[System Unavailable: the language model is not responding. Please retry in {self.breaker.retry_after():.0f}s.]"
+            self.history.pop()  # The turn never reached the model
+            turn["error"] = "Circuit open"
+        yield reply
+        # Not cached: the next healthy turn should get a full answer
+        self._log_turn(user_input, turn, reply, {"name": "degraded", "breaker": self.breaker.state}, degraded=True)
+        if "admitted_output_tokens" in turn:
+            self.admission.settle(self.session_id, self.last_turn_tokens - turn["admitted_output_tokens"])
+
+    def _generate(self, user_input: str, turn: Dict) -> Generator[str, None, None]:
+        """Math engine, model stream, verifier, snapshot/cache fill and logging for a cache miss."""
+        cancel = turn["cancel"]
+        parts: List[str] = []  # v0.10.0: Joined once, not re-concatenated per token
+        full_response = ""
+        stream = None
+        
+        try:
+            # 3.5 Math Engine Intercept (v0.3.0)
+            cancel.check()
+            math_result_pkg = self._process_math_request(user_input, turn["intent"], followup_params=turn["followup_params"])
+            engine_data, assumptions = self._inject_math_context(math_result_pkg)
+            turn["engine"] = engine_data is not None
+
+            # v0.10.0: Degraded mode while the breaker is open (no model call, no slot wait)
+            if self.breaker and not self.breaker.allow():
+                yield from self._degraded_reply(user_input, turn, engine_data, assumptions)
+                return
+
+            # v0.10.0: Wait for a generation slot (bounded by the turn deadline)
+            cancel.check()
+            ticket = None
+            if self.scheduler:
+                try:
+                    ticket = self.scheduler.acquire(turn["intent"], timeout=cancel.remaining())
+                except TimeoutError:
+                    raise TurnCancelled("deadline")
+            try:
+                started = time.time()
+                first_token = False
+                try:
+                    stream = self.client.chat(
+                        model=self.model_name,
+                        messages=self._history_messages(turn),
+                        options=self.options,
+                        stream=True,
+                        **self._keep_alive()
+                    )
+                    if cancel.deadline is not None:
+                        # The deadline also fires while the model is stalled between chunks
+                        stream = watch(stream, cancel)
+
+                    for chunk in stream:
+                        if not first_token and self.breaker:
+                            # First-token latency is the breaker's health signal for streams
+                            self.breaker.record_success((time.time() - started) * 1000)
+                        first_token = True
+                        if chunk.get('done') and chunk.get('load_duration'):
+                            # v0.10.0: Model load time (cold start) for this turn, in the audit log
+                            turn["load_ms"] = round(chunk['load_duration'] / 1e6, 2)
+                            if self.lifecycle:
+                                self.lifecycle.record_load(self.model_name, chunk['load_duration'], "chat")
+                        content = chunk['message']['content']
+                        parts.append(content)
+                        yield content
+                        cancel.check()
+                except TurnCancelled:
+                    raise
+                except Exception:
+                    if self.breaker:
+                        self.breaker.record_failure()
+                    raise
+                if not first_token and self.breaker:
+                    self.breaker.record_success((time.time() - started) * 1000)
+
+                full_response = "".join(parts)
+                if ticket:
+                    ticket.output_tokens = self._estimate_tokens(full_response)
+            finally:
+                # Released when the stream ends, fails or is abandoned
+                if ticket:
+                    self.scheduler.release(ticket)
                 
-            self.history.append({'role': 'assistant', 'content': full_response})
+            self.history.append(Message('assistant', full_response))
             
-            # v0.4.0 MathVerifier (Post-Generation Check)
-            # Only verify if we triggered Math Engine OR if "probability"/"calculate" in query
-            triggers = ["loan", "interest", "annuity", "bond", "blackjack", "probability", "calculate"]
-            if any(t in user_input.lower() for t in triggers):
-                 from vinni.verifier import MathVerifier
-                 verifier = MathVerifier(model_name=self.model_name)
-                 v_result = verifier.verify(user_input, full_response)
-                 
-                 if v_result.get("status") == "FAIL":
-                      rule_id = v_result.get("rule_id", "MV-XXX")
-                      severity = v_result.get("severity", "HARD")
-                      warning = f"\n\n⚠️ [MathVerifier] {rule_id} ({severity}): {v_result.get('reason')} RESULT IS INVALID."
+            # v0.4.0 MathVerifier (Post-Generation Check), skipped once nobody is reading
+            cancel.check()
+            if self._needs_verification(user_input):
+                 warning = self._verification_warning(self.verifier.verify(user_input, full_response))
+                 if warning:
                       yield warning
                       full_response += warning
                       # Update history with warning included?
                       self.history[-1]['content'] = full_response
-                      
-            # v0.9.0 Regression Snapshot
-            if engine_data:
-                 from vinni.snapshot import RegressionSnapshot
-                 RegressionSnapshot.save(
-                     question=user_input,
-                     engine_input=intent_info, # Log extracted data
-                     engine_output=engine_data,
-                     final_response=full_response,
-                     model_config={"name": self.model_name, "ver": self.prompt_version},
-                     assumptions=assumptions
-                 )
-            
-            # Update Cache (v0.2.4 Segmented LRU)
-            limit = self.cache_limits.get(predicted_intent, 50)
-            if len(target_cache) >= limit:
-                # Remove oldest (Next iter on dict returns first key)
-                target_cache.pop(next(iter(target_cache)))
             
-            target_cache[cache_key] = full_response
-            
-            # 4. Observability
-            latency = (time.time() - start_time) * 1000
-            output_tokens = self._estimate_tokens(full_response)
-            self.last_turn_tokens = output_tokens
-            
-            SecurityLogger.log_turn(
-                session_id=self.session_id,
-                request_id=request_id,
-                model={"name": self.model_name, "options": self.options},
-                system_info={"name": "ViNNi", "version": self.prompt_version, "system_prompt_hash": self.prompt_hash},
-                user_input=user_input,
-                input_tokens=input_tokens,
-                intent_info=intent_info,
-                output=full_response,
-                output_tokens=output_tokens,
-                latency_ms=latency,
-                flags={"asked_clarification": False, "refusal": False, "static_response": False, "cache_hit": False},
-                input_hash=input_hash
-            )
+            cancel.check()
+            self._finish_generation(user_input, full_response, turn, engine_data, assumptions)
+            model = {"name": self.model_name, "options": self.options}
+            if "load_ms" in turn:
+                model["load_ms"] = turn["load_ms"]
+            model["context"] = turn["history"]
+            self._log_turn(user_input, turn, full_response, model)
+            turn["completed"] = True
+            self._maybe_compact()
+            if "admitted_output_tokens" in turn:
+                # Settle the estimate against the real output length
+                self.admission.settle(self.session_id, self.last_turn_tokens - turn["admitted_output_tokens"])
             
+        except TurnCancelled as e:
+            self._cancel_turn(user_input, turn, full_response or "".join(parts), e.reason)
+            yield f"\n[Cancelled: {e.reason}]"
+        except GeneratorExit:
+            # Consumer closed us (client disconnect / Ctrl-C): no verifier, snapshot or cache fill
+            self._cancel_turn(user_input, turn, full_response or "".join(parts), "closed")
+            raise
+        except KeyboardInterrupt:
+            # Ctrl-C while this generator was running (e.g. blocked on the model): record the turn, then let the CLI handle it
+            self._cancel_turn(user_input, turn, full_response or "".join(parts), "interrupted")
+            raise
         except Exception as e:
+            turn["error"] = str(e)
             yield f"\n[System Error: {str(e)}]"
+        finally:
+            if hasattr(stream, "close"):
+                # Closing the ollama generator closes its HTTP response (a watched stream's reader does it)
+                stream.close()
             
     def get_last_intent(self, user_input: str) -> str:
         # Compatibility wrapper for CLI
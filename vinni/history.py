@@ -0,0 +1,129 @@
+import sys
+from collections.abc import Mapping
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Ollama's num_ctx when the request options do not set one
+DEFAULT_NUM_CTX = 2048
+# Room left for the reply when num_predict is unbounded
+DEFAULT_RESERVE_OUTPUT = 512
+
+
+class Message(Mapping):
+    """
+    One history entry (v0.10.0), in slots instead of a dict.
+    Roles are interned, and context injected into a turn (math engine results)
+    is kept apart from what the user typed. It reads like {'role', 'content'},
+    with content joined only when asked for, so the history goes to Ollama as is
+    and `history[-1]['content']` keeps working. Assigning content replaces both parts.
+    """
+    __slots__ = ("role", "text", "context")
+    KEYS = ("role", "content")
+
+    def __init__(self, role: str, content: str, context: Optional[str] = None):
+        self.role = sys.intern(role)
+        self.text = content
+        self.context = context
+
+    @property
+    def content(self) -> str:
+        return f"{self.text}\n\n{self.context}" if self.context else self.text
+
+    def __getitem__(self, key: str) -> str:
+        if key == "role":
+            return self.role
+        if key == "content":
+            return self.content
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: str):
+        if key == "role":
+            self.role = sys.intern(value)
+        elif key == "content":
+            self.text = value
+            self.context = None
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __repr__(self) -> str:
+        return f"Message(role={self.role!r}, content={self.content!r})"
+
+    def to_record(self) -> Dict[str, str]:
+        """Plain dict for storage; `context` only when there is one."""
+        record = {"role": self.role, "content": self.text}
+        if self.context:
+            record["context"] = self.context
+        return record
+
+    @classmethod
+    def from_record(cls, record: Dict[str, str]) -> "Message":
+        return cls(record["role"], record["content"], record.get("context"))
+
+    def memory_size(self) -> int:
+        # Interned roles are shared by every message, so they are not counted
+        return sys.getsizeof(self) + sys.getsizeof(self.text) + (sys.getsizeof(self.context) if self.context else 0)
+
+
+class HistoryWindow:
+    """
+    Token-budgeted view of a conversation (v0.10.0).
+    Selects what is sent to the model each turn: the system prompt, any pinned
+    messages, then the most recent messages (newest first, contiguous) while they
+    fit in `max_tokens`. The current message is always sent. The budget defaults
+    to the model's num_ctx minus room for the reply, so Ollama never truncates
+    the prompt on its own. History itself is left untouched.
+    """
+    def __init__(self, max_tokens: Optional[int] = None, num_ctx: int = DEFAULT_NUM_CTX,
+                 reserve_output: int = DEFAULT_RESERVE_OUTPUT, estimate: Callable[[str], int] = None):
+        self.max_tokens = max_tokens if max_tokens is not None else max(0, num_ctx - reserve_output)
+        self.estimate = estimate or (lambda text: len(text) // 4)
+
+    @classmethod
+    def for_options(cls, options: Dict = None, max_tokens: Optional[int] = None) -> "HistoryWindow":
+        """Budget from the request options ("num_ctx", and "num_predict" when it is bounded)."""
+        options = options or {}
+        num_predict = options.get("num_predict") or 0
+        reserve = num_predict if num_predict > 0 else DEFAULT_RESERVE_OUTPUT
+        return cls(max_tokens=max_tokens, num_ctx=options.get("num_ctx") or DEFAULT_NUM_CTX, reserve_output=reserve)
+
+    def select(self, history: List[Dict], pinned: List[Dict] = ()) -> Tuple[List[Dict], Dict[str, int]]:
+        """
+        Returns (messages, report). `pinned` holds message objects from `history`.
+        report: {"messages", "tokens", "dropped_messages", "dropped_tokens"}.
+        """
+        if not history:
+            return [], {"messages": 0, "tokens": 0, "dropped_messages": 0, "dropped_tokens": 0}
+
+        costs = [self.estimate(m['content']) for m in history]
+        keep = [False] * len(history)
+        used = 0
+
+        # Always sent: the system prompt, pinned messages and the current message
+        pinned_ids = {id(m) for m in pinned}
+        for i, message in enumerate(history):
+            if (i == 0 and message['role'] == 'system') or id(message) in pinned_ids or i == len(history) - 1:
+                keep[i] = True
+                used += costs[i]
+
+        # Then the most recent turns, stopping at the first one that does not fit
+        for i in range(len(history) - 2, -1, -1):
+            if keep[i]:
+                continue
+            if used + costs[i] > self.max_tokens:
+                break
+            keep[i] = True
+            used += costs[i]
+
+        messages = [m for m, k in zip(history, keep) if k]
+        dropped = [c for c, k in zip(costs, keep) if not k]
+        return messages, {
+            "messages": len(messages),
+            "tokens": used,
+            "dropped_messages": len(dropped),
+            "dropped_tokens": sum(dropped)
+        }
@@ -0,0 +1,118 @@
+import threading
+import time
+import ollama
+from typing import Dict, List, Optional, Union
+
+KeepAlive = Union[str, int, float]
+
+class ModelLifecycle:
+    """
+    Keeps the models we expect traffic for resident in Ollama (v0.10.0).
+    - warm(): loads a model and prefills the system prompt, so the first real
+      turn pays neither the model load nor the system prompt prefill.
+    - keep_alive_for(): the keep_alive every request for that model should send
+      (Ollama otherwise unloads after its 5 minute default).
+    - start(): pings expected models every `ping_interval` seconds.
+    Every load_duration Ollama reports is recorded; a load above
+    `cold_threshold_ms` counts as a cold start.
+    """
+    def __init__(self, client=None, keep_alive: Dict[str, KeepAlive] = None, default_keep_alive: KeepAlive = "30m",
+                 ping_interval: float = 240.0, cold_threshold_ms: float = 500.0, history: int = 50):
+        self.client = client or ollama
+        self.keep_alive = dict(keep_alive or {})
+        self.default_keep_alive = default_keep_alive
+        self.ping_interval = ping_interval
+        self.cold_threshold_ms = cold_threshold_ms
+        self.history = history
+        self._expected: Dict[str, Dict] = {}
+        self._loads: Dict[str, List[Dict]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._pinger = None
+
+    def keep_alive_for(self, model: str) -> KeepAlive:
+        return self.keep_alive.get(model, self.default_keep_alive)
+
+    def record_load(self, model: str, load_duration_ns: Optional[int], source: str) -> Optional[float]:
+        """Stores a load_duration (ns, as Ollama reports it). Returns it in ms."""
+        if load_duration_ns is None:
+            return None
+        load_ms = load_duration_ns / 1e6
+        with self._lock:
+            loads = self._loads.setdefault(model, [])
+            loads.append({"at": time.time(), "load_ms": round(load_ms, 2), "source": source,
+                          "cold": load_ms >= self.cold_threshold_ms})
+            del loads[:-self.history]
+        return load_ms
+
+    def expect(self, model: str, system_prompt: str = "", options: Dict = None):
+        """Registers a model (and its system prompt) for periodic pings."""
+        with self._lock:
+            self._expected[model] = {"system_prompt": system_prompt, "options": options or {}}
+
+    def warm(self, model: str, system_prompt: str = "", options: Dict = None) -> Optional[float]:
+        """
+        Loads `model` and, if given, prefills `system_prompt` into Ollama's prompt cache.
+        Returns the load time in ms (about 0 when it was already resident), or None on failure.
+        """
+        self.expect(model, system_prompt, options)
+        try:
+            if system_prompt:
+                # Same options as real turns (num_ctx etc.) or Ollama reloads the model for them
+                resp = self.client.chat(
+                    model=model,
+                    messages=[{'role': 'system', 'content': system_prompt}],
+                    options={**(options or {}), "num_predict": 1},
+                    keep_alive=self.keep_alive_for(model)
+                )
+            else:
+                resp = self.client.generate(model=model, prompt="", keep_alive=self.keep_alive_for(model))
+        except Exception as e:
+            print(f"[DEBUG] Model Warm-up Failed ({model}): {e}")
+            return None
+        return self.record_load(model, resp.get('load_duration'), "warmup")
+
+    def ping(self, model: str) -> Optional[float]:
+        """Cheap keep-alive: an empty generate loads the model if needed and resets its timer."""
+        try:
+            resp = self.client.generate(model=model, prompt="", keep_alive=self.keep_alive_for(model))
+        except Exception as e:
+            print(f"[DEBUG] Model Ping Failed ({model}): {e}")
+            return None
+        load_ms = self.record_load(model, resp.get('load_duration'), "ping")
+        if load_ms is not None and load_ms >= self.cold_threshold_ms:
+            # The model had been unloaded anyway; prefill the system prompt again
+            expected = self._expected.get(model) or {}
+            if expected.get("system_prompt"):
+                self.warm(model, expected["system_prompt"], expected.get("options"))
+        return load_ms
+
+    def start(self):
+        if self._pinger is None:
+            self._pinger = threading.Thread(target=self._ping_loop, daemon=True)
+            self._pinger.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _ping_loop(self):
+        while not self._stop.wait(self.ping_interval):
+            with self._lock:
+                models = list(self._expected)
+            for model in models:
+                self.ping(model)
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            out = {}
+            for model in set(self._expected) | set(self._loads):
+                loads = self._loads.get(model, [])
+                cold = [l for l in loads if l["cold"]]
+                out[model] = {
+                    "keep_alive": self.keep_alive_for(model),
+                    "loads": len(loads),
+                    "cold_starts": len(cold),
+                    "last_load_ms": loads[-1]["load_ms"] if loads else None,
+                    "max_load_ms": max((l["load_ms"] for l in loads), default=None)
+                }
+            return out
@@ -1,9 +1,68 @@
 import math
+import functools
+import inspect
 from decimal import Decimal, getcontext
+from vinni.cache import LRUCache
 
 # Set precision high
 getcontext().prec = 28
 
+# v0.10.0: Process-wide memo of engine results, keyed on canonicalized inputs.
+# Shared by every ChatBot/session in the process; results are plain dicts of numbers.
+ENGINE_MEMO = LRUCache(max_entries=2048)
+
+# Spellings the frequency map already treats as the same schedule
+FREQ_ALIASES = {"bi-weekly": "biweekly"}
+
+def _canonical_freq(value: str) -> str:
+    # "Bi-Weekly", "bi-weekly" and "biweekly" are one schedule; so are "monthly" and "monthly compounded"
+    freq = value.strip().lower().replace(" compounded", "")
+    return FREQ_ALIASES.get(freq, freq)
+
+def _canonical(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float, Decimal)):
+        # 300000, 300000.0 and Decimal("300000") are the same input
+        return repr(float(value))
+    if isinstance(value, str):
+        return value.strip()
+    return repr(value)
+
+def _display(value) -> str:
+    # Formula text: equal inputs read the same, and whole numbers print without ".0"
+    number = float(value)
+    return str(int(number)) if number.is_integer() else repr(number)
+
+def memoized(func):
+    """
+    Caches a deterministic engine function on its canonicalized arguments (v0.10.0).
+    Positional and keyword calls, omitted defaults and frequency spellings
+    (`*_freq` arguments) map to the same key.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = func.__qualname__ + "|" + "|".join(
+            f"{k}={_canonical_freq(v) if k.endswith('_freq') and isinstance(v, str) else _canonical(v)}"
+            for k, v in bound.arguments.items()
+        )
+        cached = ENGINE_MEMO.get(key)
+        if cached is not None:
+            return dict(cached)
+        result = func(*args, **kwargs)
+        ENGINE_MEMO.put(key, result)
+        return dict(result)
+
+    return wrapper
+
+def engine_memo_stats() -> dict:
+    """Hit/miss/eviction counters of the shared engine memo."""
+    return ENGINE_MEMO.stats()
+
 class ProbabilityEngine:
     @staticmethod
     def combinations(n: int, k: int) -> int:
@@ -18,6 +77,7 @@ class ProbabilityEngine:
         return n ** k
 
     @staticmethod
+    @memoized
     def solve_blackjack_probability() -> dict:
         """Deterministic solution for Blackjack (2 cards)."""
         # C(52, 2)
@@ -34,7 +94,7 @@ class ProbabilityEngine:
 
 class FinanceEngine:
     @staticmethod
-    @staticmethod
+    @memoized
     def calculate_loan_interest(principal: float, annual_rate: float, months: int, payment_freq: str = "monthly", compounding_freq: str = "monthly", extra_payment: float = 0.0) -> dict:
         """
         Amortization calc with support for:
@@ -52,8 +112,11 @@ class FinanceEngine:
             "semi-annually": 2, "annually": 1
         }
         
-        p_freq = FREQ_MAP.get(payment_freq.lower(), 12)
-        c_freq = FREQ_MAP.get(compounding_freq.lower().replace(" compounded", ""), 12) # Robust key
+        # v0.10.0: Canonical labels, so memoized results read the same for every spelling
+        payment_freq = _canonical_freq(payment_freq)
+        compounding_freq = _canonical_freq(compounding_freq)
+        p_freq = FREQ_MAP.get(payment_freq, 12)
+        c_freq = FREQ_MAP.get(compounding_freq, 12) # Robust key
         
         # Calculate Number of Payments (n)
         term_years = Decimal(months) / 12
@@ -144,6 +207,7 @@ class FinanceEngine:
         }
 
     @staticmethod
+    @memoized
     def calculate_annuity(payment: float, rate: float, years: int, type: str = "ordinary") -> dict:
         """
         FV of Annuity.
@@ -164,6 +228,7 @@ class FinanceEngine:
         }
 
     @staticmethod
+    @memoized
     def calculate_bond(face: float, coupon_rate: float, ytm: float, years: int, freq: int = 1) -> dict:
         """
         Bond Price.
@@ -189,6 +254,7 @@ class FinanceEngine:
         }
 
     @staticmethod
+    @memoized
     def calculate_compound_interest(principal: float, rate_annual: float, years: int, freq: int = 1) -> dict:
         """
         Compound Interest: A = P(1 + r/n)^(nt)
@@ -207,5 +273,6 @@ class FinanceEngine:
             "principal": float(round(P, 2)),
             "future_value": float(round(amount, 2)),
             "total_interest": float(round(interest, 2)),
-            "formula": f"A = {P} * (1 + {rate_annual}/{freq})^({freq}*{years})"
+            # 1000 and 1000.0 share one memo entry, so they must print the same formula
+            "formula": f"A = {_display(principal)} * (1 + {_display(rate_annual)}/{_display(freq)})^({_display(freq)}*{_display(years)})"
         }
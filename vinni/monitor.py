@@ -17,7 +17,8 @@ import logging
 import hashlib
 import time
 import uuid
-from typing import Dict, Any
+from collections import Counter
+from typing import Dict, Any, List
 
 # Configure structured logger
 logger = logging.getLogger("vinni_audit")
@@ -165,8 +166,93 @@ class SecurityLogger:
                 "asked_clarification": False,
                 "refusal": False,
                 "static_response": False,
-                "cache_hit": False
+                "cache_hit": False,
+                "shed": False,      # v0.10.0: Rejected by admission control, no generation
+                "cancelled": False, # v0.10.0: Stopped by client/deadline; output is partial
+                "degraded": False,  # v0.10.0: Answered without the model (circuit breaker open)
+                "followup": False   # v0.10.0: Math follow-up on this session's loan; not reusable elsewhere
             }
         }
         
         logger.info(json.dumps(entry))
+
+    @staticmethod
+    def top_turns(log_path: str, model_name: str, prompt_hash: str, top_n: int = 20) -> List[Dict[str, Any]]:
+        """
+        Reads the audit log and returns the most frequent generated turns (v0.10.0).
+        Only turns produced by `model_name` under `prompt_hash` are eligible, so
+        callers never replay answers from another model or system prompt.
+        Frequency counts every logged request for the input (hits included).
+        Math follow-ups are skipped: their answers depend on the session's previous loan.
+        """
+        counts = Counter()
+        latest = {}
+
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                inp_hash = entry.get("input_hash")
+                system = entry.get("system") or {}
+                if not inp_hash or system.get("system_prompt_hash") != prompt_hash:
+                    continue
+                counts[inp_hash] += 1
+
+                flags = entry.get("flags") or {}
+                model = entry.get("model") or {}
+                if flags.get("static_response") or flags.get("cache_hit") or flags.get("cancelled") or flags.get("followup") or model.get("name") != model_name:
+                    continue
+
+                output = entry.get("output") or {}
+                if not output.get("text"):
+                    continue
+                # Later lines win: keep the most recent answer per input
+                latest[inp_hash] = {
+                    "input_hash": inp_hash,
+                    "intent": entry.get("intent", "CHAT"),
+                    "output": output["text"]
+                }
+
+        ranked = [latest[h] for h, _ in counts.most_common() if h in latest]
+        return ranked[:top_n]
+
+    @staticmethod
+    def output_lengths(log_path: str) -> Dict[str, float]:
+        """
+        Mean generated output length in tokens per intent, from the audit log (v0.10.0).
+        Static and cached turns are skipped (they cost no generation). Early log lines
+        only carry `output_len` in characters; those are converted at ~4 chars/token.
+        """
+        totals = Counter()
+        counts = Counter()
+
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                flags = entry.get("flags") or {}
+                if flags.get("static_response") or flags.get("cache_hit") or flags.get("shed") or flags.get("cancelled") or entry.get("cache_hit"):
+                    continue
+
+                output = entry.get("output")
+                if isinstance(output, dict):
+                    tokens = output.get("tokens")
+                else:
+                    tokens = entry.get("output_len", 0) // 4 if entry.get("output_len") else None
+                if tokens is None:
+                    continue
+
+                intent = entry.get("intent", "CHAT")
+                if isinstance(intent, dict):
+                    # v0.1.4 lines logged the full tagger output here
+                    intent = intent.get("predicted", "CHAT")
+                totals[intent] += tokens
+                counts[intent] += 1
+
+        return {intent: totals[intent] / counts[intent] for intent in counts}
@@ -0,0 +1,137 @@
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+class _Ticket:
+    """One turn waiting for (or holding) a generation slot."""
+    __slots__ = ("intent", "seq", "enqueued_at", "granted", "output_tokens")
+
+    def __init__(self, intent: str, seq: int):
+        self.intent = intent
+        self.seq = seq
+        self.enqueued_at = time.time()
+        self.granted = False
+        self.output_tokens = None  # Set by the caller before release (feeds the SJF estimate)
+
+
+class IntentScheduler:
+    """
+    Intent-aware admission to the Ollama backend (v0.10.0).
+    One FIFO queue per intent. When a slot frees, the next turn is the head of
+    the queue with the best (priority, expected output tokens) among intents
+    still under their own slot cap. Expected lengths start from the audit log
+    and follow observed generations, so short CHAT turns are not stuck behind
+    a long ANALYSIS/DOCUMENT essay. Waiting turns age into better priority so
+    long jobs cannot starve.
+    """
+    # COMPACT: background history summaries (HistoryCompactor), behind every user turn
+    DEFAULT_PRIORITIES = {"CHAT": 0, "CODE": 1, "ANALYSIS": 1, "DOCUMENT": 1, "COMPACT": 2}
+    # Long-form intents may hold at most one slot, leaving room for short turns
+    DEFAULT_SLOTS = {"ANALYSIS": 1, "DOCUMENT": 1, "COMPACT": 1}
+    DEFAULT_EXPECTED = 150.0
+
+    def __init__(self, max_concurrent: int = 2, priorities: Dict[str, int] = None, slots: Dict[str, int] = None,
+                 sjf: bool = True, expected_tokens: Dict[str, float] = None, aging: float = 30.0,
+                 smoothing: float = 0.2):
+        self.max_concurrent = max_concurrent
+        self.priorities = dict(self.DEFAULT_PRIORITIES if priorities is None else priorities)
+        self.slots = dict(self.DEFAULT_SLOTS if slots is None else slots)
+        self.sjf = sjf
+        self.expected = dict(expected_tokens or {})
+        self.aging = aging          # Seconds of waiting worth one priority level (0 disables)
+        self.smoothing = smoothing  # EMA weight of each observed generation
+        self._queues: Dict[str, deque] = {}
+        self._running: Dict[str, int] = {}
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self.admitted: Dict[str, int] = {}
+        self.wait_ms: Dict[str, float] = {}
+
+    @classmethod
+    def from_log(cls, log_path: str = "vinni.log", **kwargs) -> "IntentScheduler":
+        """Seeds the per-intent SJF estimates from historical output lengths."""
+        from vinni.monitor import SecurityLogger
+        try:
+            expected = SecurityLogger.output_lengths(log_path)
+        except OSError:
+            expected = {}
+        expected.update(kwargs.pop("expected_tokens", None) or {})
+        return cls(expected_tokens=expected, **kwargs)
+
+    def expected_tokens(self, intent: str) -> float:
+        return self.expected.get(intent, self.DEFAULT_EXPECTED)
+
+    def _rank(self, ticket: _Ticket, now: float):
+        priority = self.priorities.get(ticket.intent, max(self.priorities.values(), default=0))
+        if self.aging:
+            priority -= (now - ticket.enqueued_at) / self.aging
+        return (priority, self.expected_tokens(ticket.intent) if self.sjf else 0.0, ticket.seq)
+
+    def _dispatch(self):
+        # Caller holds self._cond
+        now = time.time()
+        while sum(self._running.values()) < self.max_concurrent:
+            heads = [
+                q[0] for intent, q in self._queues.items()
+                if q and self._running.get(intent, 0) < self.slots.get(intent, self.max_concurrent)
+            ]
+            if not heads:
+                return
+            ticket = min(heads, key=lambda t: self._rank(t, now))
+            self._queues[ticket.intent].popleft()
+            ticket.granted = True
+            self._running[ticket.intent] = self._running.get(ticket.intent, 0) + 1
+            self.admitted[ticket.intent] = self.admitted.get(ticket.intent, 0) + 1
+            self.wait_ms[ticket.intent] = self.wait_ms.get(ticket.intent, 0.0) + (now - ticket.enqueued_at) * 1000
+            self._cond.notify_all()
+
+    def acquire(self, intent: str, timeout: Optional[float] = None) -> _Ticket:
+        """Blocks until `intent` may start a generation. Raises TimeoutError after `timeout` seconds."""
+        deadline = time.time() + timeout if timeout is not None else None
+        with self._cond:
+            ticket = _Ticket(intent, next(self._seq))
+            self._queues.setdefault(intent, deque()).append(ticket)
+            self._dispatch()
+            while not ticket.granted:
+                remaining = deadline - time.time() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    self._queues[intent].remove(ticket)
+                    raise TimeoutError(f"No generation slot for {intent} within {timeout}s")
+                self._cond.wait(remaining)
+                # Aging may have changed the order while we slept
+                self._dispatch()
+            return ticket
+
+    def release(self, ticket: _Ticket):
+        with self._cond:
+            self._running[ticket.intent] -= 1
+            if ticket.output_tokens is not None:
+                previous = self.expected.get(ticket.intent)
+                self.expected[ticket.intent] = ticket.output_tokens if previous is None else \
+                    (1 - self.smoothing) * previous + self.smoothing * ticket.output_tokens
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, intent: str, timeout: Optional[float] = None):
+        ticket = self.acquire(intent, timeout)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._cond:
+            intents = set(self._queues) | set(self.expected) | set(self.priorities)
+            return {
+                intent: {
+                    "waiting": len(self._queues.get(intent, ())),
+                    "running": self._running.get(intent, 0),
+                    "admitted": self.admitted.get(intent, 0),
+                    "mean_wait_ms": round(self.wait_ms.get(intent, 0.0) / self.admitted[intent], 2) if self.admitted.get(intent) else 0.0,
+                    "expected_tokens": round(self.expected_tokens(intent), 1)
+                }
+                for intent in sorted(intents)
+            }
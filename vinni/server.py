@@ -0,0 +1,263 @@
+import argparse
+import json
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict
+from vinni.core import ChatBot
+from vinni.sessions import SessionStore, SessionTable, make_bot_factory
+from vinni.streaming import coalesce
+
+class ViNNiServer(ThreadingHTTPServer):
+    """
+    Multi-session HTTP front-end (v0.10.0).
+    One thread per connection; each session_id maps to its own ChatBot in a
+    SessionTable, and tokens are streamed to clients as Server-Sent Events.
+    """
+    daemon_threads = True
+
+    def __init__(self, address, bot_factory: Callable[[], ChatBot], idle_timeout: float = 1800.0,
+                 max_sessions: int = 1000, turn_wait: float = 30.0, store: SessionStore = None,
+                 on_release: Callable[[str, bool], None] = None):
+        super().__init__(address, ViNNiRequestHandler)
+        self.sessions = SessionTable(bot_factory, idle_timeout=idle_timeout, max_sessions=max_sessions, store=store,
+                                     on_release=on_release)
+        self.sessions.start()
+        self.turn_wait = turn_wait  # Seconds a request waits for its session's previous turn
+
+    def server_close(self):
+        self.sessions.stop()
+        super().server_close()
+
+
+class ViNNiRequestHandler(BaseHTTPRequestHandler):
+    """
+    Routes:
+      POST   /chat              {"message": "...", "session_id": optional, "stream": true}
+      GET    /health            Session table stats
+      GET    /sessions          Resident sessions and their memory use
+      DELETE /sessions/<id>     Drop a session (and its journal)
+    """
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Turns are audited through SecurityLogger; keep stderr quiet
+        pass
+
+    def _send_json(self, status: int, payload: Dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length).decode("utf-8"))
+
+    def _sse(self, data: Dict, event: str = None):
+        message = f"event: {event}\n" if event else ""
+        message += f"data: {json.dumps(data)}\n\n"
+        self.wfile.write(message.encode("utf-8"))
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "sessions": self.server.sessions.stats()})
+        elif self.path == "/sessions":
+            self._send_json(200, {"sessions": self.server.sessions.resident()})
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_DELETE(self):
+        if self.path.startswith("/sessions/"):
+            removed = self.server.sessions.remove(self.path[len("/sessions/"):])
+            self._send_json(200 if removed else 404, {"removed": removed})
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path != "/chat":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        try:
+            payload = self._read_json()
+        except (ValueError, UnicodeDecodeError):
+            self._send_json(400, {"error": "Body must be JSON."})
+            return
+        if not isinstance(payload, dict):
+            self._send_json(400, {"error": "Body must be a JSON object."})
+            return
+
+        message = payload.get("message")
+        message = message.strip() if isinstance(message, str) else ""
+        if not message:
+            self._send_json(400, {"error": "Field 'message' is required."})
+            return
+        session_id = payload.get("session_id")
+        if session_id is not None and not isinstance(session_id, str):
+            self._send_json(400, {"error": "Field 'session_id' must be a string."})
+            return
+
+        # Reuse the SecurityLogger request_id field so clients can find their turn in vinni.log
+        request_id = self.headers.get("X-Request-ID") or f"req-{uuid.uuid4().hex[:5]}"
+
+        # Leased: not evicted while this request waits for the session's previous turn
+        with self.server.sessions.lease(session_id) as session:
+            if not session.lock.acquire(timeout=self.server.turn_wait):
+                self._send_json(409, {"error": "Session is busy with another turn.", "session_id": session.session_id})
+                return
+            try:
+                self._run_turn(session, message, request_id, payload.get("stream", True))
+            finally:
+                self.server.sessions.commit(session)
+                session.touch()
+                session.lock.release()
+
+    def _run_turn(self, session, message: str, request_id: str, stream: bool):
+        if stream:
+            self._stream_turn(session, message, request_id)
+            return
+        response = "".join(session.bot.chat(message, request_id=request_id))
+        if getattr(session.bot, "last_busy", None):
+            self._send_busy(session, request_id)
+            return
+        self._send_json(200, {
+            "session_id": session.session_id,
+            "request_id": request_id,
+            "response": response,
+            "tokens": session.bot.last_turn_tokens
+        })
+
+    def _send_busy(self, session, request_id: str):
+        busy = session.bot.last_busy
+        body = json.dumps({"error": "busy", "session_id": session.session_id, "request_id": request_id, **busy}).encode("utf-8")
+        self.send_response(429)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Retry-After", str(max(1, int(round(busy["retry_after"])))))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_turn(self, session, message: str, request_id: str):
+        chunks = session.bot.chat(message, request_id=request_id)
+        # Pull the first chunk before committing to a 200 so shed turns can still answer 429
+        first = next(chunks, None)
+        if getattr(session.bot, "last_busy", None):
+            chunks.close()
+            self._send_busy(session, request_id)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        # No Content-Length: the stream ends when the connection closes
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        try:
+            self._sse({"session_id": session.session_id, "request_id": request_id}, event="meta")
+            if first is not None:
+                self._sse({"chunk": first})
+            # v0.10.0: One SSE event (one socket write) per coalesced batch instead of per token
+            for text in coalesce(chunks):
+                self._sse({"chunk": text})
+            self._sse({"tokens": session.bot.last_turn_tokens}, event="done")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away; stop consuming the generation
+            pass
+        finally:
+            chunks.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ViNNi multi-session HTTP/SSE server")
+    parser.add_argument("--model", default="llama3.1")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--prompt", default="prompts/system_v0.2.7.md")
+    parser.add_argument("--cache-path", default="vinni_cache.db")
+    parser.add_argument("--idle-timeout", type=float, default=1800.0, help="Seconds before an idle session is evicted")
+    parser.add_argument("--max-sessions", type=int, default=1000)
+    parser.add_argument("--max-concurrent", type=int, default=2,
+                        help="Concurrent generations admitted by the intent scheduler (0 = unscheduled)")
+    parser.add_argument("--session-rate", type=float, default=0,
+                        help="Per-session token budget refill (tokens/s, 0 = no admission control)")
+    parser.add_argument("--global-rate", type=float, default=400.0, help="Global token budget refill (tokens/s)")
+    parser.add_argument("--keep-alive", default="30m", help="Ollama keep_alive for the served model")
+    parser.add_argument("--session-store", default="vinni_sessions.db",
+                        help="SQLite journal that keeps conversations across evictions and restarts ('' to disable)")
+    parser.add_argument("--compact", action="store_true",
+                        help="Summarize old turns in the background once a session's history grows large")
+    parser.add_argument("--semantic-threshold", type=float, default=None,
+                        help="Serve paraphrases from the cache above this cosine similarity (needs numpy)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Worker processes (0 = run every session in this process)")
+    args = parser.parse_args()
+
+    from vinni.client import make_client
+    from vinni.lifecycle import ModelLifecycle
+    client = make_client(max_connections=args.max_concurrent * 2 + 4)
+    lifecycle = ModelLifecycle(client=client, default_keep_alive=args.keep_alive)
+
+    pool = None
+    if args.workers:
+        from vinni.workers import PooledBot, WorkerPool
+        # Each worker builds its own scheduler, admission, breaker, compactor, semantic index and journal from these
+        pool = WorkerPool(args.model, workers=args.workers, system_prompt_path=args.prompt,
+                          cache_path=args.cache_path, idle_timeout=args.idle_timeout, keep_alive=args.keep_alive,
+                          max_concurrent=args.max_concurrent, session_rate=args.session_rate,
+                          global_rate=args.global_rate, breaker=True, compact=args.compact,
+                          session_store=args.session_store or None, semantic_threshold=args.semantic_threshold)
+        factory = lambda: PooledBot(pool)
+        warm_bot = ChatBot(model_name=args.model, system_prompt_path=args.prompt, client=client, lifecycle=lifecycle)
+    else:
+        admission = None
+        if args.session_rate:
+            from vinni.admission import AdmissionController
+            admission = AdmissionController(session_rate=args.session_rate, global_rate=args.global_rate)
+        # One breaker per Ollama backend: every session fails fast together and recovers together
+        from vinni.breaker import CircuitBreaker
+        compactor = None
+        if args.compact:
+            from vinni.compaction import HistoryCompactor
+            compactor = HistoryCompactor(workers=max(1, args.max_concurrent // 2))
+        semantic_cache = None
+        if args.semantic_threshold is not None:
+            from vinni.cache import SemanticCache
+            # One paraphrase index for every session, over the shared cache segments
+            try:
+                semantic_cache = SemanticCache(threshold=args.semantic_threshold)
+            except ImportError as e:
+                print(f"[DEBUG] Semantic Cache Disabled: {e}")
+        factory = make_bot_factory(args.model, system_prompt_path=args.prompt, cache_path=args.cache_path,
+                                   max_concurrent=args.max_concurrent, admission=admission, breaker=CircuitBreaker(),
+                                   client=client, lifecycle=lifecycle, compactor=compactor,
+                                   semantic_cache=semantic_cache)
+        warm_bot = factory()
+
+    # Load the model + prefill the system prompt before the first request, then keep it resident
+    warm_bot.warm_model(background=True)
+    lifecycle.start()
+    # Worker processes own their sessions' history and journal it themselves
+    store = SessionStore(args.session_store) if args.session_store and not args.workers else None
+    server = ViNNiServer((args.host, args.port), factory, idle_timeout=args.idle_timeout,
+                         max_sessions=args.max_sessions, store=store,
+                         on_release=pool.drop_session if pool else None)
+    print(f"ViNNi server listening on http://{args.host}:{args.port} (model: {args.model})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+        lifecycle.stop()
+        if pool:
+            pool.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from vinni.cache import DiskCache
+from vinni.history import Message
+
+class Session:
+    """One conversation: its ChatBot plus bookkeeping for the session table (v0.10.0)."""
+    __slots__ = ("session_id", "bot", "lock", "created_at", "last_seen", "journaled", "leases")
+
+    def __init__(self, session_id: str, bot):
+        self.session_id = session_id
+        self.bot = bot
+        self.lock = threading.Lock()  # One turn at a time per conversation
+        self.created_at = time.time()
+        self.last_seen = self.created_at
+        self.leases = 0  # Callers between get_or_create() and release(); guarded by the table lock
+        self.journaled: List[Tuple[object, str, Optional[str]]] = []  # (message, text, context) already in the SessionStore
+
+    def touch(self):
+        self.last_seen = time.time()
+
+    def memory_bytes(self) -> int:
+        """Approximate size of the conversation held in RAM."""
+        history = getattr(self.bot, "history", None) or []
+        return sum(m.memory_size() if isinstance(m, Message) else sys.getsizeof(m) + sys.getsizeof(m['content'])
+                   for m in history)
+
+
+class SessionStore:
+    """
+    Durable conversations (v0.10.0).
+    An append-only journal in SQLite (WAL, like DiskCache): after each turn only
+    the new messages are appended. When earlier messages changed (compaction, tone
+    switch) a snapshot of the whole conversation is written instead and the
+    session's older records are dropped. A session is restored by replaying its
+    records from the latest snapshot.
+    """
+    def __init__(self, path: str = "vinni_sessions.db", timeout: float = 5.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS journal ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "session_id TEXT NOT NULL, "
+            "kind TEXT NOT NULL, "
+            "data TEXT NOT NULL, "
+            "created_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_journal_session ON journal (session_id, seq)")
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads; keep one per thread.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+            self._local.conn = conn
+        return conn
+
+    def sync(self, session_id: str, bot, journaled: List[Tuple]) -> List[Tuple]:
+        """
+        Journals what changed in `bot` since `journaled` (the previous return value).
+        Returns the new journaled list to pass next time.
+        Messages are compared by identity, parts included: an edit assigns new strings.
+        """
+        history = bot.history
+        unchanged = len(journaled) <= len(history) and all(
+            history[i] is m and m.text is text and m.context is context
+            for i, (m, text, context) in enumerate(journaled)
+        )
+        if unchanged and len(journaled) == len(history):
+            return journaled
+
+        state = bot.export_state()
+        conn = self._conn()
+        if unchanged:
+            state["messages"] = state["messages"][len(journaled):]
+            self._append(conn, session_id, "append", state)
+        else:
+            seq = self._append(conn, session_id, "snapshot", state)
+            conn.execute("DELETE FROM journal WHERE session_id = ? AND seq < ?", (session_id, seq))
+        conn.commit()
+        return [(m, m.text, m.context) for m in history]
+
+    def _append(self, conn: sqlite3.Connection, session_id: str, kind: str, state: Dict) -> int:
+        cursor = conn.execute(
+            "INSERT INTO journal (session_id, kind, data, created_at) VALUES (?, ?, ?, ?)",
+            (session_id, kind, json.dumps(state, default=str), time.time())
+        )
+        return cursor.lastrowid
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        """The session's state as export_state() returned it, or None if it was never journaled."""
+        rows = self._conn().execute(
+            "SELECT kind, data FROM journal WHERE session_id = ? AND seq >= "
+            "(SELECT COALESCE(MAX(seq), 0) FROM journal WHERE session_id = ? AND kind = 'snapshot') "
+            "ORDER BY seq", (session_id, session_id)
+        ).fetchall()
+        if not rows:
+            return None
+
+        state = {"messages": []}
+        for kind, data in rows:
+            record = json.loads(data)
+            messages = state["messages"] if kind == "append" else []
+            state = record
+            # Pins index the whole conversation, so they are already right after the merge
+            state["messages"] = messages + record["messages"]
+        return state
+
+    def delete(self, session_id: str) -> bool:
+        conn = self._conn()
+        deleted = conn.execute("DELETE FROM journal WHERE session_id = ?", (session_id,)).rowcount
+        conn.commit()
+        return deleted > 0
+
+    def session_count(self) -> int:
+        return self._conn().execute("SELECT COUNT(DISTINCT session_id) FROM journal").fetchone()[0]
+
+
+class SessionTable:
+    """
+    Maps session_id -> ChatBot for multi-session front-ends (v0.10.0).
+    Sessions idle longer than `idle_timeout` seconds are evicted by a sweeper
+    thread; when `max_sessions` is reached the least recently seen one is dropped.
+    With a `store`, turns are journaled by commit() and an evicted (or pre-restart)
+    session is restored from it on its next request.
+    `on_release(session_id, forget)` is called for every removed (forget=True) or
+    evicted session, for bots whose state lives elsewhere (worker processes).
+    """
+    def __init__(self, bot_factory: Callable[[], object], idle_timeout: float = 1800.0,
+                 max_sessions: int = 1000, sweep_interval: float = 60.0, store: SessionStore = None,
+                 on_release: Callable[[str, bool], None] = None):
+        self.bot_factory = bot_factory
+        self.store = store
+        self.on_release = on_release
+        self.restored = 0
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.sweep_interval = sweep_interval
+        self._sessions: Dict[str, Session] = {}
+        self._building: Dict[str, threading.Event] = {}  # Cold sessions being loaded and built
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sweeper = None
+        self.evictions = 0
+
+    def start(self):
+        if self._sweeper is None:
+            self._sweeper = threading.Thread(target=self._sweep_loop, daemon=True)
+            self._sweeper.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _sweep_loop(self):
+        while not self._stop.wait(self.sweep_interval):
+            self.evict_idle()
+
+    def get_or_create(self, session_id: Optional[str] = None) -> Session:
+        """
+        Returns the session (restored from the store or created if needed), leased to the
+        caller: it is not evicted until the matching release(), even before its lock is taken.
+        A cold session is loaded and built outside the table lock; concurrent requests
+        for the same id wait for that one build instead of starting their own.
+        """
+        state = None
+        if session_id:
+            while True:
+                with self._lock:
+                    session = self._sessions.get(session_id)
+                    if session is not None:
+                        session.leases += 1
+                        session.touch()
+                        return session
+                    building = self._building.get(session_id)
+                    if building is None:
+                        building = self._building[session_id] = threading.Event()
+                        break
+                building.wait()
+            try:
+                state = self.store.load(session_id) if self.store else None
+                session = self._build(session_id, state)
+            except BaseException:
+                with self._lock:
+                    del self._building[session_id]
+                building.set()
+                raise
+        else:
+            building = None
+            session = self._build(str(uuid.uuid4())[:8], None)
+
+        evicted = None
+        with self._lock:
+            if len(self._sessions) >= self.max_sessions:
+                evicted = self._evict_oldest()
+            self._sessions[session.session_id] = session
+            if building is not None:
+                del self._building[session_id]
+            if state is not None:
+                self.restored += 1
+            session.leases += 1
+            session.touch()
+        if building is not None:
+            building.set()
+        if evicted:
+            self._release(evicted, forget=False)
+        return session
+
+    def _build(self, session_id: str, state: Optional[Dict]) -> Session:
+        bot = self.bot_factory()
+        # Reuse the SecurityLogger session_id field for the table key
+        bot.session_id = session_id
+        session = Session(session_id, bot)
+        if state is not None:
+            bot.restore_state(state)
+            # The restored messages are already journaled, injected context included
+            session.journaled = [(m, m.text, m.context) for m in bot.history]
+        return session
+
+    def release(self, session: Session):
+        """Ends a get_or_create() lease; the session may be evicted again once idle."""
+        with self._lock:
+            session.leases -= 1
+
+    @contextmanager
+    def lease(self, session_id: Optional[str] = None) -> Iterator[Session]:
+        session = self.get_or_create(session_id)
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    def get(self, session_id: str) -> Optional[Session]:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def commit(self, session: Session):
+        """Journals the session's latest turn. Call with session.lock held."""
+        if self.store is None or not hasattr(session.bot, "export_state"):
+            return
+        try:
+            session.journaled = self.store.sync(session.session_id, session.bot, session.journaled)
+        except sqlite3.Error as e:
+            print(f"[DEBUG] Session Journal Failed ({session.session_id}): {e}")
+
+    def remove(self, session_id: str) -> bool:
+        with self._lock:
+            removed = self._sessions.pop(session_id, None) is not None
+        if self.store and self.store.delete(session_id):
+            removed = True
+        # Also when not resident here: the owner may still hold it (or its journal)
+        self._release(session_id, forget=True)
+        return removed
+
+    def evict(self, session_id: str) -> bool:
+        """Frees one session's memory (not its journal), unless it is mid-turn."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or self._in_use(session):
+                return False
+            del self._sessions[session_id]
+            self.evictions += 1
+        self._release(session_id, forget=False)
+        return True
+
+    def _release(self, session_id: str, forget: bool):
+        if self.on_release is not None:
+            self.on_release(session_id, forget)
+
+    @staticmethod
+    def _in_use(session: Session) -> bool:
+        # Caller holds self._lock. Leased (a request has it) or mid-turn.
+        return session.leases > 0 or session.lock.locked()
+
+    def _evict_oldest(self) -> Optional[str]:
+        # Caller holds self._lock; never evict a session in use. Returns the evicted id.
+        idle = [s for s in self._sessions.values() if not self._in_use(s)]
+        if idle:
+            oldest = min(idle, key=lambda s: s.last_seen)
+            del self._sessions[oldest.session_id]
+            self.evictions += 1
+            return oldest.session_id
+        return None
+
+    def evict_idle(self) -> int:
+        cutoff = time.time() - self.idle_timeout
+        with self._lock:
+            expired = [sid for sid, s in self._sessions.items() if s.last_seen < cutoff and not self._in_use(s)]
+            for sid in expired:
+                del self._sessions[sid]
+            self.evictions += len(expired)
+        for sid in expired:
+            self._release(sid, forget=False)
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def resident(self) -> List[Dict]:
+        """Per-session view of what is held in memory."""
+        now = time.time()
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return [{
+            "session_id": s.session_id,
+            "messages": len(getattr(s.bot, "history", None) or []),
+            "memory_bytes": s.memory_bytes(),
+            "idle_seconds": round(now - s.last_seen, 1)
+        } for s in sessions]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            sessions = list(self._sessions.values())
+        stats = {
+            "resident": len(sessions),
+            "memory_bytes": sum(s.memory_bytes() for s in sessions),
+            "max_sessions": self.max_sessions,
+            "idle_timeout": self.idle_timeout,
+            "evictions": self.evictions,
+            "restored": self.restored
+        }
+        if self.store:
+            stats["stored"] = self.store.session_count()
+        return stats
+
+
+def make_bot_factory(model_name: str, options: Dict = None, system_prompt_path: str = None,
+                     cache_path: str = None, cache_mmap_size: int = 0, max_concurrent: int = 0,
+                     log_path: str = "vinni.log", admission=None, breaker=None, client=None,
+                     lifecycle=None, compactor=None, semantic_cache=None) -> Callable[[], object]:
+    """
+    Builds ChatBots that share one set of cache segments and one backend,
+    so a hit earned by one session serves every other session.
+    `max_concurrent` > 0 puts every session behind one IntentScheduler;
+    `admission` (an AdmissionController), `breaker` (a CircuitBreaker), `client`
+    (a pooled ollama.Client from vinni.client.make_client), `lifecycle`
+    (a ModelLifecycle), `compactor` (a HistoryCompactor) and `semantic_cache`
+    (a SemanticCache, whose keys point into the shared segments) are likewise shared.
+    """
+    shared = {"caches": None}
+    backend = DiskCache(cache_path, mmap_size=cache_mmap_size) if cache_path else None
+    scheduler = None
+    if max_concurrent:
+        from vinni.scheduler import IntentScheduler
+        scheduler = IntentScheduler.from_log(log_path, max_concurrent=max_concurrent)
+
+    def factory():
+        from vinni.core import ChatBot
+        bot = ChatBot(model_name=model_name, options=options, system_prompt_path=system_prompt_path,
+                      cache_backend=backend, caches=shared["caches"], scheduler=scheduler,
+                      admission=admission, breaker=breaker, client=client,
+                      lifecycle=lifecycle, compactor=compactor, semantic_cache=semantic_cache)
+        if shared["caches"] is None:
+            shared["caches"] = bot.caches
+        return bot
+
+    return factory
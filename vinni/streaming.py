@@ -0,0 +1,110 @@
+import threading
+import time
+from typing import Iterable, Iterator, List, Optional
+
+class StreamBuffer:
+    """
+    One generation, many readers (v0.10.0).
+    Chunks are appended to a list (never concatenated) and released to subscribers
+    in coalesced flushes: once `flush_chars` characters are pending or
+    `flush_interval` seconds have passed since the last flush. Every subscriber
+    reads the same list by index, so several readers (clients, single-flight
+    followers, a transcript writer) can consume one generation without copies;
+    each one starts from the beginning, however late it subscribes. Cache fill,
+    verification and logging are not subscribers: the pipeline still runs them
+    after the stream ends.
+    """
+    def __init__(self, flush_chars: int = 0, flush_interval: float = 0.0):
+        self.flush_chars = flush_chars
+        self.flush_interval = flush_interval
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: Optional[str] = None
+        self.cond = threading.Condition()
+        self._flushed = 0          # Chunks visible to subscribers
+        self._pending_chars = 0
+        self._last_flush = time.monotonic()
+        self._text: Optional[str] = None
+
+    def _flush(self):
+        # Caller holds self.cond
+        if self._flushed < len(self.chunks):
+            self._flushed = len(self.chunks)
+            self._pending_chars = 0
+            self._last_flush = time.monotonic()
+            self.cond.notify_all()
+
+    def publish(self, chunk: str):
+        if not chunk:
+            return
+        with self.cond:
+            self.chunks.append(chunk)
+            self._pending_chars += len(chunk)
+            if self._pending_chars >= self.flush_chars or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def close(self, error: Optional[str] = None):
+        """Ends the stream (flushing what is pending). `error` marks it as failed."""
+        with self.cond:
+            self._flush()
+            self.error = error
+            self.done = True
+            self.cond.notify_all()
+
+    def subscribe(self) -> Iterator[str]:
+        """Yields coalesced pieces from the start of the stream until it is closed."""
+        index = 0
+        while True:
+            with self.cond:
+                while index >= self._flushed and not self.done:
+                    if not self.cond.wait(self.flush_interval or None):
+                        # Producer is between chunks: hand over whatever is pending
+                        self._flush()
+                end = self._flushed
+                piece = "".join(self.chunks[index:end]) if end > index else ""
+                finished = self.done and end == len(self.chunks)
+            index = end
+            if piece:
+                yield piece
+            if finished:
+                return
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        with self.cond:
+            return self.cond.wait_for(lambda: self.done, timeout)
+
+    def text(self) -> str:
+        """Everything published so far, joined once the stream is closed."""
+        with self.cond:
+            if self._text is not None:
+                return self._text
+            text = "".join(self.chunks)
+            if self.done:
+                self._text = text
+            return text
+
+
+def coalesce(chunks: Iterable[str], min_chars: int = 32, max_delay: float = 0.05) -> Iterator[str]:
+    """
+    Batches a token stream for writers where every write is a syscall (terminal, socket):
+    yields once `min_chars` are buffered or `max_delay` seconds passed since the last
+    yield, and always yields the remainder at the end.
+    Both are checked as chunks arrive (there is no timer thread, so the caller's
+    generator keeps running on the caller's thread): while the model is stalled,
+    pending text waits for the next chunk, so the real delay is bounded by
+    `max_delay` plus the gap between tokens.
+    """
+    pending: List[str] = []
+    size = 0
+    last = time.monotonic()
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        now = time.monotonic()
+        if size >= min_chars or now - last >= max_delay:
+            yield "".join(pending)
+            pending.clear()
+            size = 0
+            last = now
+    if pending:
+        yield "".join(pending)
@@ -2,14 +2,63 @@ import ollama
 import json
 
 class MathVerifier:
-    def __init__(self, model_name: str = "llama3"):
+    def __init__(self, model_name: str = "llama3", breaker=None, client=None, keep_alive=None):
         self.model_name = model_name
+        self.breaker = breaker  # v0.10.0: Optional CircuitBreaker for the LLM fallback
+        self.client = client or ollama  # v0.10.0: Shared pooled client (defaults to the module's)
+        self.keep_alive = keep_alive  # v0.10.0: Sent with the fallback so it does not shorten the model's residency
 
     def verify(self, question: str, answer: str) -> dict:
         """
         Verifies the mathematical correctness of an answer.
         Returns check status and reason.
         """
+        rule_result = self.check_rules(question, answer)
+        if rule_result:
+            return rule_result
+        
+        # --- LLM FALLBACK ---
+        try:
+            kwargs = {
+                "model": self.model_name,
+                "messages": self.fallback_messages(question, answer),
+                "options": {"temperature": 0.0}
+            }
+            if self.keep_alive is not None:
+                kwargs["keep_alive"] = self.keep_alive
+            # An open breaker raises CircuitOpenError straight away -> ERROR (no warning shown)
+            resp = self.breaker.call(self.client.chat, **kwargs) if self.breaker else self.client.chat(**kwargs)
+            return self.parse_fallback(resp['message']['content'])
+        except Exception as e:
+            return {"status": "ERROR", "reason": str(e), "confidence": 0.0}
+
+    async def averify(self, question: str, answer: str, client) -> dict:
+        """
+        Async variant of verify() for AsyncChatBot (v0.10.0).
+        `client` is an ollama.AsyncClient.
+        """
+        rule_result = self.check_rules(question, answer)
+        if rule_result:
+            return rule_result
+        
+        try:
+            kwargs = {
+                "model": self.model_name,
+                "messages": self.fallback_messages(question, answer),
+                "options": {"temperature": 0.0}
+            }
+            if self.keep_alive is not None:
+                kwargs["keep_alive"] = self.keep_alive
+            resp = await self.breaker.acall(client.chat, **kwargs) if self.breaker else await client.chat(**kwargs)
+            return self.parse_fallback(resp['message']['content'])
+        except Exception as e:
+            return {"status": "ERROR", "reason": str(e), "confidence": 0.0}
+
+    def check_rules(self, question: str, answer: str):
+        """
+        Deterministic Rule Table only (no LLM).
+        Returns a FAIL result dict, or None if no rule fired.
+        """
         # Triggers: Only run on math-heavy queries?
         # For v0.4.0, we call it manually or Core calls it.
         
@@ -103,7 +152,9 @@ class MathVerifier:
                   if total_interest > upper_bound:
                        return {"status": "FAIL", "rule_id": "MV-060", "severity": "HARD", "reason": f"Interest ({total_interest}) exceeds sanity bound ({upper_bound:.0f}). Hallucination likely."}
 
-        # --- LLM FALLBACK ---
+        return None
+
+    def fallback_messages(self, question: str, answer: str) -> list:
         prompt = (
             f"You are a Mathematical Validator. Your job is to check the Answer against the Question for correctness.\n"
             f"Question: {question}\n"
@@ -115,27 +166,9 @@ class MathVerifier:
             f"4. Ignore minor rounding differences.\n\n"
             f"Output JSON ONLY: {{'status': 'PASS' or 'FAIL', 'reason': 'Short explanation', 'confidence': 0.0-1.0}}"
         )
-        
-        try:
-            resp = ollama.chat(
-                model=self.model_name,
-                messages=[{'role': 'user', 'content': prompt}],
-                options={"temperature": 0.0}
-            )
-            content = resp['message']['content']
-            json_str = content.replace("```json", "").replace("```", "").strip()
-            return json.loads(json_str)
-        except Exception as e:
-            return {"status": "ERROR", "reason": str(e), "confidence": 0.0}
-        
-        try:
-            resp = ollama.chat(
-                model=self.model_name,
-                messages=[{'role': 'user', 'content': prompt}],
-                options={"temperature": 0.0}
-            )
-            content = resp['message']['content']
-            json_str = content.replace("```json", "").replace("```", "").strip()
-            return json.loads(json_str)
-        except Exception as e:
-            return {"status": "ERROR", "reason": str(e), "confidence": 0.0}
+        return [{'role': 'user', 'content': prompt}]
+
+    @staticmethod
+    def parse_fallback(content: str) -> dict:
+        json_str = content.replace("```json", "").replace("```", "").strip()
+        return json.loads(json_str)
@@ -0,0 +1,289 @@
+import hashlib
+import multiprocessing
+import os
+import queue
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Generator, List, Optional
+
+# Default mmap window for the shared DiskCache: workers on one host read cache
+# hits from the same OS page-cache pages instead of each copying them in.
+SHARED_CACHE_MMAP = 64 * 1024 * 1024
+
+
+def _worker_main(index: int, requests, responses, bot_config: Dict, threads: int, idle_timeout: float,
+                 keep_alive=None, services: Dict = None):
+    """
+    Worker process loop. Owns a SessionTable for the sessions hashed to it and
+    runs turns on a small thread pool; chunks go back on its responses queue
+    as ("chunk" | "busy" | "done" | "error", request_id, payload).
+    `services` describes the shared objects to build in this process (they hold
+    locks and connections, so they cannot be pickled across the spawn).
+    """
+    from vinni.cancellation import CancelToken
+    from vinni.client import make_client
+    from vinni.lifecycle import ModelLifecycle
+    from vinni.sessions import SessionStore, SessionTable, make_bot_factory
+
+    services = services or {}
+    # One pooled connection set per worker, shared by all of its sessions
+    client = make_client()
+    # Requests carry the pool's keep_alive; warm-up and pings are the parent's job
+    lifecycle = ModelLifecycle(client=client, default_keep_alive=keep_alive) if keep_alive is not None else None
+    admission = breaker = compactor = store = semantic_cache = None
+    if services.get("session_rate"):
+        from vinni.admission import AdmissionController
+        admission = AdmissionController(session_rate=services["session_rate"], global_rate=services["global_rate"])
+    if services.get("breaker"):
+        from vinni.breaker import CircuitBreaker
+        breaker = CircuitBreaker()
+    if services.get("compact"):
+        from vinni.compaction import HistoryCompactor
+        compactor = HistoryCompactor()
+    if services.get("semantic_threshold") is not None:
+        from vinni.cache import SemanticCache
+        # One index per worker; its hits resolve through the shared DiskCache file
+        try:
+            semantic_cache = SemanticCache(threshold=services["semantic_threshold"])
+        except ImportError as e:
+            print(f"[DEBUG] Semantic Cache Disabled: {e}")
+    if services.get("session_store"):
+        # Every worker journals into the same SQLite file (WAL); a session only ever lives in one of them
+        store = SessionStore(services["session_store"])
+    factory = make_bot_factory(client=client, lifecycle=lifecycle, admission=admission, breaker=breaker,
+                               compactor=compactor, semantic_cache=semantic_cache, **bot_config)
+    table = SessionTable(factory, idle_timeout=idle_timeout, store=store)
+    table.start()
+    executor = ThreadPoolExecutor(max_workers=threads)
+    # Tokens of queued and running turns, so the parent can cancel them ("cancel", request_id)
+    cancels: Dict[str, CancelToken] = {}
+
+    def run_turn(request_id: str, session_id: str, message: str):
+        try:
+            cancel = cancels[request_id]
+            with table.lease(session_id) as session, session.lock:
+                bot = session.bot
+                try:
+                    first = True
+                    for chunk in bot.chat(message, request_id=request_id, cancel=cancel):
+                        # A shed turn is known before its (only) chunk; the front end checks right after it
+                        if first and bot.last_busy:
+                            responses.put(("busy", request_id, bot.last_busy))
+                        first = False
+                        responses.put(("chunk", request_id, chunk))
+                finally:
+                    table.commit(session)
+                session.touch()
+                responses.put(("done", request_id, {"tokens": bot.last_turn_tokens, "worker": index,
+                                                    "busy": bot.last_busy}))
+        except Exception as e:
+            responses.put(("error", request_id, str(e)))
+        finally:
+            cancels.pop(request_id, None)
+
+    while True:
+        msg = requests.get()
+        if msg is None:
+            break
+        kind = msg[0]
+        if kind == "chat":
+            # Registered here, in queue order, so a cancel can never arrive before its turn
+            cancels[msg[1]] = CancelToken()
+            executor.submit(run_turn, *msg[1:])
+        elif kind == "cancel":
+            cancel = cancels.get(msg[1])
+            if cancel is not None:
+                cancel.cancel("closed")
+        elif kind == "drop":
+            table.remove(msg[1])
+        elif kind == "evict":
+            table.evict(msg[1])
+
+    executor.shutdown(wait=True)
+    table.stop()
+
+
+class WorkerPool:
+    """
+    Process-pool deployment (v0.10.0).
+    N worker processes each hold their own ChatBots; a session is pinned to one
+    worker by a stable hash of its session_id, so its history never leaves that
+    process. All workers share one DiskCache file (SQLite WAL + mmap), so a
+    response cached by any worker is a hit for every other.
+    Each worker runs its own scheduler, admission controller, breaker, compactor and semantic index;
+    `max_concurrent` and `global_rate` are totals, split evenly across the workers.
+    With `session_store`, workers journal their sessions into that one SQLite file.
+    A worker that dies (crash, OOM kill) fails its in-flight turns and is respawned;
+    its sessions come back from the journal when there is one.
+    """
+    # How often a waiting turn checks that its worker is still alive (seconds)
+    LIVENESS_INTERVAL = 1.0
+
+    def __init__(self, model_name: str, workers: int = None, threads_per_worker: int = 4,
+                 options: Dict = None, system_prompt_path: str = None, cache_path: str = None,
+                 cache_mmap_size: int = SHARED_CACHE_MMAP, idle_timeout: float = 1800.0, keep_alive=None,
+                 max_concurrent: int = 0, session_rate: float = 0, global_rate: float = 400.0,
+                 breaker: bool = False, compact: bool = False, session_store: str = None,
+                 semantic_threshold: float = None):
+        self.size = workers or os.cpu_count() or 1
+        bot_config = {
+            "model_name": model_name,
+            "options": options,
+            "system_prompt_path": system_prompt_path,
+            "cache_path": cache_path,
+            "cache_mmap_size": cache_mmap_size if cache_path else 0,
+            "max_concurrent": max(1, max_concurrent // self.size) if max_concurrent else 0,
+        }
+        services = {
+            "session_rate": session_rate,
+            "global_rate": global_rate / self.size,
+            "breaker": breaker,
+            "compact": compact,
+            "session_store": session_store,
+            "semantic_threshold": semantic_threshold,
+        }
+        # spawn: workers must not inherit the parent's sockets, locks or sqlite handles
+        self._ctx = multiprocessing.get_context("spawn")
+        self._worker_args = (bot_config, threads_per_worker, idle_timeout, keep_alive, services)
+        self._pending: Dict[str, queue.Queue] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._queues: List = [None] * self.size
+        self._procs: List = [None] * self.size
+        self._dispatchers: List[threading.Thread] = [None] * self.size
+        for i in range(self.size):
+            self._spawn(i)
+
+    def _spawn(self, index: int):
+        # Fresh queues: requests queued for a dead worker were already failed by their waiters, and
+        # a worker killed mid-put can leave a shared queue's write lock held, so replies are per worker too
+        self._queues[index] = self._ctx.Queue()
+        responses = self._ctx.Queue()
+        proc = self._ctx.Process(target=_worker_main, daemon=True,
+                                 args=(index, self._queues[index], responses, *self._worker_args))
+        proc.start()
+        self._procs[index] = proc
+        self._dispatchers[index] = threading.Thread(target=self._dispatch_loop, args=(responses, proc), daemon=True)
+        self._dispatchers[index].start()
+
+    def _worker(self, index: int):
+        """Returns the (inbox, process) of worker `index`, respawning it first if it has died."""
+        with self._lock:
+            proc = self._procs[index]
+            if not proc.is_alive() and not self._closed:
+                self._spawn(index)
+            return self._queues[index], self._procs[index]
+
+    def worker_for(self, session_id: str) -> int:
+        # Stable across processes and restarts (unlike hash(), which is salted per interpreter)
+        digest = hashlib.md5(session_id.encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") % self.size
+
+    def _dispatch_loop(self, responses, proc):
+        while True:
+            try:
+                msg = responses.get(timeout=self.LIVENESS_INTERVAL)
+            except queue.Empty:
+                if proc.is_alive():
+                    continue
+                break  # Exited: its waiters notice on their own liveness check
+            with self._lock:
+                inbox = self._pending.get(msg[1])
+            # Replies for abandoned requests (client disconnected) are dropped
+            if inbox is not None:
+                inbox.put(msg)
+
+    def chat(self, session_id: str, message: str, request_id: str = None,
+             result: Optional[Dict] = None) -> Generator[str, None, None]:
+        """
+        Runs one turn on the session's worker and yields its chunks.
+        `result`, if given, receives the worker's "done" payload (tokens, worker, busy);
+        "busy" is set before the first chunk of a shed turn.
+        Closing the generator early cancels the turn in the worker.
+        """
+        request_id = request_id or f"req-{uuid.uuid4().hex[:5]}"
+        inbox = queue.Queue()
+        with self._lock:
+            self._pending[request_id] = inbox
+        worker, proc = self._worker(self.worker_for(session_id))
+        finished = False
+        try:
+            worker.put(("chat", request_id, session_id, message))
+            while True:
+                try:
+                    kind, _, payload = inbox.get(timeout=self.LIVENESS_INTERVAL)
+                except queue.Empty:
+                    if proc.is_alive():
+                        continue
+                    # Crashed or killed mid-turn: fail now instead of holding the session forever
+                    finished = True
+                    self._worker(self.worker_for(session_id))
+                    yield "\n[System Error: worker exited]"
+                    return
+                if kind == "chunk":
+                    yield payload
+                elif kind == "busy":
+                    if result is not None:
+                        result["busy"] = payload
+                elif kind == "done":
+                    finished = True
+                    if result is not None:
+                        result.update(payload)
+                    return
+                else:
+                    finished = True
+                    yield f"\n[System Error: {payload}]"
+                    return
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            if not finished:
+                # Closed early (client disconnect): stop the worker's generation too
+                worker.put(("cancel", request_id))
+
+    def drop_session(self, session_id: str, forget: bool = True):
+        """
+        Releases the session in its worker. `forget` also deletes its journal (DELETE /sessions/<id>);
+        without it the worker only frees the memory (front-end eviction), and the session can be restored.
+        """
+        worker, _ = self._worker(self.worker_for(session_id))
+        worker.put(("drop" if forget else "evict", session_id))
+
+    def alive(self) -> int:
+        return sum(1 for proc in self._procs if proc.is_alive())
+
+    def close(self, timeout: float = 10.0):
+        with self._lock:
+            self._closed = True
+        for q in self._queues:
+            q.put(None)
+        for proc in self._procs:
+            proc.join(timeout)
+            if proc.is_alive():
+                proc.terminate()
+        for dispatcher in self._dispatchers:
+            dispatcher.join(timeout)
+
+
+class PooledBot:
+    """
+    Stand-in for a ChatBot inside the front-end SessionTable: forwards turns to
+    the WorkerPool, which keeps the real history in the pinned worker.
+    """
+    def __init__(self, pool: WorkerPool):
+        self.pool = pool
+        self.session_id = None  # Set by SessionTable.get_or_create
+        self.last_turn_tokens = None
+        self.last_worker = None
+        self.last_busy = None  # As ChatBot.last_busy: the server answers 429 for shed turns
+
+    def chat(self, user_input: str, request_id: str = None) -> Generator[str, None, None]:
+        result = {}
+        self.last_busy = None
+        for chunk in self.pool.chat(self.session_id, user_input, request_id=request_id, result=result):
+            self.last_busy = result.get("busy")
+            yield chunk
+        self.last_turn_tokens = result.get("tokens")
+        self.last_worker = result.get("worker")
+        self.last_busy = result.get("busy")